@@ -4,390 +4,290 @@ Comprehensive Claude Bridge Test Suite
 
 Tests the system from multiple angles to identify actual functionality:
 1. Isolated component tests (no dependencies)
-2. Simple process tests (local commands) 
+2. Simple process tests (local commands)
 3. Real process integration (Python shell)
 4. Container compatibility tests
 5. Environment-specific validations
+
+Run in parallel with pytest-xdist; ``loadscope`` keeps each suite class on
+one worker while independent suites run side by side:
+    pytest -n auto --dist=loadscope comprehensive_test.py debug_test.py real_test.py
 """
 
 import asyncio
+import importlib
+import operator
 import sys
 import subprocess
 import platform
 import os
+from dataclasses import dataclass
+from importlib.util import find_spec
 from pathlib import Path
 
+import pytest
+import pytest_asyncio
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-class TestRunner:
-    def __init__(self):
-        self.results = []
-        self.environment_info = self._gather_environment_info()
-    
-    def _gather_environment_info(self):
-        """Gather environment information"""
-        info = {
-            "platform": platform.system(),
-            "python_version": sys.version,
-            "in_container": self._check_container(),
-            "docker_available": self._check_docker(),
-            "working_dir": os.getcwd(),
-            "venv_active": hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix)
-        }
-        return info
-    
-    def _check_container(self):
-        """Check if running in container"""
-        try:
-            # Check for container-specific files
-            container_indicators = [
-                "/.dockerenv",
-                "/proc/1/cgroup"
-            ]
-            
-            for indicator in container_indicators:
-                if Path(indicator).exists():
-                    return True
-                    
-            # Check hostname patterns
-            hostname = os.uname().nodename
-            if hostname.startswith(('docker-', 'container-')) or len(hostname) == 12:
-                return True
-                
-            return False
-        except:
-            return False
-    
-    def _check_docker(self):
-        """Check if Docker is available"""
-        try:
-            result = subprocess.run(['docker', '--version'], capture_output=True, text=True)
-            return result.returncode == 0
-        except:
-            return False
-    
-    def log_result(self, test_name, success, details=""):
-        """Log test result"""
-        self.results.append({
-            "test": test_name,
-            "success": success,
-            "details": details
-        })
-        status = "✅" if success else "❌"
-        print(f"  {status} {test_name}: {'PASSED' if success else 'FAILED'}")
-        if details and not success:
-            print(f"    Details: {details}")
-
-class ComponentTests(TestRunner):
+from src.claude_bridge.output_handling.ansi_processor import ANSIProcessor
+from src.claude_bridge.output_handling.discord_formatter import DiscordFormatter, MessageType
+from src.claude_bridge.process_control.process_controller import ProcessController
+
+
+def _hostname_looks_containerish():
+    """Check hostname patterns typical of container runtimes"""
+    hostname = os.uname().nodename
+    return hostname.startswith(('docker-', 'container-')) or len(hostname) == 12
+
+
+# Whether we run in a container cannot change within a run, so check once
+_IN_CONTAINER = (
+    os.path.exists("/.dockerenv")
+    or os.path.exists("/proc/1/cgroup")
+    or _hostname_looks_containerish()
+)
+
+
+# A virtualenv (or venv) moves sys.prefix away from the base interpreter
+VENV_ACTIVE = sys.prefix != sys.base_prefix
+
+
+REQUIRED_COMMANDS = ["cat", "echo", "python3"]
+
+
+async def _probe(*args, timeout=5):
+    """Run a command and report whether it exited successfully"""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+    except OSError:
+        return False
+
+    try:
+        return await asyncio.wait_for(proc.wait(), timeout) == 0
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return False
+
+
+_docker_available = None
+
+
+async def _check_docker():
+    """Check if Docker is available
+
+    A coroutine result cannot be memoized with ``lru_cache``, so the probe
+    outcome is cached in a module global instead.
+    """
+    global _docker_available
+    if _docker_available is None:
+        _docker_available = await _probe('docker', '--version')
+    return _docker_available
+
+
+async def probe_commands(commands):
+    """Run ``<cmd> --help`` for every command concurrently"""
+    results = await asyncio.gather(*(_probe(cmd, "--help") for cmd in commands))
+    return dict(zip(commands, results))
+
+
+@dataclass(frozen=True, slots=True)
+class EnvInfo:
+    """Environment information, fixed for the lifetime of a run"""
+    platform: str
+    python_version: str
+    in_container: bool
+    docker_available: bool
+    working_dir: str
+    venv_active: bool
+
+
+ENV_INFO = None
+
+
+async def gather_environment_info():
+    """Gather environment information once and reuse it afterwards
+
+    The Docker probe is asynchronous, so the singleton is built on the
+    first await rather than at import time.
+    """
+    global ENV_INFO
+    if ENV_INFO is None:
+        ENV_INFO = EnvInfo(
+            platform=platform.system(),
+            python_version=sys.version,
+            in_container=_IN_CONTAINER,
+            docker_available=await _check_docker(),
+            working_dir=os.getcwd(),
+            venv_active=VENV_ACTIVE
+        )
+    return ENV_INFO
+
+
+class TestComponents:
     """Test individual components without external dependencies"""
-    
-    def test_imports(self):
+
+    @pytest.mark.parametrize("component", [
+        "Session",
+        "SessionManager",
+        "ProcessController",
+        "output_handling.ANSIProcessor",
+        "output_handling.DiscordFormatter",
+        "utils.Config",
+    ])
+    def test_imports(self, component):
         """Test all imports work"""
-        print("\n🔍 Component Import Tests")
-        
-        components = [
-            ("Session", "src.claude_bridge.core.session", "Session"),
-            ("SessionManager", "src.claude_bridge.core.session_manager", "SessionManager"),
-            ("ProcessController", "src.claude_bridge.process_control.process_controller", "ProcessController"),
-            ("ANSIProcessor", "src.claude_bridge.output_handling.ansi_processor", "ANSIProcessor"),
-            ("DiscordFormatter", "src.claude_bridge.output_handling.discord_formatter", "DiscordFormatter"),
-            ("Config", "src.claude_bridge.utils.config", "Config"),
-        ]
-        
-        for name, module, cls in components:
-            try:
-                mod = __import__(module, fromlist=[cls])
-                getattr(mod, cls)
-                self.log_result(f"Import {name}", True)
-            except Exception as e:
-                self.log_result(f"Import {name}", False, str(e))
-    
+        # The package and its subpackages re-export every component, so
+        # importing them brings them all in and attribute lookup does the rest
+        pkg = importlib.import_module("src.claude_bridge")
+        for subpackage in ("output_handling", "utils"):
+            importlib.import_module(f"src.claude_bridge.{subpackage}")
+
+        assert operator.attrgetter(component)(pkg) is not None
+
     def test_ansi_processing(self):
         """Test ANSI processing works"""
-        print("\n🎨 ANSI Processing Tests")
-        
-        try:
-            from src.claude_bridge.output_handling.ansi_processor import ANSIProcessor
-            processor = ANSIProcessor()
-            
-            # Test cases
-            tests = [
-                ("Simple color", "\x1b[31mRed\x1b[0m", "Red"),
-                ("Multiple colors", "\x1b[31mRed\x1b[32mGreen\x1b[0m", "RedGreen"),
-                ("Complex sequence", "\x1b[1;31;40mBold Red on Black\x1b[0m", "Bold Red on Black"),
-                ("Plain text", "No ANSI codes", "No ANSI codes"),
-            ]
-            
-            for test_name, input_text, expected in tests:
-                result = processor.strip_all_ansi(input_text)
-                success = result == expected
-                self.log_result(f"ANSI {test_name}", success, f"Expected: '{expected}', Got: '{result}'" if not success else "")
-                
-        except Exception as e:
-            self.log_result("ANSI Processing", False, str(e))
-    
+        processor = ANSIProcessor()
+
+        # Test cases: (name, input, expected)
+        tests = [
+            ("Simple color", "\x1b[31mRed\x1b[0m", "Red"),
+            ("Multiple colors", "\x1b[31mRed\x1b[32mGreen\x1b[0m", "RedGreen"),
+            ("Complex sequence", "\x1b[1;31;40mBold Red on Black\x1b[0m", "Bold Red on Black"),
+            ("Plain text", "No ANSI codes", "No ANSI codes"),
+        ]
+
+        results = processor.strip_many([input_text for _, input_text, _ in tests])
+
+        for (test_name, _, expected), result in zip(tests, results):
+            assert result == expected, test_name
+
     def test_discord_formatting(self):
         """Test Discord formatting works"""
-        print("\n💬 Discord Formatting Tests")
-        
-        try:
-            from src.claude_bridge.output_handling.discord_formatter import DiscordFormatter, MessageType
-            formatter = DiscordFormatter()
-            
-            # Test long message splitting
-            long_text = "Line " * 1000  # Very long text
-            chunks = formatter.format_output(long_text, MessageType.NORMAL)
-            
-            all_under_limit = all(len(chunk.content) <= 2000 for chunk in chunks)
-            has_multiple_chunks = len(chunks) > 1
-            
-            self.log_result("Discord Split Long Text", all_under_limit and has_multiple_chunks)
-            
-            # Test code block formatting
-            code_text = "```python\nprint('hello')\n```"
-            code_chunks = formatter.format_output(code_text, MessageType.CODE)
-            self.log_result("Discord Code Formatting", len(code_chunks) > 0)
-            
-        except Exception as e:
-            self.log_result("Discord Formatting", False, str(e))
-
-class ProcessTests(TestRunner):
+        formatter = DiscordFormatter()
+
+        # Test long message splitting, validating chunks as they are produced
+        long_text = "Line " * 1000  # Very long text
+        chunks = formatter.format_output_iter(long_text, MessageType.NORMAL)
+
+        first_chunk = next(chunks)
+        assert first_chunk.metadata['total_chunks'] > 1
+        assert len(first_chunk.content) <= 2000
+        assert all(len(chunk.content) <= 2000 for chunk in chunks)
+
+        # Test code block formatting
+        code_text = "```python\nprint('hello')\n```"
+        code_chunks = formatter.format_output(code_text, MessageType.CODE)
+        assert len(code_chunks) > 0
+
+
+class TestProcess:
     """Test process control functionality"""
-    
+
     def test_simple_command(self):
         """Test with simple command that exits immediately"""
-        print("\n⚡ Simple Process Tests")
-        
-        try:
-            from src.claude_bridge.process_control.process_controller import ProcessController
-            
-            # Test echo command (exits immediately)
-            controller = ProcessController(command="echo", working_directory="/tmp")
-            success = controller.start_process("ECHO_TEST")
-            
-            # For echo, process exits immediately, so this is expected behavior
-            if success:
-                # Process should be started but may have exited
-                info = controller.get_process_info()
-                self.log_result("Echo Command Start", True, f"Process info: {info}")
-            else:
-                self.log_result("Echo Command Start", False, "Failed to start echo")
-                
-        except Exception as e:
-            self.log_result("Simple Command", False, str(e))
-    
-    def test_persistent_command(self):
+        # Test echo command (exits immediately)
+        controller = ProcessController(command="echo", working_directory="/tmp")
+
+        # For echo, process exits immediately, so only the start is checked
+        assert controller.start_process("ECHO_TEST"), "Failed to start echo"
+        assert controller.get_process_info()["pid"] is not None
+
+    @pytest.mark.asyncio
+    async def test_persistent_command(self):
         """Test with persistent command"""
-        print("\n🔄 Persistent Process Tests")
-        
+        # Test with cat (waits for input)
+        controller = ProcessController(command="cat", working_directory="/tmp")
+
+        # Output arrives on the reader thread, so hand it to the loop
+        loop = asyncio.get_running_loop()
+        echoed = asyncio.Event()
+        controller.set_output_callback(lambda output: loop.call_soon_threadsafe(echoed.set))
+
+        assert controller.start_process("CAT_TEST")
+
         try:
-            from src.claude_bridge.process_control.process_controller import ProcessController
-            
-            # Test with cat (waits for input)
-            controller = ProcessController(command="cat", working_directory="/tmp")
-            success = controller.start_process("CAT_TEST")
-            
-            if success:
-                # Cat should keep running
-                running = controller.is_running()
-                self.log_result("Cat Command Running", running)
-                
-                if running:
-                    # Try sending input
-                    send_success = controller.send_input("test input\n")
-                    self.log_result("Send Input to Cat", send_success)
-                    
-                    # Give it a moment
-                    import time
-                    time.sleep(0.1)
-                    
-                    # Should still be running
-                    still_running = controller.is_running()
-                    self.log_result("Cat Still Running", still_running)
-                
-                # Clean up
-                controller.terminate_process()
-                self.log_result("Cat Termination", True)
-            else:
-                self.log_result("Cat Command Start", False)
-                
-        except Exception as e:
-            self.log_result("Persistent Command", False, str(e))
-
-class IntegrationTests(TestRunner):
+            # Cat should keep running
+            assert not controller.exit_event.is_set()
+
+            # Try sending input and wait for cat to echo it back
+            assert controller.send_input("test input\n")
+            await asyncio.wait_for(echoed.wait(), 2.0)
+
+            # Should still be running after answering
+            assert not controller.exit_event.is_set()
+        finally:
+            # Clean up
+            assert controller.terminate_process()
+            assert controller.exit_event.is_set()
+
+
+class TestIntegration:
     """Test full system integration"""
-    
-    async def test_session_lifecycle(self):
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_session_lifecycle(self, session_manager):
         """Test session creation and management"""
-        print("\n📋 Session Integration Tests")
-        
+        # Create session
+        session = await session_manager.create_session("/tmp")
+        assert session is not None, "Session is None"
+
         try:
-            from src.claude_bridge.core.session_manager import SessionManager
-            from src.claude_bridge.utils.config import Config, DiscordConfig, ClaudeCodeConfig, SessionConfig, LoggingConfig
-            
-            # Create minimal config
-            config = Config(
-                discord=DiscordConfig("test", 123, 456),
-                claude_code=ClaudeCodeConfig("cat", "/tmp", 30),  # Use cat for testing
-                session=SessionConfig(300, 1900, 100, 60),
-                logging=LoggingConfig("INFO", "test.log", "10MB", 3)
-            )
-            
-            session_manager = SessionManager(config)
-            await session_manager.start()
-            
-            # Create session
-            session = await session_manager.create_session("/tmp")
-            if session:
-                self.log_result("Session Creation", True, f"Session ID: {session.id}")
-                
-                # Check if session is active
-                active = session.is_active()
-                self.log_result("Session Active", active)
-                
-                if active:
-                    # Test sending command
-                    command_sent = await session_manager.send_command(session.id, "test command\n")
-                    self.log_result("Send Command", command_sent)
-                
-                # Cleanup
-                await session_manager.terminate_session(session.id)
-                self.log_result("Session Cleanup", True)
-            else:
-                self.log_result("Session Creation", False, "Session is None")
-            
-            await session_manager.stop()
-            
-        except Exception as e:
-            self.log_result("Session Integration", False, str(e))
-
-class EnvironmentTests(TestRunner):
+            # Check if session is active
+            assert session.is_active()
+
+            # Test sending command
+            assert await session_manager.send_command(session.id, "test command\n")
+        finally:
+            # Cleanup
+            assert await session_manager.terminate_session(session.id)
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def environment_info():
+    """Environment information, probed once per module"""
+    return await gather_environment_info()
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def command_probes():
+    """Availability of the required commands, probed concurrently"""
+    return await probe_commands(REQUIRED_COMMANDS)
+
+
+class TestEnvironment:
     """Test environment-specific functionality"""
-    
-    def test_environment_compatibility(self):
-        """Test environment compatibility"""
-        print("\n🌍 Environment Compatibility Tests")
-        
-        # Check Python version
-        py_version = sys.version_info
-        py_compatible = py_version >= (3, 9)
-        self.log_result("Python Version", py_compatible, f"Python {py_version.major}.{py_version.minor}")
-        
-        # Check required commands
-        commands = ["cat", "echo", "python3"]
-        for cmd in commands:
-            try:
-                result = subprocess.run([cmd, "--help"], capture_output=True, text=True, timeout=5)
-                available = result.returncode == 0 or cmd == "cat"  # cat --help might not work
-                self.log_result(f"Command {cmd}", available)
-            except:
-                self.log_result(f"Command {cmd}", False)
-        
-        # Check file permissions
-        temp_file = Path("/tmp/claude_bridge_test")
-        try:
-            temp_file.write_text("test")
-            can_write = temp_file.exists()
-            temp_file.unlink()
-            self.log_result("File Permissions", can_write)
-        except:
-            self.log_result("File Permissions", False)
-    
-    def test_virtual_environment(self):
+
+    def test_python_version(self):
+        """Test Python version compatibility"""
+        assert sys.version_info >= (3, 9)
+
+    @pytest.mark.parametrize("cmd", REQUIRED_COMMANDS)
+    def test_command_available(self, cmd, command_probes):
+        """Test required commands are available"""
+        assert command_probes[cmd] or cmd == "cat"  # cat --help might not work
+
+    def test_file_permissions(self, tmp_path):
+        """Test file permissions"""
+        temp_file = tmp_path / "claude_bridge_test"
+        temp_file.write_text("test")
+        assert temp_file.exists()
+        temp_file.unlink()
+
+    def test_virtual_environment(self, environment_info):
         """Test virtual environment setup"""
-        print("\n🐍 Virtual Environment Tests")
-        
-        # Check if in venv
-        in_venv = self.environment_info["venv_active"]
-        self.log_result("Virtual Environment", in_venv)
-        
-        # Check dependencies
-        deps = ["discord", "pexpect", "asyncio"]
-        for dep in deps:
-            try:
-                __import__(dep)
-                self.log_result(f"Dependency {dep}", True)
-            except ImportError:
-                self.log_result(f"Dependency {dep}", False)
-
-async def main():
-    """Run comprehensive tests"""
-    print("🚀 Claude Bridge Comprehensive Test Suite")
-    print("=" * 60)
-    
-    # Print environment info
-    runner = TestRunner()
-    print(f"\n📊 Environment Information:")
-    for key, value in runner.environment_info.items():
-        print(f"  {key}: {value}")
-    
-    # Run test suites
-    test_suites = [
-        ("Component Tests", ComponentTests),
-        ("Process Tests", ProcessTests),
-        ("Integration Tests", IntegrationTests),
-        ("Environment Tests", EnvironmentTests),
-    ]
-    
-    all_results = []
-    
-    for suite_name, suite_class in test_suites:
-        print(f"\n🧪 {suite_name}")
-        print("-" * 40)
-        
-        suite = suite_class()
-        
-        # Run tests based on suite type
-        if suite_name == "Component Tests":
-            suite.test_imports()
-            suite.test_ansi_processing()
-            suite.test_discord_formatting()
-        elif suite_name == "Process Tests":
-            suite.test_simple_command()
-            suite.test_persistent_command()
-        elif suite_name == "Integration Tests":
-            await suite.test_session_lifecycle()
-        elif suite_name == "Environment Tests":
-            suite.test_environment_compatibility()
-            suite.test_virtual_environment()
-        
-        all_results.extend(suite.results)
-    
-    # Summary
-    total_tests = len(all_results)
-    passed_tests = sum(1 for r in all_results if r["success"])
-    
-    print(f"\n" + "=" * 60)
-    print(f"🏁 Comprehensive Test Results: {passed_tests}/{total_tests} passed")
-    
-    if passed_tests == total_tests:
-        print("🎉 All tests passed! Claude Bridge is fully functional.")
-        return 0
-    else:
-        failed_tests = [r for r in all_results if not r["success"]]
-        print(f"\n⚠️ Failed Tests ({len(failed_tests)}):")
-        for test in failed_tests:
-            print(f"  ❌ {test['test']}")
-            if test["details"]:
-                print(f"     {test['details']}")
-        
-        # Analyze failure patterns
-        print(f"\n🔍 Failure Analysis:")
-        if any("Import" in t["test"] for t in failed_tests):
-            print("  - Import failures suggest missing dependencies or incorrect paths")
-        if any("Process" in t["test"] for t in failed_tests):
-            print("  - Process failures may indicate subprocess or permission issues")
-        if any("Session" in t["test"] for t in failed_tests):
-            print("  - Session failures suggest integration problems")
-        
-        print(f"\n💡 Next Steps:")
-        print("  1. Fix import/dependency issues first")
-        print("  2. Verify process control in current environment")
-        print("  3. Test with simpler commands before complex ones")
-        
-        return 1
+        assert environment_info.venv_active
+
+    @pytest.mark.parametrize("dep", ["discord", "pexpect", "asyncio"])
+    def test_dependency(self, dep):
+        """Test required dependencies are installed"""
+        # Locating the module is enough; importing it would run discord.py
+        assert find_spec(dep) is not None
+
 
 if __name__ == "__main__":
-    exit_code = asyncio.run(main())
-    sys.exit(exit_code)
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-n", "auto", "--dist=loadscope"]))
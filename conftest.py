@@ -0,0 +1,56 @@
+"""
+Shared pytest fixtures for the standalone Claude Bridge test scripts
+
+Provides a single started SessionManager per test session so that only
+sessions, not managers, are recreated between tests.
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from src.claude_bridge.core.session_manager import SessionManager
+from src.claude_bridge.utils.config import Config, DiscordConfig, ClaudeCodeConfig, SessionConfig, LoggingConfig
+
+# pytest-asyncio builds its loops from the current policy, so installing
+# uvloop here covers every async test; fall back silently where unavailable
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+
+@pytest.fixture(scope="session")
+def python_repl(tmp_path_factory):
+    """Executable that starts an interactive Python shell
+
+    ProcessController runs a single command without arguments, and a
+    non-tty ``python3`` only executes its stdin at EOF, so ``-i`` is needed
+    for output to arrive line by line.
+    """
+    script = tmp_path_factory.mktemp("bin") / "python3-repl"
+    script.write_text('#!/bin/sh\nexec python3 -i "$@"\n')
+    script.chmod(0o755)
+    return str(script)
+
+
+@pytest.fixture(scope="session")
+def bridge_config(python_repl):
+    """Create minimal config using Python as the long-running command"""
+    return Config(
+        discord=DiscordConfig("test", 123, 456),
+        claude_code=ClaudeCodeConfig(python_repl, "/tmp", 30),
+        session=SessionConfig(300, 1900, 100, 60),
+        logging=LoggingConfig("INFO", "test.log", "10MB", 3)
+    )
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def session_manager(bridge_config):
+    """Started SessionManager shared by every test in the session"""
+    manager = SessionManager(bridge_config)
+    await manager.start()
+    yield manager
+    await manager.stop()
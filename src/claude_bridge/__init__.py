@@ -9,11 +9,17 @@ __version__ = "1.0.0"
 __author__ = "Claude Bridge Team"
 __email__ = "support@claude-bridge.dev"
 
-from .core.session_manager import SessionManager
-from .core.session import Session
-from .process_control.process_controller import ProcessController
-from .discord_bot.bot import ClaudeBridgeBot
-from .output_handling.output_handler import OutputHandler
+import importlib
+
+# Re-exports are resolved on first access (PEP 562) so that importing any
+# submodule does not drag in discord.py through the bot module
+_LAZY_IMPORTS = {
+    "SessionManager": ".core.session_manager",
+    "Session": ".core.session",
+    "ProcessController": ".process_control.process_controller",
+    "ClaudeBridgeBot": ".discord_bot.bot",
+    "OutputHandler": ".output_handling.output_handler",
+}
 
 __all__ = [
     "SessionManager",
@@ -21,4 +27,15 @@ __all__ = [
     "ProcessController",
     "ClaudeBridgeBot",
     "OutputHandler"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    """Import re-exported components lazily"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -4,7 +4,8 @@ Core components for Claude Bridge
 Contains session management, data models, and core business logic.
 """
 
+from .output_ring import OutputRing
 from .session import Session
 from .session_manager import SessionManager
 
-__all__ = ["Session", "SessionManager"]
\ No newline at end of file
+__all__ = ["OutputRing", "Session", "SessionManager"]
\ No newline at end of file
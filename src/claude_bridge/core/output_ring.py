@@ -0,0 +1,134 @@
+"""
+Output ring buffer for Claude Bridge
+
+Stores a session's recent output as length-prefixed UTF-8 frames in a single
+bytearray instead of one Python string per line.
+"""
+
+import struct
+import threading
+from typing import Iterator, List
+
+# Default byte capacity of a session's output ring
+OUTPUT_RING_CAPACITY = 16 * 1024
+
+# Size of a ring's first allocation; it doubles as output arrives, up to the
+# capacity, so idle sessions do not hold a full buffer each
+OUTPUT_RING_INITIAL_SIZE = 256
+
+
+class OutputRing:
+    """Bounded ring of text entries backed by one bytearray"""
+
+    _LENGTH = struct.Struct('<I')
+
+    def __init__(self, capacity: int = OUTPUT_RING_CAPACITY, maxlen: int = 50):
+        if capacity <= self._LENGTH.size:
+            raise ValueError("Output ring capacity too small")
+
+        self._buffer = bytearray()  # Allocated on the first append
+        self._capacity = capacity
+        self.maxlen = maxlen
+        self._head = 0  # Offset where the next frame is written
+        self._tail = 0  # Offset of the oldest frame
+        self._used = 0
+        self._count = 0
+        # stdout and stderr reader threads both append
+        self._lock = threading.Lock()
+
+    def _write(self, offset: int, data: bytes) -> int:
+        """Copy data into the ring at offset, wrapping at the end"""
+        size = len(self._buffer)
+        end = offset + len(data)
+        if end <= size:
+            self._buffer[offset:end] = data
+        else:
+            split = size - offset
+            self._buffer[offset:] = data[:split]
+            self._buffer[:end - size] = data[split:]
+        return end % size
+
+    def _read(self, offset: int, size: int) -> bytes:
+        """Copy size bytes out of the ring starting at offset"""
+        end = offset + size
+        if end <= len(self._buffer):
+            return bytes(self._buffer[offset:end])
+        return bytes(self._buffer[offset:]) + bytes(self._buffer[:end - len(self._buffer)])
+
+    def _advance(self, offset: int, size: int) -> int:
+        """Offset size bytes past offset, wrapping at the end"""
+        return (offset + size) % len(self._buffer)
+
+    def _frame_size(self, offset: int) -> int:
+        """Payload size of the frame starting at offset"""
+        return self._LENGTH.unpack(self._read(offset, self._LENGTH.size))[0]
+
+    def _evict_oldest(self):
+        """Drop the oldest frame"""
+        size = self._LENGTH.size + self._frame_size(self._tail)
+        self._tail = self._advance(self._tail, size)
+        self._used -= size
+        self._count -= 1
+
+    def _grow(self, needed: int):
+        """Reallocate to fit needed bytes, unwrapping the stored frames"""
+        size = max(len(self._buffer) * 2, OUTPUT_RING_INITIAL_SIZE, needed)
+        buffer = bytearray(min(size, self._capacity))
+        if self._used:
+            buffer[:self._used] = self._read(self._tail, self._used)
+        self._buffer = buffer
+        self._tail = 0
+        self._head = self._used
+
+    def append(self, text: str):
+        """Add an entry, evicting the oldest ones as needed"""
+        data = text.encode('utf-8')
+
+        # Oversized entries keep their most recent bytes
+        max_payload = self._capacity - self._LENGTH.size
+        if len(data) > max_payload:
+            data = data[-max_payload:]
+        frame_size = self._LENGTH.size + len(data)
+
+        with self._lock:
+            while self._count and (
+                self._count >= self.maxlen or self._used + frame_size > self._capacity
+            ):
+                self._evict_oldest()
+            if self._used + frame_size > len(self._buffer):
+                self._grow(self._used + frame_size)
+
+            self._head = self._write(self._head, self._LENGTH.pack(len(data)))
+            self._head = self._write(self._head, data)
+            self._used += frame_size
+            self._count += 1
+
+    def _snapshot(self, count: int) -> List[bytes]:
+        """Payloads of the last count entries, oldest first"""
+        frames = []
+        with self._lock:
+            count = max(0, min(count, self._count))
+            offset = self._tail
+            # Skip older frames by their length prefixes alone
+            for _ in range(self._count - count):
+                offset = self._advance(offset, self._LENGTH.size + self._frame_size(offset))
+            for _ in range(count):
+                size = self._frame_size(offset)
+                offset = self._advance(offset, self._LENGTH.size)
+                frames.append(self._read(offset, size))
+                offset = self._advance(offset, size)
+        return frames
+
+    def recent(self, count: int) -> List[str]:
+        """Decode the last count entries, oldest first"""
+        # Truncated entries may start mid-character
+        return [frame.decode('utf-8', errors='ignore') for frame in self._snapshot(count)]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.recent(self._count))
+
+    def __getitem__(self, index: int) -> str:
+        return self.recent(self._count)[index]
@@ -4,14 +4,29 @@ Session data model for Claude Bridge
 Defines the Session dataclass that represents an active Claude Code session.
 """
 
+import asyncio
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Any
+from itertools import islice
+from typing import TYPE_CHECKING, Deque, List, Optional, Tuple, Any
 import subprocess
+import time
 import discord
 
+from .output_ring import OutputRing
 
-@dataclass
+if TYPE_CHECKING:
+    from ..process_control.process_controller import ProcessController
+
+# How long to_dict may reuse an is_active() answer, in seconds
+ACTIVE_CACHE_TTL = 1.0
+
+# Format of the timestamps shown in Discord embeds
+DISPLAY_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@dataclass(slots=True)
 class Session:
     """Represents an active Claude Code session"""
     
@@ -20,15 +35,28 @@ class Session:
     discord_channel: Optional[discord.TextChannel] = None
     status: str = "inactive"  # "active", "inactive", "terminated"
     created_at: datetime = field(default_factory=datetime.now)
-    last_activity: datetime = field(default_factory=datetime.now)
-    command_history: List[str] = field(default_factory=list)
-    output_buffer: List[str] = field(default_factory=list)
+    # Monotonic seconds; output updates this per line, so no datetime here
+    last_activity: float = field(default_factory=time.monotonic)
+    # Bounded buffers: appends evict the oldest entry in O(1); output is
+    # packed into one bytearray rather than kept as separate strings
+    command_history: Deque[str] = field(default_factory=lambda: deque(maxlen=100))
+    output_buffer: OutputRing = field(default_factory=OutputRing)
     working_directory: Optional[str] = None
+    _process_controller: Optional["ProcessController"] = field(default=None, repr=False)
+    # created_at never changes, so its ISO form is rendered once
+    _created_iso: str = field(default="", init=False, repr=False)
+    _created_display: str = field(default="", init=False, repr=False)
+    # last_activity value and its display string, re-rendered when it changes
+    _activity_display: Tuple[float, str] = field(default=(float("nan"), ""), init=False, repr=False)
+    # Last poll of claude_process for to_dict: monotonic time, process, running
+    _active_cache: Tuple[float, Any, bool] = field(default=(float("-inf"), None, False), init=False, repr=False)
     
     def __post_init__(self):
         """Post-initialization setup"""
         if not self.id:
             raise ValueError("Session ID cannot be empty")
+        self._created_iso = self.created_at.isoformat()
+        self._created_display = self.created_at.strftime(DISPLAY_TIME_FORMAT)
     
     def is_active(self) -> bool:
         """Check if the session is currently active"""
@@ -43,44 +71,66 @@ class Session:
         if self.status == "terminated":
             return True
             
-        elapsed = (datetime.now() - self.last_activity).total_seconds()
-        return elapsed > timeout_seconds
+        return time.monotonic() - self.last_activity > timeout_seconds
     
     def update_activity(self):
         """Update the last activity timestamp"""
-        self.last_activity = datetime.now()
+        self.last_activity = time.monotonic()
+    
+    @property
+    def last_activity_at(self) -> datetime:
+        """Wall-clock time of the last activity, computed on demand"""
+        return datetime.fromtimestamp(time.time() - (time.monotonic() - self.last_activity))
+    
+    @property
+    def created_at_display(self) -> str:
+        """Creation time formatted for display"""
+        return self._created_display
+    
+    @property
+    def last_activity_display(self) -> str:
+        """Last activity formatted for display, cached until the next activity"""
+        stamp, text = self._activity_display
+        if stamp != self.last_activity:
+            text = self.last_activity_at.strftime(DISPLAY_TIME_FORMAT)
+            self._activity_display = (self.last_activity, text)
+        return text
     
     def add_command(self, command: str):
         """Add a command to the history"""
         self.command_history.append(command)
         self.update_activity()
-        
-        # Keep only last 100 commands
-        if len(self.command_history) > 100:
-            self.command_history = self.command_history[-100:]
     
     def add_output(self, output: str):
         """Add output to the buffer"""
         self.output_buffer.append(output)
         self.update_activity()
-        
-        # Keep only last 50 outputs
-        if len(self.output_buffer) > 50:
-            self.output_buffer = self.output_buffer[-50:]
     
     def get_recent_commands(self, count: int = 10) -> List[str]:
         """Get recent commands from history"""
-        return self.command_history[-count:] if self.command_history else []
+        start = max(0, len(self.command_history) - count)
+        return list(islice(self.command_history, start, None))
     
     def get_recent_output(self, count: int = 10) -> List[str]:
         """Get recent output from buffer"""
-        return self.output_buffer[-count:] if self.output_buffer else []
+        return self.output_buffer.recent(count)
     
     def terminate(self):
         """Mark the session as terminated and clean up"""
+        self.terminate_mark()
+        self._terminate_blocking()
+    
+    def terminate_mark(self):
+        """Mark the session as terminated without touching the process"""
         self.status = "terminated"
         self.update_activity()
-        
+    
+    async def terminate_process_async(self):
+        """Stop the Claude process without blocking the event loop"""
+        await asyncio.to_thread(self._terminate_blocking)
+    
+    def _terminate_blocking(self):
+        """Terminate the Claude process, waiting up to 5s before killing it"""
         if self.claude_process and self.claude_process.poll() is None:
             try:
                 self.claude_process.terminate()
@@ -94,15 +144,30 @@ class Session:
                 # Process might already be dead
                 pass
     
+    def _is_active_cached(self) -> bool:
+        """is_active(), reusing a poll of the same process from the last second"""
+        # Status changes and process swaps take effect immediately; only the
+        # poll() of an unchanged process is cached
+        process = self.claude_process
+        if self.status != "active" or process is None:
+            return False
+        
+        checked_at, polled, running = self._active_cache
+        now = time.monotonic()
+        if polled is not process or now - checked_at >= ACTIVE_CACHE_TTL:
+            running = process.poll() is None
+            self._active_cache = (now, process, running)
+        return running
+    
     def to_dict(self) -> dict:
         """Convert session to dictionary representation"""
         return {
             "id": self.id,
             "status": self.status,
-            "created_at": self.created_at.isoformat(),
-            "last_activity": self.last_activity.isoformat(),
+            "created_at": self._created_iso,
+            "last_activity": self.last_activity_at.isoformat(),
             "command_count": len(self.command_history),
             "output_count": len(self.output_buffer),
             "working_directory": self.working_directory,
-            "is_active": self.is_active()
+            "is_active": self._is_active_cached()
         }
\ No newline at end of file
@@ -5,11 +5,13 @@ Manages session lifecycle, pairing, and coordination between terminal and Discor
 """
 
 import asyncio
-import random
-import string
+import heapq
+import secrets
 import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List, Callable
+from itertools import islice
+from typing import Dict, Optional, List, Callable, Sequence, Set, Tuple
 from pathlib import Path
 
 from .session import Session
@@ -19,6 +21,11 @@ from ..utils.logging_setup import get_logger
 
 logger = get_logger('session_manager')
 
+# Process output is coalesced for this long, up to this many characters,
+# before being handed to the output callback
+OUTPUT_BATCH_WINDOW = 0.05
+OUTPUT_BATCH_MAX_CHARS = 1800
+
 
 class SessionManager:
     """Manages Claude Code sessions and their lifecycle"""
@@ -26,9 +33,32 @@ class SessionManager:
     def __init__(self, config: Config):
         self.config = config
         self.sessions: Dict[str, Session] = {}
+        # IDs handed out by generate_session_id but not yet in self.sessions
+        self._reserved_ids: Set[str] = set()
+        # Sessions last known to be active, so stats need not poll() every
+        # process; refreshed by the cleanup task
+        self._active_ids: Set[str] = set()
+        # (expiry deadline, session_id) min-heap in monotonic seconds; entries
+        # go stale as sessions see activity and are re-armed when popped
+        self._expiry_heap: List[Tuple[float, str]] = []
+        # Guards writes to self.sessions; single dict reads and list()
+        # snapshots are atomic under the GIL and skip the lock
         self._lock = threading.RLock()
         self._cleanup_task: Optional[asyncio.Task] = None
         self._running = False
+        # Cleared by stop() so no session is created during shutdown
+        self._accepting = True
+        
+        # Pre-started processes for the default working directory, so that
+        # create_session does not pay the Popen cost on the request path
+        self._warm_pool: asyncio.Queue = asyncio.Queue(maxsize=config.session.warm_pool_size)
+        self._warm_refill_task: Optional[asyncio.Task] = None
+        
+        # Per-session output queues, fed from reader threads and drained by
+        # one pump task each
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._output_queues: Dict[str, asyncio.Queue] = {}
+        self._output_pumps: Dict[str, asyncio.Task] = {}
         
         # Callbacks for session events
         self.session_created_callback: Optional[Callable[[Session], None]] = None
@@ -40,13 +70,18 @@ class SessionManager:
         logger.info("Starting Session Manager")
         self._running = True
         
+        # Reader threads hand output to this loop
+        self._loop = asyncio.get_running_loop()
+        
         # Start cleanup task
         self._cleanup_task = asyncio.create_task(self._periodic_cleanup())
+        self._schedule_warm_refill()
         
     async def stop(self):
         """Stop the session manager and cleanup all sessions"""
         logger.info("Stopping Session Manager")
         self._running = False
+        self._accepting = False
         
         # Cancel cleanup task
         if self._cleanup_task:
@@ -56,27 +91,38 @@ class SessionManager:
             except asyncio.CancelledError:
                 pass
         
-        # Terminate all active sessions
-        with self._lock:
-            session_ids = list(self.sessions.keys())
+        # Let an in-flight refill finish (it stops once _running is False),
+        # then discard the pooled processes
+        if self._warm_refill_task:
+            await self._warm_refill_task
+        
+        while not self._warm_pool.empty():
+            await asyncio.to_thread(self._warm_pool.get_nowait().terminate_process)
         
-        for session_id in session_ids:
-            await self.terminate_session(session_id)
+        # Terminate all active sessions; nothing new can be added any more
+        await self._terminate_sessions(tuple(self.sessions))
     
     def generate_session_id(self) -> str:
-        """Generate a unique 6-character session ID"""
-        while True:
-            # Generate 6-character alphanumeric ID
-            session_id = ''.join(random.choices(
-                string.ascii_uppercase + string.digits, k=6
-            ))
+        """Generate and reserve a unique 6-character session ID
+        
+        The ID stays reserved until create_session stores or abandons it, so
+        concurrent callers can never be handed the same one.
+        """
+        with self._lock:
+            # 6 uppercase hex characters
+            session_id = secrets.token_hex(3).upper()
+            while session_id in self.sessions or session_id in self._reserved_ids:
+                session_id = secrets.token_hex(3).upper()
             
-            # Ensure uniqueness
-            if session_id not in self.sessions:
-                return session_id
+            self._reserved_ids.add(session_id)
+            return session_id
     
     async def create_session(self, working_directory: Optional[str] = None) -> Optional[Session]:
         """Create a new Claude Code session"""
+        if not self._accepting:
+            logger.warning("Session Manager is stopping; not creating a new session")
+            return None
+        
         session_id = self.generate_session_id()
         
         # Use configured working directory if not specified
@@ -91,13 +137,21 @@ class SessionManager:
             working_directory=working_directory
         )
         
-        # Create process controller
-        process_controller = ProcessController(
-            command=self.config.claude_code.command,
-            working_directory=working_directory
-        )
+        # Take a pre-started process when one fits, else spawn one below
+        process_controller = await self._take_warm_process(working_directory)
+        warm = process_controller is not None
+        if not warm:
+            process_controller = ProcessController(
+                command=self.config.claude_code.command,
+                working_directory=working_directory
+            )
         
         # Set up output callbacks
+        output_queue: asyncio.Queue = asyncio.Queue()
+        self._output_queues[session_id] = output_queue
+        self._output_pumps[session_id] = asyncio.create_task(
+            self._output_pump(session_id, output_queue)
+        )
         process_controller.set_output_callback(
             lambda output: self._handle_process_output(session_id, output)
         )
@@ -106,8 +160,11 @@ class SessionManager:
         )
         
         # Start Claude Code process
-        if not process_controller.start_process(session_id):
+        if not warm and not process_controller.start_process(session_id):
             logger.error(f"Failed to start Claude Code process for session {session_id}")
+            await self._stop_output_pump(session_id)
+            with self._lock:
+                self._reserved_ids.discard(session_id)
             return None
         
         # Store the process in the session
@@ -117,8 +174,15 @@ class SessionManager:
         # Store session with its process controller
         with self._lock:
             self.sessions[session_id] = session
+            self._reserved_ids.discard(session_id)
+            self._active_ids.add(session_id)
             # Store process controller for later use
-            setattr(session, '_process_controller', process_controller)
+            session._process_controller = process_controller
+        
+        heapq.heappush(
+            self._expiry_heap,
+            (session.last_activity + self.config.session.timeout, session_id)
+        )
         
         logger.info(f"Session {session_id} created successfully")
         
@@ -131,20 +195,62 @@ class SessionManager:
         
         return session
     
+    async def _take_warm_process(self, working_directory: str) -> Optional[ProcessController]:
+        """Hand out a running pooled process for the default working directory"""
+        if working_directory != self.config.claude_code.working_directory:
+            return None
+        
+        while not self._warm_pool.empty():
+            process_controller = self._warm_pool.get_nowait()
+            if process_controller.is_running():
+                self._schedule_warm_refill()
+                return process_controller
+            # Exited while idle; drop it off the loop and try the next one
+            await asyncio.to_thread(process_controller.terminate_process)
+        
+        self._schedule_warm_refill()
+        return None
+    
+    def _schedule_warm_refill(self):
+        """Start refilling the warm pool unless a refill is already running"""
+        if not self._warm_pool.maxsize:
+            return
+        if self._warm_refill_task is None or self._warm_refill_task.done():
+            self._warm_refill_task = asyncio.create_task(self._refill_warm_pool())
+    
+    async def _refill_warm_pool(self):
+        """Start processes until the warm pool is full"""
+        while self._running and not self._warm_pool.full():
+            process_controller = ProcessController(
+                command=self.config.claude_code.command,
+                working_directory=self.config.claude_code.working_directory
+            )
+            if not await asyncio.to_thread(process_controller.start_process, "warm-pool"):
+                logger.warning("Failed to pre-start Claude Code process for the warm pool")
+                return
+            
+            if not self._running:
+                await asyncio.to_thread(process_controller.terminate_process)
+                return
+            
+            self._warm_pool.put_nowait(process_controller)
+    
     def get_session(self, session_id: str) -> Optional[Session]:
         """Get a session by ID"""
-        with self._lock:
-            return self.sessions.get(session_id)
+        return self.sessions.get(session_id)
     
     def get_all_sessions(self) -> List[Session]:
         """Get all sessions"""
-        with self._lock:
-            return list(self.sessions.values())
+        return list(self.sessions.values())
     
     def get_active_sessions(self) -> List[Session]:
-        """Get all active sessions"""
-        with self._lock:
-            return [s for s in self.sessions.values() if s.is_active()]
+        """Get all sessions last known to be active
+        
+        Uses the cached active set; Session.is_active() remains the
+        authoritative check for a single session.
+        """
+        sessions = self.sessions
+        return [sessions[i] for i in list(self._active_ids) if i in sessions]
     
     async def connect_discord_channel(self, session_id: str, channel) -> bool:
         """Connect a Discord channel to a session"""
@@ -176,7 +282,12 @@ class SessionManager:
         return True
     
     async def send_command(self, session_id: str, command: str) -> bool:
-        """Send a command to a session"""
+        """Send a command to a session
+        
+        Runs entirely inline in the caller's task: the write is not wrapped in
+        ``asyncio.create_task``, so awaiting this costs no extra Task object or
+        event-loop iteration. Keep it that way, since callers always await it.
+        """
         session = self.get_session(session_id)
         if not session:
             logger.warning(f"Session {session_id} not found")
@@ -187,7 +298,7 @@ class SessionManager:
             return False
         
         # Get process controller
-        process_controller = getattr(session, '_process_controller', None)
+        process_controller = session._process_controller
         if not process_controller:
             logger.error(f"Process controller not found for session {session_id}")
             return False
@@ -196,7 +307,7 @@ class SessionManager:
         success = process_controller.send_input(command)
         if success:
             session.add_command(command)
-            logger.debug(f"Command sent to session {session_id}: {command}")
+            logger.debug("Command sent to session %s: %s", session_id, command)
         else:
             logger.error(f"Failed to send command to session {session_id}")
         
@@ -212,17 +323,22 @@ class SessionManager:
         logger.info(f"Terminating session {session_id}")
         
         # Get process controller and terminate process
-        process_controller = getattr(session, '_process_controller', None)
+        process_controller = session._process_controller
         if process_controller:
-            process_controller.terminate_process()
+            # terminate_process blocks for up to 5s waiting on the child
+            await asyncio.to_thread(process_controller.terminate_process)
         
         # Mark session as terminated
-        session.terminate()
+        session.terminate_mark()
+        await session.terminate_process_async()
+        
+        # Deliver output still queued while the session can be looked up
+        await self._stop_output_pump(session_id)
         
         # Remove from active sessions
         with self._lock:
-            if session_id in self.sessions:
-                del self.sessions[session_id]
+            self.sessions.pop(session_id, None)
+            self._active_ids.discard(session_id)
         
         logger.info(f"Session {session_id} terminated")
         
@@ -245,7 +361,7 @@ class SessionManager:
         logger.info(f"Restarting session {session_id}")
         
         # Get process controller
-        process_controller = getattr(session, '_process_controller', None)
+        process_controller = session._process_controller
         if not process_controller:
             logger.error(f"Process controller not found for session {session_id}")
             return False
@@ -255,28 +371,82 @@ class SessionManager:
             session.claude_process = process_controller.process
             session.status = "active"
             session.update_activity()
+            with self._lock:
+                self._active_ids.add(session_id)
             logger.info(f"Session {session_id} restarted successfully")
             return True
         else:
             logger.error(f"Failed to restart session {session_id}")
             session.status = "terminated"
+            with self._lock:
+                self._active_ids.discard(session_id)
             return False
     
     def _handle_process_output(self, session_id: str, output: str):
-        """Handle output from Claude Code process"""
+        """Handle output from Claude Code process
+        
+        Called from the process reader threads, so output is handed to the
+        session's pump on the event loop instead of scheduling a task here.
+        """
         session = self.get_session(session_id)
         if session:
             session.add_output(output)
-            logger.debug(f"Output from session {session_id}: {output}")
+            # Runs per line on a reader thread; let logging format lazily
+            logger.debug("Output from session %s: %s", session_id, output)
             
             # Notify callback
-            if self.output_callback:
+            if self.output_callback and self._loop:
                 try:
-                    asyncio.create_task(
-                        self._async_output_callback(session_id, output)
-                    )
-                except Exception as e:
-                    logger.error(f"Error creating output callback task: {e}")
+                    self._loop.call_soon_threadsafe(self._schedule_output, session_id, output)
+                except RuntimeError as e:
+                    # The loop has already been closed
+                    logger.error(f"Error scheduling output callback: {e}")
+    
+    def _schedule_output(self, session_id: str, output: str):
+        """Queue output for the session's pump; runs on the event loop thread"""
+        output_queue = self._output_queues.get(session_id)
+        if output_queue is not None:
+            output_queue.put_nowait(output)
+    
+    async def _output_pump(self, session_id: str, output_queue: asyncio.Queue):
+        """Coalesce queued output and pass it to the output callback in batches"""
+        while True:
+            output = await output_queue.get()
+            if output is None:
+                return
+            
+            # Let closely spaced lines accumulate before sending
+            await asyncio.sleep(OUTPUT_BATCH_WINDOW)
+            
+            batch = [output]
+            size = len(output)
+            done = False
+            while size < OUTPUT_BATCH_MAX_CHARS and not output_queue.empty():
+                output = output_queue.get_nowait()
+                if output is None:
+                    done = True
+                    break
+                batch.append(output)
+                size += len(output) + 1
+            
+            await self._async_output_callback(session_id, "\n".join(batch))
+            if done:
+                return
+    
+    async def _stop_output_pump(self, session_id: str):
+        """Flush and stop the output pump of a session"""
+        output_queue = self._output_queues.pop(session_id, None)
+        pump = self._output_pumps.pop(session_id, None)
+        if output_queue is None or pump is None:
+            return
+        
+        # The sentinel is queued through the loop so it lands after any
+        # output the reader threads already handed over
+        asyncio.get_running_loop().call_soon_threadsafe(output_queue.put_nowait, None)
+        try:
+            await asyncio.wait_for(pump, timeout=5)
+        except asyncio.TimeoutError:
+            logger.warning(f"Output pump for session {session_id} did not finish in time")
     
     async def _async_output_callback(self, session_id: str, output: str):
         """Async wrapper for output callback"""
@@ -297,10 +467,24 @@ class SessionManager:
             self._handle_process_output(session_id, f"ERROR: {error}")
     
     async def _periodic_cleanup(self):
-        """Periodic cleanup of expired sessions"""
+        """Periodic cleanup of expired sessions
+        
+        Sleeps until the earliest session deadline, but never past the next
+        cleanup interval tick, which is the only time the active set is
+        refreshed; deadline wakeups do not poll every process.
+        """
+        interval = self.config.session.cleanup_interval
+        next_refresh = time.monotonic() + interval
         while self._running:
             try:
-                await asyncio.sleep(self.config.session.cleanup_interval)
+                delay = next_refresh - time.monotonic()
+                if self._expiry_heap:
+                    delay = min(delay, self._expiry_heap[0][0] - time.monotonic())
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if time.monotonic() >= next_refresh:
+                    self._refresh_active_ids()
+                    next_refresh = time.monotonic() + interval
                 await self._cleanup_expired_sessions()
             except asyncio.CancelledError:
                 break
@@ -309,29 +493,64 @@ class SessionManager:
     
     async def _cleanup_expired_sessions(self):
         """Clean up expired sessions"""
+        timeout = self.config.session.timeout
+        now = time.monotonic()
         expired_session_ids = []
-        
-        with self._lock:
-            for session_id, session in self.sessions.items():
-                if session.is_expired(self.config.session.timeout):
-                    expired_session_ids.append(session_id)
+        rearmed = []
+        
+        # Only sessions whose deadline has passed are looked at
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, session_id = heapq.heappop(self._expiry_heap)
+            session = self.sessions.get(session_id)
+            if session is None:
+                # Already terminated
+                continue
+            if session.is_expired(timeout):
+                expired_session_ids.append(session_id)
+            else:
+                # Active since the entry was pushed; wait for the new deadline
+                rearmed.append((session.last_activity + timeout, session_id))
+        
+        for entry in rearmed:
+            heapq.heappush(self._expiry_heap, entry)
         
         for session_id in expired_session_ids:
             logger.info(f"Cleaning up expired session {session_id}")
-            await self.terminate_session(session_id)
+        
+        await self._terminate_sessions(expired_session_ids)
     
-    def get_session_stats(self) -> dict:
-        """Get session statistics"""
+    def _refresh_active_ids(self):
+        """Drop sessions whose process has exited from the active set"""
+        inactive = [
+            session_id for session_id, session in list(self.sessions.items())
+            if not session.is_active()
+        ]
         with self._lock:
-            total_sessions = len(self.sessions)
-            active_sessions = len([s for s in self.sessions.values() if s.is_active()])
-            
-            return {
-                'total_sessions': total_sessions,
-                'active_sessions': active_sessions,
-                'inactive_sessions': total_sessions - active_sessions,
-                'session_ids': list(self.sessions.keys())
-            }
+            self._active_ids.difference_update(inactive)
+    
+    async def _terminate_sessions(self, session_ids: Sequence[str]):
+        """Terminate several sessions concurrently"""
+        results = await asyncio.gather(
+            *(self.terminate_session(session_id) for session_id in session_ids),
+            return_exceptions=True
+        )
+        
+        for session_id, result in zip(session_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error terminating session {session_id}: {result}")
+    
+    def get_session_stats(self, id_limit: Optional[int] = None) -> dict:
+        """Get session statistics, listing at most id_limit session IDs"""
+        session_ids = list(islice(self.sessions, id_limit))
+        total_sessions = len(self.sessions)
+        active_sessions = len(self._active_ids)
+        
+        return {
+            'total_sessions': total_sessions,
+            'active_sessions': active_sessions,
+            'inactive_sessions': total_sessions - active_sessions,
+            'session_ids': session_ids
+        }
     
     def set_session_created_callback(self, callback: Callable[[Session], None]):
         """Set callback for session creation events"""
@@ -4,9 +4,19 @@ Discord Bot components for Claude Bridge
 Contains Discord bot implementation, command handlers, and UI adaptations.
 """
 
-from .bot import ClaudeBridgeBot
-from .ui_components import UIConverter, PromptDetector, InteractionType
-from .progress_display import ProgressManager, ProgressDisplay, ProgressType
+import importlib
+
+# Re-exports are resolved on first access (PEP 562) so that importing one
+# submodule, such as progress_display, does not load the others
+_LAZY_IMPORTS = {
+    "ClaudeBridgeBot": ".bot",
+    "UIConverter": ".ui_components",
+    "PromptDetector": ".ui_components",
+    "InteractionType": ".ui_components",
+    "ProgressManager": ".progress_display",
+    "ProgressDisplay": ".progress_display",
+    "ProgressType": ".progress_display",
+}
 
 __all__ = [
     "ClaudeBridgeBot",
@@ -16,4 +26,15 @@ __all__ = [
     "ProgressManager",
     "ProgressDisplay",
     "ProgressType"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    """Import re-exported components lazily"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -5,17 +5,92 @@ Main Discord bot implementation with command handlers for session management.
 """
 
 import asyncio
+import functools
+import multiprocessing
+import os
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+
 import discord
 from discord.ext import commands
-from typing import Optional
+from typing import Any, Dict, Optional, Sequence, Tuple
 
+from ..core.session import Session
 from ..core.session_manager import SessionManager
-from ..output_handling.output_handler import OutputHandler
+from ..output_handling.output_handler import OutputHandler, format_and_split
 from ..utils.config import Config
 from ..utils.logging_setup import get_logger
+from ..utils.rate_limit import DiscordRateLimiter
 
 logger = get_logger('discord_bot')
 
+# Output for a channel is coalesced for up to this many seconds, or until
+# this many characters are pending, before it is sent
+OUTPUT_FLUSH_DELAY = 0.5
+OUTPUT_FLUSH_CHARS = 1900
+
+# Most user connections kept, least recently connected evicted first, and
+# how often connections to dead sessions are swept
+USER_SESSIONS_CAPACITY = 10_000
+USER_SESSION_REAP_INTERVAL = 60
+
+# Expensive read commands may run once per this many seconds per user
+COMMAND_COOLDOWN = 2.0
+
+# Most session IDs listed by the sessions command
+SESSION_LIST_LIMIT = 10
+
+# Output longer than this is formatted in a worker process, off the event
+# loop, on machines with more than FORMAT_POOL_MIN_CPUS cores
+FORMAT_OFFLOAD_CHARS = 4096
+FORMAT_POOL_MIN_CPUS = 3
+
+# Name of the webhook session output is posted through
+OUTPUT_WEBHOOK_NAME = "claude-bridge"
+
+
+# Static parts of the per-command embeds; fields are (name, inline) pairs
+# filled with values in order when the embed is rendered
+CONNECT_EMBED_TEMPLATE = {
+    'title': "✅ Session Connected",
+    'color': discord.Color.green().value,
+    'fields': (("Status", True), ("Created", True), ("Commands", True)),
+}
+STATUS_EMBED_TEMPLATE = {
+    'color': discord.Color.blue().value,
+    'fields': (
+        ("Status", True), ("Active", True), ("Commands", True), ("Output Lines", True),
+        ("Created", True), ("Last Activity", True), ("Working Directory", False),
+    ),
+}
+SESSIONS_EMBED_TEMPLATE = {
+    'title': "📋 Active Sessions",
+    'color': discord.Color.purple().value,
+    'fields': (
+        ("Total Sessions", True), ("Active Sessions", True), ("Inactive Sessions", True),
+        ("Session IDs", False),
+    ),
+}
+
+
+def _render_embed(template: Dict[str, Any], values: Sequence[Any], **overrides) -> discord.Embed:
+    """Build an embed from a template, filling its fields with values"""
+    data = dict(template, **overrides)
+    data['fields'] = [
+        {'name': name, 'value': str(value), 'inline': inline}
+        for (name, inline), value in zip(template['fields'], values, strict=True)
+    ]
+    return discord.Embed.from_dict(data)
+
+
+@dataclass(slots=True)
+class _ChannelFlushState:
+    """Pending output for one channel and the task draining it"""
+    queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+    task: Optional[asyncio.Task] = None
+
 
 class ClaudeBridgeBot(commands.Bot):
     """Discord bot for Claude Bridge session management"""
@@ -25,95 +100,267 @@ class ClaudeBridgeBot(commands.Bot):
         intents = discord.Intents.default()
         intents.message_content = True
         
+        # The presence goes out with every IDENTIFY, so reconnects restore
+        # it without a separate presence update
+        activity = discord.Activity(
+            type=discord.ActivityType.watching,
+            name="Claude Code sessions"
+        )
+        
         super().__init__(
             command_prefix='/',
             intents=intents,
-            help_command=None
+            help_command=None,
+            activity=activity
         )
         
         self.session_manager = session_manager
         self.config = config
         self.output_handler = OutputHandler()
         
-        # Track user sessions (user_id -> session_id)
-        self.user_sessions: dict[int, str] = {}
+        # Every message the bot sends goes through the rate limiter
+        self._limiter = DiscordRateLimiter()
+        
+        # The bot's own user ID, known once ready; compared on every message
+        self._user_id: Optional[int] = None
+        
+        # Worker processes for formatting large output; spawned rather than
+        # forked, since the process-reader threads are already running
+        self._formatter_pool: Optional[ProcessPoolExecutor] = None
+        if (os.cpu_count() or 1) >= FORMAT_POOL_MIN_CPUS:
+            self._formatter_pool = ProcessPoolExecutor(
+                max_workers=2, mp_context=multiprocessing.get_context('spawn')
+            )
+        
+        # The static help embed is built once and reused
+        self._help_embed = self._build_help_embed()
+        
+        # Track user sessions (user_id -> session_id), least recent first
+        self.user_sessions: OrderedDict[int, str] = OrderedDict()
+        self._reaper_task: Optional[asyncio.Task] = None
+        # Reverse index (session_id -> user_ids) for the output path
+        self._session_users: defaultdict[str, set[int]] = defaultdict(set)
+        
+        # Channel id each connected session's output goes to
+        self._session_channels: dict[str, int] = {}
+        # Pending session output per channel id, drained by one flusher each
+        self._flush_states: dict[int, _ChannelFlushState] = {}
+        # Output webhook per channel id, posting outside the bot's own buckets
+        self._webhooks: dict[int, discord.Webhook] = {}
+        # Forwarded commands still in flight, kept referenced until done
+        self._pending_sends: set[asyncio.Task] = set()
         
         # Set up session manager callbacks
         self.session_manager.set_output_callback(self._handle_session_output)
         
         # Add commands
         self.add_commands()
+        self.before_invoke(self._defer_interaction)
+        # Known command names, so free-form '/' text can skip the dispatcher
+        self._command_names = frozenset(self.all_commands)
     
     def add_commands(self):
-        """Add all Discord commands"""
+        """Add all Discord commands, as both slash and '/'-prefixed commands"""
         
-        @self.command(name='connect')
+        @self.hybrid_command(name='connect')
         async def connect_command(ctx: commands.Context, session_id: str):
             """Connect to a Claude Code session"""
             await self._connect_session(ctx, session_id)
         
-        @self.command(name='disconnect')
+        @self.hybrid_command(name='disconnect')
         async def disconnect_command(ctx: commands.Context):
             """Disconnect from current session"""
             await self._disconnect_session(ctx)
         
-        @self.command(name='status')
+        @self.hybrid_command(name='status')
+        @commands.cooldown(1, COMMAND_COOLDOWN, commands.BucketType.user)
         async def status_command(ctx: commands.Context):
             """Show current session status"""
             await self._show_status(ctx)
         
-        @self.command(name='output')
+        @self.hybrid_command(name='output')
+        @commands.cooldown(1, COMMAND_COOLDOWN, commands.BucketType.user)
         async def output_command(ctx: commands.Context, count: int = 10):
             """Get recent output from current session"""
             await self._show_output(ctx, count)
         
-        @self.command(name='history')
+        @self.hybrid_command(name='history')
+        @commands.cooldown(1, COMMAND_COOLDOWN, commands.BucketType.user)
         async def history_command(ctx: commands.Context, count: int = 10):
             """Show command history from current session"""
             await self._show_history(ctx, count)
         
-        @self.command(name='sessions')
+        @self.hybrid_command(name='sessions')
+        @commands.cooldown(1, COMMAND_COOLDOWN, commands.BucketType.user)
         async def sessions_command(ctx: commands.Context):
             """List all active sessions"""
             await self._list_sessions(ctx)
         
-        @self.command(name='help')
+        @self.hybrid_command(name='help')
         async def help_command(ctx: commands.Context):
             """Show help information"""
             await self._show_help(ctx)
     
+    async def _defer_interaction(self, ctx: commands.Context):
+        """Acknowledge a slash command before replies wait on the limiter"""
+        # Interactions must be answered within 3 seconds; the follow-up
+        # replies may then queue behind channel output and webhook setup
+        if ctx.interaction is not None and not ctx.interaction.response.is_done():
+            await ctx.defer()
+    
+    def _track_user(self, user_id: int, session_id: str, channel_id: int):
+        """Record that a user is connected to a session from a channel"""
+        self.user_sessions[user_id] = session_id
+        self.user_sessions.move_to_end(user_id)
+        self._session_users[session_id].add(user_id)
+        
+        # The session's output follows its latest connection
+        previous = self._session_channels.get(session_id)
+        self._session_channels[session_id] = channel_id
+        if previous is not None and previous != channel_id:
+            self._release_channel(previous)
+        
+        while len(self.user_sessions) > USER_SESSIONS_CAPACITY:
+            self._untrack_user(next(iter(self.user_sessions)))
+    
+    def _untrack_user(self, user_id: int):
+        """Forget a user's session connection"""
+        session_id = self.user_sessions.pop(user_id, None)
+        users = self._session_users.get(session_id)
+        if users is not None:
+            users.discard(user_id)
+            if not users:
+                del self._session_users[session_id]
+                channel_id = self._session_channels.pop(session_id, None)
+                if channel_id is not None:
+                    self._release_channel(channel_id)
+    
+    def _release_channel(self, channel_id: int):
+        """Drop a channel's output state once no connected session uses it"""
+        if channel_id in self._session_channels.values():
+            return
+        
+        self._webhooks.pop(channel_id, None)
+        state = self._flush_states.pop(channel_id, None)
+        if state is not None and state.task is not None and not state.task.done():
+            # The flusher sends what is already queued, then exits
+            state.queue.put_nowait(None)
+    
+    def _reap_user_sessions(self):
+        """Forget connections to sessions that are gone or no longer active"""
+        for session_id in list(self._session_users):
+            session = self.session_manager.get_session(session_id)
+            if session is None or not session.is_active():
+                for user_id in list(self._session_users.get(session_id, ())):
+                    self._untrack_user(user_id)
+    
+    async def _user_session_reaper(self):
+        """Periodically sweep connections to dead sessions"""
+        while True:
+            await asyncio.sleep(USER_SESSION_REAP_INTERVAL)
+            try:
+                self._reap_user_sessions()
+            except Exception as e:
+                logger.error(f"Error reaping user sessions: {e}")
+    
+    async def _send(self, target: discord.abc.Messageable, *args, **kwargs):
+        """Send a message within Discord's rate limits"""
+        return await self._limiter.send(target, *args, **kwargs)
+    
+    @staticmethod
+    def _build_help_embed() -> discord.Embed:
+        """Build the static help embed"""
+        embed = discord.Embed(
+            title="🤖 Claude Bridge Help",
+            description="Multi-Interface Session Bridge for Claude Code",
+            color=discord.Color.gold()
+        )
+        
+        commands_text = """
+        `/connect <session_id>` - Connect to a Claude Code session
+        `/disconnect` - Disconnect from current session
+        `/status` - Show current session status
+        `/output [count]` - Get recent output (default: 10 lines)
+        `/history [count]` - Show command history (default: 10 commands)
+        `/sessions` - List all active sessions
+        `/help` - Show this help message
+        """
+        
+        embed.add_field(name="Commands", value=commands_text, inline=False)
+        
+        usage_text = """
+        1. Connect to a session using `/connect <session_id>`
+        2. Send messages directly to interact with Claude Code
+        3. Use `/output` to see recent responses
+        4. Use `/disconnect` when done
+        """
+        
+        embed.add_field(name="Usage", value=usage_text, inline=False)
+        
+        return embed
+    
+    async def setup_hook(self):
+        """Register the slash versions of the commands with the guild"""
+        guild = discord.Object(id=self.config.discord.guild_id)
+        self.tree.copy_global_to(guild=guild)
+        try:
+            await self.tree.sync(guild=guild)
+        except discord.HTTPException as e:
+            logger.error(f"Failed to sync slash commands: {e}")
+    
     async def on_ready(self):
         """Called when bot is ready"""
         logger.info(f'{self.user} has connected to Discord!')
         logger.info(f'Bot is in {len(self.guilds)} guilds')
+        self._user_id = self.user.id
         
-        # Set bot status
-        activity = discord.Activity(
-            type=discord.ActivityType.watching,
-            name="Claude Code sessions"
-        )
-        await self.change_presence(activity=activity)
+        # on_ready fires again after reconnects; keep a single reaper
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._user_session_reaper())
     
     async def on_message(self, message: discord.Message):
         """Handle incoming messages"""
         # Ignore messages from the bot itself
-        if message.author == self.user:
+        author_id = message.author.id
+        if author_id == self._user_id:
             return
         
-        # Check if this is a command
-        if message.content.startswith('/'):
-            await self.process_commands(message)
-            return
+        content = message.content
+        session_id = self.user_sessions.get(author_id)
+        
+        # Check if this is a command; users in a session may also send text
+        # such as paths that merely start with '/', which goes to Claude Code
+        if content[:1] == '/':
+            name = content[1:].split(None, 1)
+            if session_id is None or (name and name[0] in self._command_names):
+                await self.process_commands(message)
+                return
         
         # Check if user is in a session and this is a direct command
-        user_id = message.author.id
-        if user_id in self.user_sessions:
-            session_id = self.user_sessions[user_id]
-            
-            # Send message as command to Claude Code
-            success = await self.session_manager.send_command(session_id, message.content)
-            if not success:
-                await message.channel.send("⚠️ Failed to send command to Claude Code session")
+        if session_id is not None:
+            # Send message as command to Claude Code without holding up the
+            # gateway; failures are reported from the done callback
+            task = asyncio.create_task(self.session_manager.send_command(session_id, content))
+            self._pending_sends.add(task)
+            task.add_done_callback(functools.partial(self._on_send_done, message.channel))
+    
+    def _on_send_done(self, channel: discord.abc.Messageable, task: asyncio.Task):
+        """Tell the channel when a forwarded command could not be sent"""
+        self._pending_sends.discard(task)
+        if task.cancelled():
+            return
+        
+        error = task.exception()
+        if error is not None:
+            logger.error(f"Error sending command to session: {error}")
+        elif task.result():
+            return
+        
+        notice = asyncio.create_task(
+            self._send(channel, "⚠️ Failed to send command to Claude Code session")
+        )
+        self._pending_sends.add(notice)
+        notice.add_done_callback(self._pending_sends.discard)
     
     async def _connect_session(self, ctx: commands.Context, session_id: str):
         """Handle session connection"""
@@ -123,78 +370,80 @@ class ClaudeBridgeBot(commands.Bot):
         if user_id in self.user_sessions:
             current_session = self.user_sessions[user_id]
             if current_session == session_id:
-                await ctx.send(f"You are already connected to session `{session_id}`")
+                await self._send(ctx, f"You are already connected to session `{session_id}`")
                 return
             else:
-                await ctx.send(f"You are already connected to session `{current_session}`. Disconnect first or use a different session ID.")
+                await self._send(ctx, f"You are already connected to session `{current_session}`. Disconnect first or use a different session ID.")
                 return
         
         # Check if session exists
         session = self.session_manager.get_session(session_id)
         if not session:
-            await ctx.send(f"❌ Session `{session_id}` not found")
+            await self._send(ctx, f"❌ Session `{session_id}` not found")
             return
         
         # Check if session is active
         if not session.is_active():
-            await ctx.send(f"❌ Session `{session_id}` is not active")
+            await self._send(ctx, f"❌ Session `{session_id}` is not active")
             return
         
         # Connect Discord channel to session
         success = await self.session_manager.connect_discord_channel(session_id, ctx.channel)
         if not success:
-            await ctx.send(f"❌ Failed to connect to session `{session_id}`")
+            await self._send(ctx, f"❌ Failed to connect to session `{session_id}`")
             return
         
         # Track user session
-        self.user_sessions[user_id] = session_id
+        self._track_user(user_id, session_id, ctx.channel.id)
+        await self._ensure_output_webhook(ctx.channel)
         
         # Send success message
-        embed = discord.Embed(
-            title="✅ Session Connected",
-            description=f"Connected to Claude Code session `{session_id}`",
-            color=discord.Color.green()
-        )
-        embed.add_field(
-            name="Status", 
-            value=session.status.title(), 
-            inline=True
-        )
-        embed.add_field(
-            name="Created", 
-            value=session.created_at.strftime("%Y-%m-%d %H:%M:%S"), 
-            inline=True
-        )
-        embed.add_field(
-            name="Commands", 
-            value=len(session.command_history), 
-            inline=True
+        embed = _render_embed(
+            CONNECT_EMBED_TEMPLATE,
+            (session.status.title(), session.created_at_display, len(session.command_history)),
+            description=f"Connected to Claude Code session `{session_id}`"
         )
         
-        await ctx.send(embed=embed)
+        await self._send(ctx, embed=embed)
         
         # Show recent output if available
         recent_output = session.get_recent_output(3)
         if recent_output:
             output_text = '\n'.join(recent_output)
             formatted_output = self.output_handler.format_for_discord(output_text)
-            await ctx.send(f"**Recent Output:**\n```\n{formatted_output}\n```")
+            await self._send(ctx, f"**Recent Output:**\n```\n{formatted_output}\n```")
+    
+    async def _require_session(self, ctx: commands.Context) -> Optional[Tuple[str, Session]]:
+        """Look up the caller's session, replying and untracking it if missing"""
+        user_id = ctx.author.id
+        session_id = self.user_sessions.get(user_id)
+        if session_id is None:
+            await self._send(ctx, "❌ You are not connected to any session")
+            return None
+        
+        session = self.session_manager.get_session(session_id)
+        if not session:
+            await self._send(ctx, f"❌ Session `{session_id}` not found")
+            # Remove invalid session
+            self._untrack_user(user_id)
+            return None
+        
+        return session_id, session
     
     async def _disconnect_session(self, ctx: commands.Context):
         """Handle session disconnection"""
         user_id = ctx.author.id
+        session_id = self.user_sessions.get(user_id)
         
-        if user_id not in self.user_sessions:
-            await ctx.send("❌ You are not connected to any session")
+        if session_id is None:
+            await self._send(ctx, "❌ You are not connected to any session")
             return
         
-        session_id = self.user_sessions[user_id]
-        
         # Disconnect from session
         await self.session_manager.disconnect_discord_channel(session_id)
         
         # Remove user session tracking
-        del self.user_sessions[user_id]
+        self._untrack_user(user_id)
         
         embed = discord.Embed(
             title="✅ Session Disconnected",
@@ -202,185 +451,112 @@ class ClaudeBridgeBot(commands.Bot):
             color=discord.Color.blue()
         )
         
-        await ctx.send(embed=embed)
+        await self._send(ctx, embed=embed)
     
     async def _show_status(self, ctx: commands.Context):
         """Show current session status"""
-        user_id = ctx.author.id
-        
-        if user_id not in self.user_sessions:
-            await ctx.send("❌ You are not connected to any session")
-            return
-        
-        session_id = self.user_sessions[user_id]
-        session = self.session_manager.get_session(session_id)
-        
-        if not session:
-            await ctx.send(f"❌ Session `{session_id}` not found")
-            # Remove invalid session
-            del self.user_sessions[user_id]
+        current = await self._require_session(ctx)
+        if current is None:
             return
+        session_id, session = current
         
         # Create status embed
-        embed = discord.Embed(
-            title=f"📊 Session Status: `{session_id}`",
-            color=discord.Color.blue()
-        )
-        
-        embed.add_field(name="Status", value=session.status.title(), inline=True)
-        embed.add_field(name="Active", value="✅" if session.is_active() else "❌", inline=True)
-        embed.add_field(name="Commands", value=len(session.command_history), inline=True)
-        embed.add_field(name="Output Lines", value=len(session.output_buffer), inline=True)
-        embed.add_field(
-            name="Created", 
-            value=session.created_at.strftime("%Y-%m-%d %H:%M:%S"), 
-            inline=True
-        )
-        embed.add_field(
-            name="Last Activity", 
-            value=session.last_activity.strftime("%Y-%m-%d %H:%M:%S"), 
-            inline=True
-        )
-        embed.add_field(
-            name="Working Directory", 
-            value=session.working_directory or "Not set", 
-            inline=False
+        embed = _render_embed(
+            STATUS_EMBED_TEMPLATE,
+            (
+                session.status.title(),
+                "✅" if session.is_active() else "❌",
+                len(session.command_history),
+                len(session.output_buffer),
+                session.created_at_display,
+                session.last_activity_display,
+                session.working_directory or "Not set",
+            ),
+            title=f"📊 Session Status: `{session_id}`"
         )
         
-        await ctx.send(embed=embed)
+        await self._send(ctx, embed=embed)
     
     async def _show_output(self, ctx: commands.Context, count: int = 10):
         """Show recent output"""
-        user_id = ctx.author.id
-        
-        if user_id not in self.user_sessions:
-            await ctx.send("❌ You are not connected to any session")
-            return
-        
-        session_id = self.user_sessions[user_id]
-        session = self.session_manager.get_session(session_id)
-        
-        if not session:
-            await ctx.send(f"❌ Session `{session_id}` not found")
-            del self.user_sessions[user_id]
+        current = await self._require_session(ctx)
+        if current is None:
             return
+        session_id, session = current
         
         # Get recent output
         recent_output = session.get_recent_output(min(count, 20))  # Max 20 lines
         
         if not recent_output:
-            await ctx.send("No output available")
+            await self._send(ctx, "No output available")
             return
         
-        # Format output for Discord
+        # Format output for Discord, splitting it if too long
         output_text = '\n'.join(recent_output)
-        formatted_output = self.output_handler.format_for_discord(output_text)
-        
-        # Split if too long
-        chunks = self.output_handler.split_long_output(formatted_output, 1900)
-        
-        for i, chunk in enumerate(chunks):
-            if i == 0:
-                await ctx.send(f"**Recent Output (last {len(recent_output)} lines):**\n```\n{chunk}\n```")
-            else:
-                await ctx.send(f"```\n{chunk}\n```")
+        _, chunks = await self._format_output(output_text)
+        
+        # Queue every chunk at once; the limiter keeps them in order per channel
+        async with asyncio.TaskGroup() as tg:
+            for i, chunk in enumerate(chunks):
+                if i == 0:
+                    tg.create_task(self._send(ctx, f"**Recent Output (last {len(recent_output)} lines):**\n```\n{chunk}\n```"))
+                else:
+                    tg.create_task(self._send(ctx, f"```\n{chunk}\n```"))
     
     async def _show_history(self, ctx: commands.Context, count: int = 10):
         """Show command history"""
-        user_id = ctx.author.id
-        
-        if user_id not in self.user_sessions:
-            await ctx.send("❌ You are not connected to any session")
-            return
-        
-        session_id = self.user_sessions[user_id]
-        session = self.session_manager.get_session(session_id)
-        
-        if not session:
-            await ctx.send(f"❌ Session `{session_id}` not found")
-            del self.user_sessions[user_id]
+        current = await self._require_session(ctx)
+        if current is None:
             return
+        session_id, session = current
         
         # Get recent commands
         recent_commands = session.get_recent_commands(min(count, 20))  # Max 20 commands
         
         if not recent_commands:
-            await ctx.send("No command history available")
+            await self._send(ctx, "No command history available")
             return
         
         # Format commands
-        history_text = '\n'.join([f"{i+1}. {cmd}" for i, cmd in enumerate(recent_commands)])
+        history_text = '\n'.join(f"{i}. {cmd}" for i, cmd in enumerate(recent_commands, 1))
         formatted_history = self.output_handler.format_for_discord(history_text)
         
-        await ctx.send(f"**Command History (last {len(recent_commands)} commands):**\n```\n{formatted_history}\n```")
+        await self._send(ctx, f"**Command History (last {len(recent_commands)} commands):**\n```\n{formatted_history}\n```")
     
     async def _list_sessions(self, ctx: commands.Context):
         """List all active sessions"""
-        stats = self.session_manager.get_session_stats()
+        # Counts are kept up to date by the manager, so this stays O(1)
+        stats = self.session_manager.get_session_stats(id_limit=SESSION_LIST_LIMIT)
         
         if stats['total_sessions'] == 0:
-            await ctx.send("No active sessions")
+            await self._send(ctx, "No active sessions")
             return
         
-        # Create sessions embed
-        embed = discord.Embed(
-            title="📋 Active Sessions",
-            color=discord.Color.purple()
-        )
-        
-        embed.add_field(name="Total Sessions", value=stats['total_sessions'], inline=True)
-        embed.add_field(name="Active Sessions", value=stats['active_sessions'], inline=True)
-        embed.add_field(name="Inactive Sessions", value=stats['inactive_sessions'], inline=True)
+        template = SESSIONS_EMBED_TEMPLATE
+        values = [stats['total_sessions'], stats['active_sessions'], stats['inactive_sessions']]
         
-        # List session IDs
+        # List session IDs, leaving the field out when there are none
         if stats['session_ids']:
-            session_list = ', '.join([f"`{sid}`" for sid in stats['session_ids'][:10]])  # Max 10
-            if len(stats['session_ids']) > 10:
-                session_list += f" and {len(stats['session_ids']) - 10} more..."
-            embed.add_field(name="Session IDs", value=session_list, inline=False)
+            session_list = ', '.join(f"`{sid}`" for sid in stats['session_ids'])
+            if stats['total_sessions'] > SESSION_LIST_LIMIT:
+                session_list += f" and {stats['total_sessions'] - SESSION_LIST_LIMIT} more..."
+            values.append(session_list)
+        else:
+            template = dict(template, fields=template['fields'][:len(values)])
+        
+        # Create sessions embed
+        embed = _render_embed(template, values)
         
-        await ctx.send(embed=embed)
+        await self._send(ctx, embed=embed)
     
     async def _show_help(self, ctx: commands.Context):
         """Show help information"""
-        embed = discord.Embed(
-            title="🤖 Claude Bridge Help",
-            description="Multi-Interface Session Bridge for Claude Code",
-            color=discord.Color.gold()
-        )
-        
-        commands_text = """
-        `/connect <session_id>` - Connect to a Claude Code session
-        `/disconnect` - Disconnect from current session
-        `/status` - Show current session status
-        `/output [count]` - Get recent output (default: 10 lines)
-        `/history [count]` - Show command history (default: 10 commands)
-        `/sessions` - List all active sessions
-        `/help` - Show this help message
-        """
-        
-        embed.add_field(name="Commands", value=commands_text, inline=False)
-        
-        usage_text = """
-        1. Connect to a session using `/connect <session_id>`
-        2. Send messages directly to interact with Claude Code
-        3. Use `/output` to see recent responses
-        4. Use `/disconnect` when done
-        """
-        
-        embed.add_field(name="Usage", value=usage_text, inline=False)
-        
-        await ctx.send(embed=embed)
+        await self._send(ctx, embed=self._help_embed)
     
     async def _handle_session_output(self, session_id: str, output: str):
         """Handle output from session manager"""
-        # Find users connected to this session
-        connected_users = [
-            user_id for user_id, sid in self.user_sessions.items() 
-            if sid == session_id
-        ]
-        
-        if not connected_users:
+        # Only sessions with connected users are forwarded
+        if not self._session_users.get(session_id):
             return
         
         # Get session to find Discord channel
@@ -388,26 +564,142 @@ class ClaudeBridgeBot(commands.Bot):
         if not session or not session.discord_channel:
             return
         
+        # Queue rather than send, so bursts become a single message
+        self._queue_channel_output(session.discord_channel, output)
+    
+    def _queue_channel_output(self, channel: discord.abc.Messageable, output: str):
+        """Queue output for a channel, starting its flusher on first use"""
+        state = self._flush_states.get(channel.id)
+        if state is None:
+            state = self._flush_states[channel.id] = _ChannelFlushState()
+        
+        if state.task is None or state.task.done():
+            state.task = asyncio.create_task(self._channel_flusher(channel, state.queue))
+        
+        state.queue.put_nowait(output)
+    
+    async def _channel_flusher(self, channel: discord.abc.Messageable, queue: asyncio.Queue):
+        """Send queued output for a channel in coalesced batches
+        
+        A None in the queue, put there by _release_channel, ends the flusher
+        once the output queued before it is sent.
+        """
+        loop = asyncio.get_running_loop()
+        released = False
+        
+        while not released:
+            output = await queue.get()
+            if output is None:
+                return
+            pending = [output]
+            size = len(output)
+            deadline = loop.time() + OUTPUT_FLUSH_DELAY
+            
+            # Gather more output until the batch is full or the deadline passes
+            while size < OUTPUT_FLUSH_CHARS:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    output = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if output is None:
+                    released = True
+                    break
+                pending.append(output)
+                size += len(output) + 1
+            
+            await self._send_output(channel, '\n'.join(pending))
+    
+    async def _ensure_output_webhook(self, channel: discord.abc.Messageable):
+        """Find or create the channel's output webhook, if the bot may"""
+        if channel.id in self._webhooks or not isinstance(channel, discord.TextChannel):
+            return
+        
+        try:
+            for webhook in await channel.webhooks():
+                if webhook.name == OUTPUT_WEBHOOK_NAME and webhook.token:
+                    break
+            else:
+                webhook = await channel.create_webhook(name=OUTPUT_WEBHOOK_NAME)
+        except discord.HTTPException as e:
+            # Typically a missing Manage Webhooks permission
+            logger.warning(f"Output webhook unavailable in channel {channel.id}: {e}")
+            return
+        
+        self._webhooks[channel.id] = webhook
+    
+    async def _format_output(self, text: str) -> Tuple[str, Sequence[str]]:
+        """Format text for Discord and split it, in a worker if it is large"""
+        if self._formatter_pool is not None and len(text) > FORMAT_OFFLOAD_CHARS:
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self._formatter_pool, format_and_split, text, 1900)
+            except BrokenProcessPool as e:
+                # Keep formatting inline rather than losing output
+                logger.error(f"Formatter pool failed, formatting inline: {e}")
+                self._formatter_pool = None
+        
+        formatted = self.output_handler.format_for_discord(text)
+        return formatted, self.output_handler.split_long_output(formatted, 1900)
+    
+    async def _send_output(self, channel: discord.abc.Messageable, output: str):
+        """Format output once and send it as code blocks"""
         # Format output for Discord
-        formatted_output = self.output_handler.format_for_discord(output)
+        formatted_output, chunks = await self._format_output(output)
+        if not formatted_output.strip():
+            return
         
-        # Send to Discord channel
+        # Send through the channel's webhook where there is one
+        target = self._webhooks.get(channel.id, channel)
         try:
-            if formatted_output.strip():
-                await session.discord_channel.send(f"```\n{formatted_output}\n```")
+            for chunk in chunks:
+                content = f"```\n{chunk}\n```"
+                try:
+                    await self._send(target, content)
+                except discord.NotFound:
+                    if target is channel:
+                        raise
+                    # The webhook was deleted; fall back to the channel
+                    logger.warning(f"Output webhook for channel {channel.id} is gone")
+                    self._webhooks.pop(channel.id, None)
+                    target = channel
+                    await self._send(target, content)
         except discord.errors.HTTPException as e:
             logger.error(f"Failed to send output to Discord: {e}")
         except Exception as e:
             logger.error(f"Unexpected error sending output to Discord: {e}")
     
+    async def close(self):
+        """Stop background tasks and close the bot"""
+        tasks = [state.task for state in self._flush_states.values() if state.task]
+        if self._reaper_task:
+            tasks.append(self._reaper_task)
+        
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._flush_states.clear()
+        self._reaper_task = None
+        
+        if self._formatter_pool is not None:
+            self._formatter_pool.shutdown(wait=False, cancel_futures=True)
+        
+        await super().close()
+    
     async def on_command_error(self, ctx: commands.Context, error: commands.CommandError):
         """Handle command errors"""
+        # Failed checks and cooldowns stop a command before its invoke hooks
+        await self._defer_interaction(ctx)
         if isinstance(error, commands.CommandNotFound):
-            await ctx.send("❌ Unknown command. Use `/help` for available commands.")
+            await self._send(ctx, "❌ Unknown command. Use `/help` for available commands.")
         elif isinstance(error, commands.MissingRequiredArgument):
-            await ctx.send(f"❌ Missing required argument: `{error.param.name}`")
+            await self._send(ctx, f"❌ Missing required argument: `{error.param.name}`")
         elif isinstance(error, commands.BadArgument):
-            await ctx.send(f"❌ Invalid argument: {error}")
+            await self._send(ctx, f"❌ Invalid argument: {error}")
+        elif isinstance(error, commands.CommandOnCooldown):
+            await self._send(ctx, f"⏳ Slow down, try again in {error.retry_after:.1f}s")
         else:
             logger.error(f"Unhandled command error: {error}")
-            await ctx.send("❌ An error occurred while processing the command.")
\ No newline at end of file
+            await self._send(ctx, "❌ An error occurred while processing the command.")
\ No newline at end of file
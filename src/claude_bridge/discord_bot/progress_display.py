@@ -4,18 +4,88 @@ Progress Display System for Discord
 Manages progress indicators, long-running task updates, and live status displays.
 """
 
+from __future__ import annotations
+
 import asyncio
+import functools
+import heapq
 import time
 import re
-from typing import Dict, List, Optional, Any, Callable
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Callable, Tuple
 from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from enum import Enum
-import discord
 
 from ..utils.logging_setup import get_logger
+from ..utils.text import build_scan_database, fold_for_screen, scan_pattern_ids
+
+# discord.py is only needed once a display talks to Discord; annotations
+# are not evaluated, so detection alone never imports it
+if TYPE_CHECKING:
+    import discord
 
 logger = get_logger('progress_display')
 
+# Characters at least one progress pattern needs; text with none of them,
+# no status word and no number next to a numeric word cannot match, so
+# detection skips the regexes
+_PROGRESS_MARKERS = frozenset('%█▉▊▋▌▍▎▏░▒▓[|/\\-⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏')
+_STATUS_WORDS = (
+    'loading', 'processing', 'downloading', 'installing', 'building',
+    'compiling', 'working on', 'preparing', 'initializing', 'setting up',
+    'please wait',
+)
+_NUMERIC_WORDS = ('percent', 'progress', 'of')
+_DIGIT = re.compile(r'\d')
+
+# Bar drawing characters and percentages stripped from a progress line to
+# leave its context message; '-' is escaped, so '=' is a literal, not a range
+_BAR_CHARS_RE = re.compile(r'[█▉▊▋▌▍▎▏░▒▓\[\]|\/\-\\=]+')
+_PCT_RE = re.compile(r'\d+\s*%')
+
+
+# Seconds a finished progress display stays listed before removal
+PROGRESS_LINGER = 5
+
+# Width of the text progress bar, in characters
+PROGRESS_BAR_LENGTH = 20
+
+# Unicode blocks for smooth progress, in eighths of a character
+_BAR_BLOCKS = ('░', '▏', '▎', '▍', '▌', '▋', '▊', '▉', '█')
+
+
+def _render_bar(tenths: int) -> str:
+    """Render the progress bar for a percentage given in tenths of a percent"""
+    # Integer arithmetic: the bar is filled to tenths / 50 characters
+    filled_length, rest = divmod(tenths * PROGRESS_BAR_LENGTH, 1000)
+    parts = ['█'] * filled_length
+    
+    # Add partial block if needed
+    partial_index = rest * 8 // 1000
+    if filled_length < PROGRESS_BAR_LENGTH and 0 < partial_index < 8:
+        parts.append(_BAR_BLOCKS[partial_index])
+    
+    parts.extend('░' * (PROGRESS_BAR_LENGTH - len(parts)))
+    return ''.join(parts)
+
+
+# Every bar from 0.0% to 100.0%, indexed by tenths of a percent
+_BAR_CACHE = tuple(_render_bar(tenths) for tenths in range(1001))
+
+
+@functools.lru_cache(maxsize=1024)
+def _embed_timestamp(seconds: int) -> datetime:
+    """UTC datetime for a whole-second embed timestamp, shared by all displays"""
+    return datetime.fromtimestamp(seconds, tz=timezone.utc)
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_duration(secs: int) -> str:
+    """Format whole seconds as '42s' or '3m 5s'"""
+    if secs >= 60:
+        return f"{secs // 60}m {secs % 60}s"
+    return f"{secs}s"
+
 
 class ProgressType(Enum):
     """Types of progress displays"""
@@ -27,7 +97,7 @@ class ProgressType(Enum):
     STEPS = "steps"            # Step-by-step progress
 
 
-@dataclass
+@dataclass(slots=True)
 class ProgressState:
     """Represents the state of a progress display"""
     session_id: str
@@ -38,7 +108,14 @@ class ProgressState:
     status: str = "running"  # running, complete, error, cancelled
     start_time: float = field(default_factory=time.time)
     last_update: float = field(default_factory=time.time)
-    metadata: Dict = field(default_factory=dict)
+    # Created on first write; most states never get metadata
+    metadata: Optional[Dict] = None
+    
+    def update_metadata(self, values: Dict):
+        """Merge values into the metadata, creating it if needed"""
+        if self.metadata is None:
+            self.metadata = {}
+        self.metadata.update(values)
     
     @property
     def percentage(self) -> float:
@@ -99,17 +176,47 @@ class ProgressDetector:
         ]
     }
     
+    # PATTERNS flattened into one tuple, in priority order. The patterns are
+    # kept separate: each keeps SRE's literal/charset prefix scan, which a
+    # single combined alternation loses
+    _ORDERED = tuple(
+        (progress_type, pattern)
+        for progress_type, patterns in PATTERNS.items()
+        for pattern in patterns
+    )
+    
     @classmethod
-    def detect_progress(cls, text: str) -> Optional[Dict]:
-        """Detect progress indicators in text"""
-        if not text or not text.strip():
+    def detect_progress(cls, text: str, pos: int = 0) -> Optional[Dict]:
+        """Detect progress indicators in text, starting the scan at pos"""
+        # Only the screen needs a copy of the unscanned part; the patterns
+        # search the original text from pos
+        tail = text[pos:] if pos else text
+        if not tail or tail.isspace():
+            return None
+        
+        # Status words are plain literals: a casefolded substring scan rules
+        # the STATUS regexes in or out without entering the regex engine
+        folded = fold_for_screen(tail)
+        has_status = any(word in folded for word in _STATUS_WORDS)
+        
+        # Cheap screen: most output lines carry no progress marker at all
+        if not has_status and _PROGRESS_MARKERS.isdisjoint(tail) and not (
+            _DIGIT.search(tail) and any(word in folded for word in _NUMERIC_WORDS)
+        ):
             return None
         
-        for progress_type, patterns in cls.PATTERNS.items():
-            for pattern in patterns:
-                match = pattern.search(text)
-                if match:
-                    return cls._extract_progress_info(text, match, progress_type)
+        candidates = cls._ORDERED
+        if _SCAN_DB is not None:
+            # One multi-pattern pass tells which patterns occur at all; SRE
+            # then only runs those, in priority order, for the match groups
+            candidates = [cls._ORDERED[i] for i in scan_pattern_ids(_SCAN_DB, tail)]
+        
+        for progress_type, pattern in candidates:
+            if progress_type is ProgressType.STATUS and not has_status:
+                continue
+            match = pattern.search(text, pos)
+            if match:
+                return cls._extract_progress_info(text, match, progress_type)
         
         return None
     
@@ -124,13 +231,13 @@ class ProgressDetector:
             'groups': match.groups()
         }
         
-        if progress_type == ProgressType.PERCENTAGE:
+        if progress_type is ProgressType.PERCENTAGE:
             try:
                 info['percentage'] = float(match.group(1))
             except (ValueError, IndexError):
                 info['percentage'] = 0.0
                 
-        elif progress_type == ProgressType.COUNTER:
+        elif progress_type is ProgressType.COUNTER:
             try:
                 info['current'] = int(match.group(1))
                 info['total'] = int(match.group(2))
@@ -140,7 +247,7 @@ class ProgressDetector:
                 info['total'] = 100
                 info['percentage'] = 0.0
                 
-        elif progress_type == ProgressType.STEPS:
+        elif progress_type is ProgressType.STEPS:
             try:
                 info['current_step'] = int(match.group(1))
                 info['total_steps'] = int(match.group(2))
@@ -150,20 +257,24 @@ class ProgressDetector:
                 info['total_steps'] = 1
                 info['percentage'] = 0.0
         
-        # Extract context message
-        lines = text.split('\n')
-        for line in lines:
-            if match.group() in line:
-                # Clean the line and use it as context
-                clean_line = re.sub(r'[█▉▊▋▌▍▎▏░▒▓\[\]|\/\-\\=]+', '', line).strip()
-                clean_line = re.sub(r'\d+\s*%', '', clean_line).strip()
-                if clean_line:
-                    info['context_message'] = clean_line
-                break
+        # Extract context message from the line(s) holding the match
+        start = text.rfind('\n', 0, match.start()) + 1
+        end = text.find('\n', match.end())
+        line = text[start:] if end == -1 else text[start:end]
+        
+        # Clean the line and use it as context
+        clean_line = _BAR_CHARS_RE.sub('', line).strip()
+        clean_line = _PCT_RE.sub('', clean_line).strip()
+        if clean_line:
+            info['context_message'] = clean_line
         
         return info
 
 
+# Hyperscan database over ProgressDetector._ORDERED, or None to scan with re
+_SCAN_DB = build_scan_database([pattern for _, pattern in ProgressDetector._ORDERED])
+
+
 class ProgressDisplay:
     """Manages a single progress display"""
     
@@ -176,25 +287,61 @@ class ProgressDisplay:
         self._update_lock = asyncio.Lock()
         self._last_discord_update = 0
         self.update_interval = 2.0  # Minimum seconds between Discord updates
+        # What the last sent embed showed, so identical edits are skipped
+        self._last_embed_key: Optional[tuple] = None
+        # Updates only touch state; one flusher task applies them to Discord
+        # at most every update_interval, or at once for urgent changes
+        self._dirty = asyncio.Event()
+        self._urgent = False
+        self._flusher_task: Optional[asyncio.Task] = None
         
     async def update(self, new_info: Dict):
         """Update progress display"""
-        async with self._update_lock:
-            # Update state
-            old_percentage = self.state.percentage
-            self._update_state(new_info)
+        # Only state changes here; the producer never waits on Discord
+        old_percentage = self.state.percentage
+        self._update_state(new_info)
+        
+        # The first message, completion and 5% jumps skip the update interval
+        if (self.message is None or self.state.is_complete or
+                abs(self.state.percentage - old_percentage) >= 5.0):
+            self._urgent = True
+        
+        self._dirty.set()
+        if self._flusher_task is None or self._flusher_task.done():
+            self._flusher_task = asyncio.create_task(self._flush_loop())
+    
+    async def _flush_loop(self):
+        """Apply pending state changes to the Discord message"""
+        while True:
+            await self._dirty.wait()
+            if not self._urgent:
+                delay = self.update_interval - (time.time() - self._last_discord_update)
+                if delay > 0:
+                    await asyncio.sleep(delay)
             
-            # Check if we should update Discord message
-            current_time = time.time()
-            should_update = (
-                current_time - self._last_discord_update >= self.update_interval or
-                self.state.is_complete or
-                abs(self.state.percentage - old_percentage) >= 5.0  # 5% change
-            )
+            self._dirty.clear()
+            self._urgent = False
+            # Stopping the flusher must not abandon a send half way, or the
+            # message it creates would be lost; the lock makes a final
+            # update wait for it instead
+            await asyncio.shield(self._flush_once())
             
-            if should_update:
-                await self._update_discord_message()
-                self._last_discord_update = current_time
+            # Nothing follows a completed display
+            if self.state.is_complete:
+                return
+    
+    async def _flush_once(self):
+        """Send the current state, one Discord request at a time"""
+        async with self._update_lock:
+            await self._update_discord_message()
+            self._last_discord_update = time.time()
+    
+    async def _stop_flusher(self):
+        """Stop the flusher so a final update is not overwritten"""
+        task, self._flusher_task = self._flusher_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
     
     def _update_state(self, info: Dict):
         """Update progress state from detected info"""
@@ -218,7 +365,7 @@ class ProgressDisplay:
             self.state.message = info['context_message']
         
         # Update metadata
-        self.state.metadata.update({
+        self.state.update_metadata({
             'last_raw_text': info.get('raw_text', ''),
             'last_matched': info.get('matched_text', ''),
             'detection_time': time.time()
@@ -228,8 +375,22 @@ class ProgressDisplay:
         if self.state.percentage >= 100.0:
             self.state.status = "complete"
     
+    def _embed_key(self) -> tuple:
+        """Visible embed content, with elapsed time in 5 second steps"""
+        state = self.state
+        return (
+            round(state.percentage, 1), state.status, state.message,
+            int(state.current_value), int(state.max_value), int(state.elapsed_time // 5)
+        )
+    
     async def _update_discord_message(self):
         """Update the Discord message"""
+        import discord
+        
+        key = self._embed_key()
+        if self.message is not None and key == self._last_embed_key:
+            return
+        
         embed = self._create_progress_embed()
         
         try:
@@ -242,17 +403,27 @@ class ProgressDisplay:
             self.message = await self.channel.send(embed=embed)
         except Exception as e:
             logger.error(f"Error updating progress message: {e}")
+            return
+        self._last_embed_key = key
     
     def _create_progress_embed(self) -> discord.Embed:
         """Create Discord embed for progress display"""
+        import discord
+        
+        # percentage is computed on every read, so read state once
+        state = self.state
+        percentage = state.percentage
+        status = state.status
+        progress_type = state.progress_type
+        
         # Choose color based on status
-        if self.state.status == "complete":
+        if status == "complete":
             color = discord.Color.green()
             title_emoji = "✅"
-        elif self.state.status == "error":
+        elif status == "error":
             color = discord.Color.red()
             title_emoji = "❌"
-        elif self.state.status == "cancelled":
+        elif status == "cancelled":
             color = discord.Color.orange()
             title_emoji = "⏹️"
         else:
@@ -263,7 +434,7 @@ class ProgressDisplay:
         embed = discord.Embed(
             title=f"{title_emoji} Progress Update",
             color=color,
-            timestamp=discord.utils.utcfromtimestamp(self.state.last_update)
+            timestamp=_embed_timestamp(int(state.last_update))
         )
         
         # Add progress bar
@@ -275,39 +446,30 @@ class ProgressDisplay:
         )
         
         # Add status message
-        if self.state.message:
+        if state.message:
             embed.add_field(
                 name="Status",
-                value=self.state.message,
+                value=state.message,
                 inline=False
             )
         
         # Add statistics
-        stats_text = f"**{self.state.percentage:.1f}%** complete"
+        stats_text = f"**{percentage:.1f}%** complete"
         
-        if self.state.progress_type == ProgressType.COUNTER:
-            stats_text += f" ({int(self.state.current_value)}/{int(self.state.max_value)})"
-        elif self.state.progress_type == ProgressType.STEPS:
-            stats_text += f" (Step {int(self.state.current_value)}/{int(self.state.max_value)})"
-        
-        # Add time information
-        elapsed = self.state.elapsed_time
-        if elapsed > 60:
-            elapsed_str = f"{int(elapsed // 60)}m {int(elapsed % 60)}s"
-        else:
-            elapsed_str = f"{int(elapsed)}s"
+        if progress_type is ProgressType.COUNTER:
+            stats_text += f" ({int(state.current_value)}/{int(state.max_value)})"
+        elif progress_type is ProgressType.STEPS:
+            stats_text += f" (Step {int(state.current_value)}/{int(state.max_value)})"
         
-        stats_text += f"\nElapsed: {elapsed_str}"
+        # Add time information; one clock read serves both figures
+        elapsed = time.time() - state.start_time
+        stats_text += f"\nElapsed: {_format_duration(int(elapsed))}"
         
         # Estimate remaining time
-        if self.state.percentage > 0 and not self.state.is_complete:
-            estimated_total = elapsed / (self.state.percentage / 100.0)
+        if percentage > 0 and not state.is_complete:
+            estimated_total = elapsed / (percentage / 100.0)
             remaining = estimated_total - elapsed
-            if remaining > 60:
-                remaining_str = f"{int(remaining // 60)}m {int(remaining % 60)}s"
-            else:
-                remaining_str = f"{int(remaining)}s"
-            stats_text += f"\nEstimated remaining: {remaining_str}"
+            stats_text += f"\nEstimated remaining: {_format_duration(int(remaining))}"
         
         embed.add_field(
             name="Statistics",
@@ -319,28 +481,13 @@ class ProgressDisplay:
     
     def _create_progress_bar(self) -> str:
         """Create a text-based progress bar"""
-        bar_length = 20
-        filled_length = int(bar_length * self.state.percentage / 100.0)
-        
-        # Unicode blocks for smooth progress
-        blocks = ['░', '▏', '▎', '▍', '▌', '▋', '▊', '▉', '█']
-        
-        bar = '█' * filled_length
-        
-        # Add partial block if needed
-        if filled_length < bar_length:
-            remaining = (bar_length * self.state.percentage / 100.0) - filled_length
-            partial_index = int(remaining * 8)
-            if partial_index > 0 and partial_index < 8:
-                bar += blocks[partial_index]
-                filled_length += 1
-        
-        bar += '░' * (bar_length - len(bar))
-        
-        return f"```\n{bar} {self.state.percentage:.1f}%\n```"
+        percentage = self.state.percentage
+        tenths = min(1000, max(0, round(percentage * 10)))
+        return f"```\n{_BAR_CACHE[tenths]} {percentage:.1f}%\n```"
     
     async def complete(self, message: str = "Task completed successfully"):
         """Mark progress as complete"""
+        await self._stop_flusher()
         async with self._update_lock:
             self.state.status = "complete"
             self.state.current_value = self.state.max_value
@@ -349,6 +496,7 @@ class ProgressDisplay:
     
     async def error(self, message: str = "Task failed"):
         """Mark progress as error"""
+        await self._stop_flusher()
         async with self._update_lock:
             self.state.status = "error"
             self.state.message = message
@@ -356,6 +504,7 @@ class ProgressDisplay:
     
     async def cancel(self, message: str = "Task cancelled"):
         """Mark progress as cancelled"""
+        await self._stop_flusher()
         async with self._update_lock:
             self.state.status = "cancelled"
             self.state.message = message
@@ -367,22 +516,42 @@ class ProgressManager:
     
     def __init__(self):
         self.active_progress: Dict[str, ProgressDisplay] = {}
+        # Length of the accumulated output already scanned, per session
+        self._scanned_offset: Dict[str, int] = {}
+        # Min-heap of (last_update, session_id) pushed on every update; an
+        # entry whose time no longer matches its display's state is stale
+        self._expiry_heap: List[Tuple[float, str]] = []
         self._lock = asyncio.Lock()
         
     async def handle_output(self, session_id: str, text: str, 
-                          channel: discord.TextChannel) -> bool:
+                          channel: discord.TextChannel,
+                          accumulated: bool = False) -> bool:
         """
         Handle output text and manage progress displays
         Returns True if text was handled as progress
+        
+        With accumulated=True, text is the session's whole output buffer so
+        far and only the part added since the last call is scanned; call
+        forget_session when the session ends.
         """
+        pos = 0
+        if accumulated:
+            scanned = self._scanned_offset.get(session_id, 0)
+            # Rescan the last line, which may have been incomplete; a buffer
+            # shorter than before is a new one and is scanned in full
+            if scanned <= len(text):
+                pos = text.rfind('\n', 0, scanned) + 1
+            self._scanned_offset[session_id] = len(text)
+        
         # Detect progress in text
-        progress_info = ProgressDetector.detect_progress(text)
+        progress_info = ProgressDetector.detect_progress(text, pos)
         if not progress_info:
             return False
         
         async with self._lock:
             # Get or create progress display
-            if session_id not in self.active_progress:
+            display = self.active_progress.get(session_id)
+            if display is None:
                 # Create new progress state
                 state = ProgressState(
                     session_id=session_id,
@@ -390,40 +559,72 @@ class ProgressManager:
                 )
                 
                 # Create progress display
-                self.active_progress[session_id] = ProgressDisplay(
+                display = self.active_progress[session_id] = ProgressDisplay(
                     session_id, channel, state
                 )
                 
                 logger.info(f"Created progress display for session {session_id}")
-            
-            # Update existing progress
-            await self.active_progress[session_id].update(progress_info)
+        
+        # Update outside the manager lock; the display serializes its own updates
+        await display.update(progress_info)
+        self._track_update(session_id, display)
         
         return True
     
-    async def complete_progress(self, session_id: str, message: str = None):
-        """Mark progress as complete for a session"""
+    def _track_update(self, session_id: str, display: ProgressDisplay):
+        """Record a display's update time for cleanup_inactive"""
+        heap = self._expiry_heap
+        heapq.heappush(heap, (display.state.last_update, session_id))
+        
+        # Frequent updates leave mostly stale entries; rebuild from the live
+        # displays once they outnumber them well
+        if len(heap) > 4 * len(self.active_progress) + 64:
+            heap[:] = [
+                (active.state.last_update, active_id)
+                for active_id, active in self.active_progress.items()
+            ]
+            heapq.heapify(heap)
+    
+    async def _get_display(self, session_id: str) -> Optional[ProgressDisplay]:
+        """Get a session's display under the lock"""
         async with self._lock:
-            if session_id in self.active_progress:
-                await self.active_progress[session_id].complete(message)
-                # Keep for a bit then remove
-                await asyncio.sleep(5)
+            return self.active_progress.get(session_id)
+    
+    def _remove_later(self, session_id: str, display: ProgressDisplay):
+        """Drop a finished display after PROGRESS_LINGER seconds"""
+        def remove():
+            # A newer display for the session stays
+            if self.active_progress.get(session_id) is display:
                 del self.active_progress[session_id]
+        
+        asyncio.get_running_loop().call_later(PROGRESS_LINGER, remove)
+    
+    async def complete_progress(self, session_id: str, message: str = None):
+        """Mark progress as complete for a session"""
+        display = await self._get_display(session_id)
+        if display is not None:
+            await display.complete(message)
+            # Keep for a bit then remove
+            self._remove_later(session_id, display)
     
     async def error_progress(self, session_id: str, message: str = None):
         """Mark progress as error for a session"""
-        async with self._lock:
-            if session_id in self.active_progress:
-                await self.active_progress[session_id].error(message)
-                await asyncio.sleep(5)
-                del self.active_progress[session_id]
+        display = await self._get_display(session_id)
+        if display is not None:
+            await display.error(message)
+            self._remove_later(session_id, display)
     
     async def cancel_progress(self, session_id: str, message: str = None):
         """Cancel progress for a session"""
         async with self._lock:
-            if session_id in self.active_progress:
-                await self.active_progress[session_id].cancel(message)
-                del self.active_progress[session_id]
+            display = self.active_progress.pop(session_id, None)
+        if display is not None:
+            await display.cancel(message)
+    
+    async def forget_session(self, session_id: str):
+        """Drop everything kept for a session that has ended"""
+        self._scanned_offset.pop(session_id, None)
+        await self.cancel_progress(session_id)
     
     def has_active_progress(self, session_id: str) -> bool:
         """Check if session has active progress display"""
@@ -437,19 +638,25 @@ class ProgressManager:
     
     async def cleanup_inactive(self, max_age: float = 600):  # 10 minutes
         """Clean up inactive progress displays"""
-        current_time = time.time()
-        to_remove = []
+        cutoff = time.time() - max_age
+        heap = self._expiry_heap
+        stale = []
         
+        # Only the bookkeeping happens under the lock; Discord edits follow.
+        # The heap yields the expired entries oldest first, so a sweep never
+        # looks at displays updated within max_age
         async with self._lock:
-            for session_id, display in self.active_progress.items():
-                if (current_time - display.state.last_update > max_age and
-                    not display.state.is_complete):
-                    to_remove.append(session_id)
-            
-            for session_id in to_remove:
-                await self.active_progress[session_id].cancel("Progress timeout")
-                del self.active_progress[session_id]
-                logger.info(f"Cleaned up inactive progress for session {session_id}")
+            while heap and heap[0][0] < cutoff:
+                last_update, session_id = heapq.heappop(heap)
+                display = self.active_progress.get(session_id)
+                if (display is not None and display.state.last_update == last_update and
+                        not display.state.is_complete):
+                    del self.active_progress[session_id]
+                    stale.append((session_id, display))
+        
+        for session_id, display in stale:
+            await display.cancel("Progress timeout")
+            logger.info(f"Cleaned up inactive progress for session {session_id}")
     
     def get_all_active(self) -> List[str]:
         """Get all sessions with active progress"""
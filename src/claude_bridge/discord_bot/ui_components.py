@@ -5,16 +5,44 @@ Interactive UI components that convert Claude Code prompts to Discord buttons, m
 """
 
 import asyncio
+import functools
 import re
+import weakref
 from typing import List, Dict, Optional, Callable, Any, Tuple
 from enum import Enum
 import discord
 from discord.ext import commands
 
 from ..utils.logging_setup import get_logger
+from ..utils.text import build_scan_database, fold_for_screen, scan_pattern_ids
 
 logger = get_logger('ui_components')
 
+# Number of distinct texts whose prompt detection result is kept
+PROMPT_CACHE_SIZE = 512
+
+# Longer texts are detected without caching, so the cache stays small
+PROMPT_CACHE_MAX_CHARS = 8192
+
+# Seconds a prompt handler waits for the user's answer
+PROMPT_RESPONSE_TIMEOUT = 300
+
+# Seconds between sweeps for answered or timed-out pending interactions
+PENDING_SWEEP_INTERVAL = 60
+
+# Static title and colour of each embed, passed straight to discord.Embed
+# with the per-prompt description; Embed.copy() of a prebuilt embed would
+# round-trip through to_dict and cost more than building a fresh one
+CONFIRMED_EMBED_TEMPLATE = {'title': "✅ Confirmed", 'color': discord.Color.green()}
+CANCELLED_EMBED_TEMPLATE = {'title': "❌ Cancelled", 'color': discord.Color.red()}
+SELECTED_EMBED_TEMPLATE = {'title': "✅ Selected", 'color': discord.Color.green()}
+INPUT_RECEIVED_EMBED_TEMPLATE = {'title': "✅ Input Received", 'color': discord.Color.green()}
+TIMED_OUT_EMBED_TEMPLATE = {'title': "⏱️ Timed Out", 'color': discord.Color.orange()}
+YES_NO_EMBED_TEMPLATE = {'title': "🤔 Confirmation Required", 'color': discord.Color.blue()}
+CHOICE_EMBED_TEMPLATE = {'title': "📝 Please Select", 'color': discord.Color.blue()}
+TEXT_INPUT_EMBED_TEMPLATE = {'title': "✏️ Input Required", 'color': discord.Color.blue()}
+TEXT_PROMPT_EMBED_TEMPLATE = {'title': "💬 Response Required", 'color': discord.Color.blue()}
+
 
 class InteractionType(Enum):
     """Types of interactive prompts"""
@@ -29,45 +57,59 @@ class InteractionType(Enum):
 class PromptDetector:
     """Detects interactive prompts in Claude Code output"""
     
-    # Patterns for different types of prompts
+    # Patterns for different types of prompts. The prompts are English, so
+    # case-insensitive patterns use re.ASCII: sre then folds case without
+    # Unicode tables, and \s and \d stop matching non-ASCII characters
     PATTERNS = {
-        InteractionType.YES_NO: [
-            re.compile(r'(.*?)\s*\(y/n\)', re.IGNORECASE),
-            re.compile(r'(.*?)\s*\(yes/no\)', re.IGNORECASE),
-            re.compile(r'Do you want to\s+(.*?)\?', re.IGNORECASE),
-            re.compile(r'Would you like to\s+(.*?)\?', re.IGNORECASE),
-            re.compile(r'Continue\s+.*?\?', re.IGNORECASE),
-            re.compile(r'Proceed\s+.*?\?', re.IGNORECASE),
-        ],
-        
-        InteractionType.CHOICE: [
+        InteractionType.YES_NO: (
+            re.compile(r'(.*?)\s*\(y/n\)', re.IGNORECASE | re.ASCII),
+            re.compile(r'(.*?)\s*\(yes/no\)', re.IGNORECASE | re.ASCII),
+            re.compile(r'Do you want to\s+(.*?)\?', re.IGNORECASE | re.ASCII),
+            re.compile(r'Would you like to\s+(.*?)\?', re.IGNORECASE | re.ASCII),
+            re.compile(r'Continue\s+.*?\?', re.IGNORECASE | re.ASCII),
+            re.compile(r'Proceed\s+.*?\?', re.IGNORECASE | re.ASCII),
+        ),
+        
+        InteractionType.CHOICE: (
             re.compile(r'Select an option:\s*\n((?:\d+[.)]\s+.*\n?)+)', re.MULTILINE),
             re.compile(r'Choose from:\s*\n((?:[a-zA-Z][.)]\s+.*\n?)+)', re.MULTILINE),
             re.compile(r'Pick one:\s*\n((?:\*\s+.*\n?)+)', re.MULTILINE),
             re.compile(r'Options:\s*\n((?:\d+[.)]\s+.*\n?)+)', re.MULTILINE),
-        ],
-        
-        InteractionType.TEXT_INPUT: [
-            re.compile(r'Enter\s+(.*?):', re.IGNORECASE),
-            re.compile(r'Input\s+(.*?):', re.IGNORECASE),
-            re.compile(r'Type\s+(.*?):', re.IGNORECASE),
-            re.compile(r'Provide\s+(.*?):', re.IGNORECASE),
-            re.compile(r'What\s+.*\s+(.*?)\?', re.IGNORECASE),
-        ],
-        
-        InteractionType.FILE_SELECTION: [
-            re.compile(r'Select\s+a?\s*files?\s*:', re.IGNORECASE),
-            re.compile(r'Choose\s+files?\s*:', re.IGNORECASE),
-            re.compile(r'Pick\s+files?\s*from:', re.IGNORECASE),
-            re.compile(r'Which\s+files?\s*:', re.IGNORECASE),
-        ],
-        
-        InteractionType.CONFIRMATION: [
-            re.compile(r'Are you sure.*?', re.IGNORECASE),
-            re.compile(r'Confirm.*?', re.IGNORECASE),
-            re.compile(r'This will.*continue\?', re.IGNORECASE),
-            re.compile(r'This action.*proceed\?', re.IGNORECASE),
-        ]
+        ),
+        
+        InteractionType.TEXT_INPUT: (
+            re.compile(r'Enter\s+(.*?):', re.IGNORECASE | re.ASCII),
+            re.compile(r'Input\s+(.*?):', re.IGNORECASE | re.ASCII),
+            re.compile(r'Type\s+(.*?):', re.IGNORECASE | re.ASCII),
+            re.compile(r'Provide\s+(.*?):', re.IGNORECASE | re.ASCII),
+            re.compile(r'What\s+.*\s+(.*?)\?', re.IGNORECASE | re.ASCII),
+        ),
+        
+        InteractionType.FILE_SELECTION: (
+            re.compile(r'Select\s+a?\s*files?\s*:', re.IGNORECASE | re.ASCII),
+            re.compile(r'Choose\s+files?\s*:', re.IGNORECASE | re.ASCII),
+            re.compile(r'Pick\s+files?\s*from:', re.IGNORECASE | re.ASCII),
+            re.compile(r'Which\s+files?\s*:', re.IGNORECASE | re.ASCII),
+        ),
+        
+        InteractionType.CONFIRMATION: (
+            re.compile(r'Are you sure.*?', re.IGNORECASE | re.ASCII),
+            re.compile(r'Confirm.*?', re.IGNORECASE | re.ASCII),
+            re.compile(r'This will.*continue\?', re.IGNORECASE | re.ASCII),
+            re.compile(r'This action.*proceed\?', re.IGNORECASE | re.ASCII),
+        )
+    }
+    
+    # Casefolded literal each of PATTERNS needs, in the same order; a
+    # pattern whose trigger is not in the text is skipped without a search
+    _TRIGGERS = {
+        InteractionType.YES_NO: (
+            '(y/n)', '(yes/no)', 'do you want to', 'would you like to', 'continue', 'proceed',
+        ),
+        InteractionType.CHOICE: ('select an option:', 'choose from:', 'pick one:', 'options:'),
+        InteractionType.TEXT_INPUT: ('enter', 'input', 'type', 'provide', 'what'),
+        InteractionType.FILE_SELECTION: ('select', 'choose', 'pick', 'which'),
+        InteractionType.CONFIRMATION: ('are you sure', 'confirm', 'this will', 'this action'),
     }
     
     @classmethod
@@ -75,12 +117,42 @@ class PromptDetector:
         """Detect if text contains an interactive prompt"""
         if not text or not text.strip():
             return None
-            
-        for interaction_type, patterns in cls.PATTERNS.items():
-            for pattern in patterns:
-                match = pattern.search(text)
-                if match:
-                    return interaction_type, cls._extract_prompt_info(text, match, interaction_type)
+        
+        if len(text) > PROMPT_CACHE_MAX_CHARS:
+            return cls._detect(text)
+        
+        result = _detect_prompt_cached(text)
+        if result is None:
+            return None
+        
+        # Each caller gets its own info dict and options list
+        interaction_type, items = result
+        info = dict(items)
+        if 'options' in info:
+            info['options'] = list(info['options'])
+        return interaction_type, info
+    
+    @classmethod
+    def _detect(cls, text: str) -> Optional[Tuple[InteractionType, Dict]]:
+        """Run the trigger screen and the patterns over non-blank text"""
+        # Cheap screen: most output has no prompt and none of the triggers.
+        # Patterns are tried one by one on purpose: the first pattern in
+        # PATTERNS order that matches anywhere wins, so they cannot be
+        # reordered by hit rate or merged into one leftmost-match alternation
+        folded = fold_for_screen(text)
+        candidates = [entry for entry in _SCAN_ORDER if entry[2] in folded]
+        if not candidates:
+            return None
+        
+        if _SCAN_DB is not None:
+            # Hyperscan finds in one pass which patterns occur at all; re
+            # then only runs those, in order, for the match groups
+            candidates = [_SCAN_ORDER[i] for i in scan_pattern_ids(_SCAN_DB, text)]
+        
+        for interaction_type, pattern, _ in candidates:
+            match = pattern.search(text)
+            if match:
+                return interaction_type, cls._extract_prompt_info(text, match, interaction_type)
         
         return None
     
@@ -101,20 +173,25 @@ class PromptDetector:
         
         return info
     
+    # Option list formats, in the order they are tried, each with the
+    # characters it cannot match without; a format whose characters are all
+    # absent is skipped without running its regex
+    _OPTION_PATTERNS = (
+        (('.', ')'), re.compile(r'^\s*(\d+)[.)]\s+(.*)$', re.MULTILINE)),
+        (('.', ')'), re.compile(r'^\s*([a-zA-Z])[.)]\s+(.*)$', re.MULTILINE)),
+        (('*',), re.compile(r'^\s*\*\s+(.*)$', re.MULTILINE)),
+        (('-',), re.compile(r'^\s*-\s+(.*)$', re.MULTILINE)),
+    )
+    
     @classmethod
     def _extract_options(cls, text: str) -> List[str]:
         """Extract options from choice prompts"""
         options = []
         
         # Try different option formats
-        patterns = [
-            re.compile(r'^\s*(\d+)[.)]\s+(.*)$', re.MULTILINE),
-            re.compile(r'^\s*([a-zA-Z])[.)]\s+(.*)$', re.MULTILINE),
-            re.compile(r'^\s*\*\s+(.*)$', re.MULTILINE),
-            re.compile(r'^\s*-\s+(.*)$', re.MULTILINE),
-        ]
-        
-        for pattern in patterns:
+        for markers, pattern in cls._OPTION_PATTERNS:
+            if not any(marker in text for marker in markers):
+                continue
             matches = pattern.findall(text)
             if matches:
                 if isinstance(matches[0], tuple):
@@ -126,6 +203,29 @@ class PromptDetector:
         return options[:25]  # Discord limit for select menu
 
 
+# PromptDetector.PATTERNS flattened into one tuple in priority order, with
+# their triggers, and a Hyperscan database over them, or None to scan with re
+_SCAN_ORDER = tuple(
+    (interaction_type, pattern, trigger)
+    for interaction_type, patterns in PromptDetector.PATTERNS.items()
+    for pattern, trigger in zip(patterns, PromptDetector._TRIGGERS[interaction_type], strict=True)
+)
+_SCAN_DB = build_scan_database([pattern for _, pattern, _ in _SCAN_ORDER])
+
+
+@functools.lru_cache(maxsize=PROMPT_CACHE_SIZE)
+def _detect_prompt_cached(text: str) -> Optional[Tuple[InteractionType, Tuple]]:
+    """PromptDetector._detect, frozen into tuples so results can be shared"""
+    result = PromptDetector._detect(text)
+    if result is None:
+        return None
+    
+    interaction_type, info = result
+    if 'options' in info:
+        info['options'] = tuple(info['options'])
+    return interaction_type, tuple(info.items())
+
+
 class ConfirmationView(discord.ui.View):
     """Yes/No confirmation view"""
     
@@ -142,9 +242,8 @@ class ConfirmationView(discord.ui.View):
         self.responded.set()
         
         embed = discord.Embed(
-            title="✅ Confirmed",
-            description=f"You selected: **Yes**\n\n*{self.prompt}*",
-            color=discord.Color.green()
+            **CONFIRMED_EMBED_TEMPLATE,
+            description=f"You selected: **Yes**\n\n*{self.prompt}*"
         )
         
         await interaction.response.edit_message(embed=embed, view=None)
@@ -156,9 +255,8 @@ class ConfirmationView(discord.ui.View):
         self.responded.set()
         
         embed = discord.Embed(
-            title="❌ Cancelled",
-            description=f"You selected: **No**\n\n*{self.prompt}*",
-            color=discord.Color.red()
+            **CANCELLED_EMBED_TEMPLATE,
+            description=f"You selected: **No**\n\n*{self.prompt}*"
         )
         
         await interaction.response.edit_message(embed=embed, view=None)
@@ -166,9 +264,8 @@ class ConfirmationView(discord.ui.View):
     async def on_timeout(self):
         """Handle timeout"""
         embed = discord.Embed(
-            title="⏱️ Timed Out",
-            description="No response received within the time limit.",
-            color=discord.Color.orange()
+            **TIMED_OUT_EMBED_TEMPLATE,
+            description="No response received within the time limit."
         )
         
         # Try to edit the message if possible
@@ -187,14 +284,16 @@ class ChoiceView(discord.ui.View):
         self.prompt = prompt
         self.options = options[:25]  # Discord limit
         self.result: Optional[str] = None
+        self.result_index: Optional[int] = None  # 0-based position in options
         self.responded = asyncio.Event()
         
         # Add select menu
         self.add_item(ChoiceSelect(options, self.on_select))
     
-    async def on_select(self, selection: str):
+    async def on_select(self, selection: str, index: int):
         """Handle selection"""
         self.result = selection
+        self.result_index = index
         self.responded.set()
 
 
@@ -232,13 +331,12 @@ class ChoiceSelect(discord.ui.Select):
         selected_option = self.option_texts[selected_index]
         
         embed = discord.Embed(
-            title="✅ Selected",
-            description=f"You selected: **{selected_option}**",
-            color=discord.Color.green()
+            **SELECTED_EMBED_TEMPLATE,
+            description=f"You selected: **{selected_option}**"
         )
         
         await interaction.response.edit_message(embed=embed, view=None)
-        await self.callback_func(selected_option)
+        await self.callback_func(selected_option, selected_index)
 
 
 class TextInputModal(discord.ui.Modal):
@@ -267,19 +365,57 @@ class TextInputModal(discord.ui.Modal):
         self.responded.set()
         
         embed = discord.Embed(
-            title="✅ Input Received",
-            description=f"You entered:\n```\n{self.text_input.value}\n```",
-            color=discord.Color.green()
+            **INPUT_RECEIVED_EMBED_TEMPLATE,
+            description=f"You entered:\n```\n{self.text_input.value}\n```"
         )
         
         await interaction.response.edit_message(embed=embed, view=None)
 
 
+class TextInputView(discord.ui.View):
+    """Button view that opens the text input modal"""
+    
+    def __init__(self, prompt: str, field_name: str = "input", timeout: float = 300):
+        super().__init__(timeout=timeout)
+        self.prompt = prompt
+        self.field_name = field_name
+        self.result: Optional[str] = None
+        self.responded = asyncio.Event()
+    
+    @discord.ui.button(label='Open Input Form', style=discord.ButtonStyle.primary, emoji='✏️')
+    async def open_modal(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Handle open button click"""
+        modal = TextInputModal(self.prompt, self.field_name)
+        await interaction.response.send_modal(modal)
+        
+        # Wait for modal completion
+        await modal.responded.wait()
+        self.result = modal.result
+        self.responded.set()
+
+
 class UIConverter:
     """Converts Claude Code prompts to Discord UI components"""
     
     def __init__(self):
-        self.pending_interactions: Dict[str, Any] = {}
+        # Views are held weakly, so one nothing else references any more
+        # drops out instead of living until process exit
+        self.pending_interactions: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self._sweeper_task: Optional[asyncio.Task] = None
+    
+    def _add_pending(self, session_id: str, view: Any):
+        """Store a pending interaction and make sure the sweeper runs"""
+        self.pending_interactions[session_id] = view
+        if self._sweeper_task is None or self._sweeper_task.done():
+            self._sweeper_task = asyncio.create_task(self._sweep_pending())
+    
+    async def _sweep_pending(self):
+        """Drop answered or timed-out interactions until none are pending"""
+        while self.pending_interactions:
+            await asyncio.sleep(PENDING_SWEEP_INTERVAL)
+            for session_id, view in list(self.pending_interactions.items()):
+                if view.responded.is_set() or view.is_finished():
+                    self.pending_interactions.pop(session_id, None)
     
     async def handle_prompt(self, text: str, channel: discord.TextChannel, 
                           session_id: str) -> Optional[str]:
@@ -319,9 +455,8 @@ class UIConverter:
         """Handle yes/no prompts"""
         
         embed = discord.Embed(
-            title="🤔 Confirmation Required",
-            description=prompt_info['prompt'],
-            color=discord.Color.blue()
+            **YES_NO_EMBED_TEMPLATE,
+            description=prompt_info['prompt']
         )
         
         view = ConfirmationView(prompt_info['prompt'])
@@ -329,13 +464,14 @@ class UIConverter:
         view.message = message
         
         # Store pending interaction
-        self.pending_interactions[session_id] = view
+        self._add_pending(session_id, view)
         
         # Wait for response
         try:
-            await asyncio.wait_for(view.responded.wait(), timeout=300)
+            async with asyncio.timeout(PROMPT_RESPONSE_TIMEOUT):
+                await view.responded.wait()
             return "yes" if view.result else "no"
-        except asyncio.TimeoutError:
+        except TimeoutError:
             logger.warning(f"Yes/No prompt timed out for session {session_id}")
             return None
         finally:
@@ -351,9 +487,8 @@ class UIConverter:
             return None
         
         embed = discord.Embed(
-            title="📝 Please Select",
-            description=prompt_info['prompt'],
-            color=discord.Color.blue()
+            **CHOICE_EMBED_TEMPLATE,
+            description=prompt_info['prompt']
         )
         
         # Add options to embed
@@ -365,17 +500,17 @@ class UIConverter:
         view.message = message
         
         # Store pending interaction
-        self.pending_interactions[session_id] = view
+        self._add_pending(session_id, view)
         
         # Wait for response
         try:
-            await asyncio.wait_for(view.responded.wait(), timeout=300)
+            async with asyncio.timeout(PROMPT_RESPONSE_TIMEOUT):
+                await view.responded.wait()
             # Return the index + 1 (as Claude Code expects 1-based indexing)
-            if view.result:
-                option_index = options.index(view.result) + 1
-                return str(option_index)
+            if view.result_index is not None:
+                return str(view.result_index + 1)
             return None
-        except asyncio.TimeoutError:
+        except TimeoutError:
             logger.warning(f"Choice prompt timed out for session {session_id}")
             return None
         finally:
@@ -386,9 +521,8 @@ class UIConverter:
         """Handle text input prompts"""
         
         embed = discord.Embed(
-            title="✏️ Input Required",
-            description=prompt_info['prompt'],
-            color=discord.Color.blue()
+            **TEXT_INPUT_EMBED_TEMPLATE,
+            description=prompt_info['prompt']
         )
         embed.add_field(
             name="Instructions",
@@ -396,37 +530,19 @@ class UIConverter:
             inline=False
         )
         
-        # Create a button to open the modal
-        class ModalButton(discord.ui.View):
-            def __init__(self, prompt: str, field_name: str):
-                super().__init__(timeout=300)
-                self.prompt = prompt
-                self.field_name = field_name
-                self.result: Optional[str] = None
-                self.responded = asyncio.Event()
-            
-            @discord.ui.button(label='Open Input Form', style=discord.ButtonStyle.primary, emoji='✏️')
-            async def open_modal(self, interaction: discord.Interaction, button: discord.ui.Button):
-                modal = TextInputModal(self.prompt, self.field_name)
-                await interaction.response.send_modal(modal)
-                
-                # Wait for modal completion
-                await modal.responded.wait()
-                self.result = modal.result
-                self.responded.set()
-        
         field_name = prompt_info.get('field_name', 'input')
-        view = ModalButton(prompt_info['prompt'], field_name)
+        view = TextInputView(prompt_info['prompt'], field_name)
         message = await channel.send(embed=embed, view=view)
         
         # Store pending interaction
-        self.pending_interactions[session_id] = view
+        self._add_pending(session_id, view)
         
         # Wait for response
         try:
-            await asyncio.wait_for(view.responded.wait(), timeout=300)
+            async with asyncio.timeout(PROMPT_RESPONSE_TIMEOUT):
+                await view.responded.wait()
             return view.result
-        except asyncio.TimeoutError:
+        except TimeoutError:
             logger.warning(f"Text input prompt timed out for session {session_id}")
             return None
         finally:
@@ -437,9 +553,8 @@ class UIConverter:
         """Handle generic text prompts with message waiting"""
         
         embed = discord.Embed(
-            title="💬 Response Required",
-            description=prompt_info['prompt'],
-            color=discord.Color.blue()
+            **TEXT_PROMPT_EMBED_TEMPLATE,
+            description=prompt_info['prompt']
         )
         embed.add_field(
             name="Instructions",
@@ -457,21 +572,20 @@ class UIConverter:
         
         try:
             bot = channel.guild.get_member_named(channel.guild.me.name)  # Get bot reference
-            message = await bot.wait_for('message', check=check, timeout=300)
+            message = await bot.wait_for('message', check=check, timeout=PROMPT_RESPONSE_TIMEOUT)
             return message.content
-        except asyncio.TimeoutError:
+        except TimeoutError:
             timeout_embed = discord.Embed(
-                title="⏱️ Timed Out",
-                description="No response received within the time limit.",
-                color=discord.Color.orange()
+                **TIMED_OUT_EMBED_TEMPLATE,
+                description="No response received within the time limit."
             )
             await channel.send(embed=timeout_embed)
             return None
     
     def cancel_pending_interaction(self, session_id: str):
         """Cancel any pending interaction for a session"""
-        if session_id in self.pending_interactions:
-            interaction = self.pending_interactions.pop(session_id)
+        interaction = self.pending_interactions.pop(session_id, None)
+        if interaction is not None:
             if hasattr(interaction, 'responded'):
                 interaction.responded.set()
             logger.info(f"Cancelled pending interaction for session {session_id}")
@@ -10,15 +10,22 @@ import asyncio
 import argparse
 import json
 import logging
+import os
+import shutil
+import subprocess
 import sys
 from pathlib import Path
 from typing import Optional
 
-from claude_bridge.core.session_manager import SessionManager
-from claude_bridge.discord_bot.bot import ClaudeBridgeBot
-from claude_bridge.utils.config import Config
-from claude_bridge.utils.error_handler import ErrorHandler
-from claude_bridge.utils.performance_monitor import PerformanceMonitor
+from .core.session_manager import SessionManager
+from .discord_bot.bot import ClaudeBridgeBot
+from .utils.config import Config, load_json
+from .utils.error_handler import ErrorHandler
+from .utils.performance_monitor import PerformanceMonitor
+
+# Version probe results, kept in the working directory and reused while the
+# Claude Code binary is unchanged
+PROBE_CACHE_FILE = ".claude_probe_cache.json"
 
 
 def setup_logging(config: Config) -> None:
@@ -41,24 +48,50 @@ def load_config(config_path: Optional[str] = None) -> Config:
     if config_path is None:
         config_path = "config/discord_config.json"
     
-    config_file = Path(config_path)
-    if not config_file.exists():
+    try:
+        return Config.load_from_file(Path(config_path))
+    
+    except FileNotFoundError:
         print(f"❌ Configuration file not found: {config_path}")
         print("📖 Please follow DISCORD_SETUP.md to create the configuration file.")
         sys.exit(1)
     
-    try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
-        
-        return Config.from_dict(config_data)
-    
-    except Exception as e:
+    except (KeyError, TypeError, ValueError) as e:
+        # JSON syntax errors are ValueErrors; missing sections are KeyErrors
         print(f"❌ Failed to load configuration: {e}")
         print("📖 Please check your configuration file format.")
         sys.exit(1)
 
 
+def probe_claude_version(command: str, work_dir: Path) -> Optional[str]:
+    """Get the Claude Code version, running the CLI only when its binary changed"""
+    path = shutil.which(command)
+    if path is None:
+        return None
+
+    mtime = os.stat(path).st_mtime
+    cache_file = work_dir / PROBE_CACHE_FILE
+    try:
+        cached = load_json(cache_file)
+        if cached['path'] == path and cached['mtime'] == mtime:
+            return cached['version']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    result = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10)
+    if result.returncode != 0:
+        return None
+
+    version = result.stdout.strip()
+    try:
+        cache_file.write_text(
+            json.dumps({'path': path, 'mtime': mtime, 'version': version}), encoding='utf-8'
+        )
+    except OSError:
+        pass
+    return version
+
+
 async def startup_checks(config: Config) -> bool:
     """Perform startup checks"""
     logger = logging.getLogger(__name__)
@@ -78,12 +111,10 @@ async def startup_checks(config: Config) -> bool:
         return False
     
     # Check Claude Code command
-    import shutil
     if not shutil.which(config.claude_code.command):
         print(f"⚠️ Claude Code command '{config.claude_code.command}' not found in PATH")
         print("🔧 Installing Claude Code CLI...")
         
-        import subprocess
         try:
             subprocess.run([
                 "npm", "install", "-g", "@anthropic-ai/claude-code@latest"
@@ -103,12 +134,7 @@ async def startup_checks(config: Config) -> bool:
     # Test Claude Code
     print("🧪 Testing Claude Code connectivity...")
     try:
-        import subprocess
-        result = subprocess.run([
-            config.claude_code.command, "--version"
-        ], capture_output=True, text=True, timeout=10)
-        
-        if result.returncode == 0:
+        if probe_claude_version(config.claude_code.command, work_dir):
             print("✅ Claude Code is working")
         else:
             print("⚠️ Claude Code version check failed, but proceeding...")
@@ -236,10 +262,10 @@ async def main() -> None:
     if args.test:
         # Run system tests
         print("🧪 Running system tests...")
-        import subprocess
         try:
             result = subprocess.run([
-                sys.executable, "comprehensive_test.py"
+                sys.executable, "-m", "pytest", "-n", "auto", "--dist=loadscope",
+                "comprehensive_test.py", "debug_test.py", "real_test.py"
             ], cwd=Path(__file__).parent.parent.parent)
             sys.exit(result.returncode)
         except Exception as e:
@@ -267,7 +293,17 @@ async def main() -> None:
         print("👋 Claude Bridge stopped")
 
 
+def install_event_loop() -> None:
+    """Run on uvloop where it is installed, else keep the default loop"""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
 if __name__ == "__main__":
+    install_event_loop()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
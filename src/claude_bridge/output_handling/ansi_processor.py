@@ -57,6 +57,9 @@ class ANSIProcessor:
         'st': re.compile(r'\x1B\\'),
     }
     
+    # Catch-all for any escape sequences left after the specific patterns
+    ANSI_FALLBACK_PATTERN = re.compile(r'\x1B[@-_][0-?]*[ -/]*[@-~]')
+    
     # Color code mappings for Discord conversion
     DISCORD_COLOR_MAP = {
         ANSIColor.BLACK: '```fix\n{text}\n```',
@@ -112,10 +115,22 @@ class ANSIProcessor:
             result = pattern.sub('', result)
             
         # Additional cleanup for any remaining escape sequences
-        result = re.sub(r'\x1B[@-_][0-?]*[ -/]*[@-~]', '', result)
+        result = self.ANSI_FALLBACK_PATTERN.sub('', result)
         
         return result
     
+    def strip_many(self, texts: List[str]) -> List[str]:
+        """Remove all ANSI escape sequences from each text in a batch"""
+        patterns = (*self.ANSI_PATTERNS.values(), self.ANSI_FALLBACK_PATTERN)
+        
+        results = []
+        for text in texts:
+            if text:
+                for pattern in patterns:
+                    text = pattern.sub('', text)
+            results.append(text)
+        return results
+    
     def extract_ansi_info(self, text: str) -> List[Dict]:
         """Extract ANSI escape sequence information"""
         if not text:
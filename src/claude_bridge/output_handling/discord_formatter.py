@@ -6,7 +6,7 @@ Handles intelligent message splitting, formatting, and Discord-specific optimiza
 
 import re
 import time
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Iterator
 from dataclasses import dataclass
 from enum import Enum
 import discord
@@ -76,8 +76,16 @@ class DiscordFormatter:
         
     def format_output(self, text: str, message_type: MessageType = MessageType.NORMAL) -> List[MessageChunk]:
         """Format output text into Discord-ready chunks"""
+        return list(self.format_output_iter(text, message_type))
+    
+    def format_output_iter(self, text: str, message_type: MessageType = MessageType.NORMAL) -> Iterator[MessageChunk]:
+        """Yield Discord-ready chunks one at a time
+        
+        The text is still split up front, since every chunk carries the total
+        chunk count, but each chunk is only formatted when it is consumed.
+        """
         if not text or not text.strip():
-            return []
+            return
         
         # Process ANSI sequences
         processed_text = self.ansi_processor.process_claude_output(text)
@@ -88,16 +96,12 @@ class DiscordFormatter:
         # Split into appropriate chunks
         chunks = self._split_content(processed_text, analysis)
         
-        # Format each chunk
-        formatted_chunks = []
+        # Format each chunk as it is requested
         for i, chunk in enumerate(chunks):
-            formatted_chunk = self._format_chunk(
+            yield self._format_chunk(
                 chunk, message_type, analysis, 
                 chunk_index=i, total_chunks=len(chunks)
             )
-            formatted_chunks.append(formatted_chunk)
-        
-        return formatted_chunks
     
     def _analyze_content(self, text: str, message_type: MessageType) -> Dict:
         """Analyze content to determine optimal formatting strategy"""
@@ -5,8 +5,9 @@ Handles formatting, ANSI escape sequence removal, and Discord message preparatio
 Updated to use new advanced processing components.
 """
 
+import functools
 import re
-from typing import List
+from typing import List, Tuple
 import discord
 
 from .ansi_processor import ANSIProcessor
@@ -15,6 +16,15 @@ from ..utils.logging_setup import get_logger
 
 logger = get_logger('output_handler')
 
+# Number of distinct payloads whose formatted and split forms are kept
+FORMAT_CACHE_SIZE = 1024
+
+# Longer payloads are formatted and split without caching, so the caches stay small
+FORMAT_CACHE_MAX_CHARS = 8192
+
+# ANSIProcessor.process_claude_output is stateless, so one instance serves the cache
+_ansi_processor = ANSIProcessor()
+
 
 class OutputHandler:
     """Handles output formatting and Discord adaptations"""
@@ -32,7 +42,6 @@ class OutputHandler:
     ]
     
     def __init__(self):
-        self.ansi_processor = ANSIProcessor()
         self.discord_formatter = DiscordFormatter()
     
     @staticmethod
@@ -93,22 +102,7 @@ class OutputHandler:
     
     def format_for_discord(self, text: str) -> str:
         """Format text for Discord display (legacy method - use discord_formatter for advanced features)"""
-        if not text:
-            return text
-        
-        # Use the advanced ANSI processor
-        cleaned = self.ansi_processor.process_claude_output(text)
-        
-        # Step 2: Filter progress lines
-        cleaned = self.filter_progress_lines(cleaned)
-        
-        # Step 3: Clean whitespace
-        cleaned = self.clean_whitespace(cleaned)
-        
-        # Step 4: Escape Discord markdown if needed
-        cleaned = self.escape_discord_markdown(cleaned)
-        
-        return cleaned
+        return format_for_discord(text)
     
     @staticmethod
     def escape_discord_markdown(text: str) -> str:
@@ -129,36 +123,7 @@ class OutputHandler:
     
     def split_long_output(self, text: str, max_length: int = 1900) -> List[str]:
         """Split long output into Discord-friendly chunks"""
-        if not text or len(text) <= max_length:
-            return [text] if text else []
-        
-        chunks = []
-        lines = text.split('\n')
-        current_chunk = ""
-        
-        for line in lines:
-            # If adding this line would exceed the limit
-            if len(current_chunk) + len(line) + 1 > max_length:
-                if current_chunk:
-                    chunks.append(current_chunk.rstrip())
-                    current_chunk = ""
-                
-                # If a single line is too long, truncate it
-                if len(line) > max_length:
-                    truncated = line[:max_length-50] + "... [truncated]"
-                    chunks.append(truncated)
-                else:
-                    current_chunk = line
-            else:
-                if current_chunk:
-                    current_chunk += '\n'
-                current_chunk += line
-        
-        # Add remaining content
-        if current_chunk:
-            chunks.append(current_chunk.rstrip())
-        
-        return chunks
+        return list(split_long_output(text, max_length))
     
     def create_progress_embed(self, progress: float, message: str, 
                             title: str = "Processing...") -> discord.Embed:
@@ -276,4 +241,90 @@ class OutputHandler:
         # Escape backticks
         text = text.replace('`', '`​`')  # Zero-width space
         
-        return f"`{text}`"
\ No newline at end of file
+        return f"`{text}`"
+
+
+def format_for_discord(text: str) -> str:
+    """Format text for Discord display, memoized by content up to FORMAT_CACHE_MAX_CHARS"""
+    if not text:
+        return text
+    
+    if len(text) > FORMAT_CACHE_MAX_CHARS:
+        return _format_for_discord(text)
+    return _format_for_discord_cached(text)
+
+
+@functools.lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def _format_for_discord_cached(text: str) -> str:
+    """_format_for_discord, memoized by content"""
+    return _format_for_discord(text)
+
+
+def _format_for_discord(text: str) -> str:
+    """Clean ANSI codes, progress lines and whitespace and escape markdown"""
+    # Use the advanced ANSI processor
+    cleaned = _ansi_processor.process_claude_output(text)
+    
+    # Step 2: Filter progress lines
+    cleaned = OutputHandler.filter_progress_lines(cleaned)
+    
+    # Step 3: Clean whitespace
+    cleaned = OutputHandler.clean_whitespace(cleaned)
+    
+    # Step 4: Escape Discord markdown if needed
+    cleaned = OutputHandler.escape_discord_markdown(cleaned)
+    
+    return cleaned
+
+
+def split_long_output(text: str, max_length: int = 1900) -> Tuple[str, ...]:
+    """Split long output into Discord-friendly chunks, memoized by content up to FORMAT_CACHE_MAX_CHARS"""
+    if text and len(text) > FORMAT_CACHE_MAX_CHARS:
+        return _split_long_output(text, max_length)
+    return _split_long_output_cached(text, max_length)
+
+
+@functools.lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def _split_long_output_cached(text: str, max_length: int) -> Tuple[str, ...]:
+    """_split_long_output, memoized by content"""
+    return _split_long_output(text, max_length)
+
+
+def _split_long_output(text: str, max_length: int) -> Tuple[str, ...]:
+    """Split text at line boundaries into chunks of at most max_length"""
+    if not text or len(text) <= max_length:
+        return (text,) if text else ()
+    
+    chunks = []
+    lines = text.split('\n')
+    current_chunk = ""
+    
+    for line in lines:
+        # If adding this line would exceed the limit
+        if len(current_chunk) + len(line) + 1 > max_length:
+            if current_chunk:
+                chunks.append(current_chunk.rstrip())
+                current_chunk = ""
+            
+            # If a single line is too long, truncate it
+            if len(line) > max_length:
+                truncated = line[:max_length-50] + "... [truncated]"
+                chunks.append(truncated)
+            else:
+                current_chunk = line
+        else:
+            if current_chunk:
+                current_chunk += '\n'
+            current_chunk += line
+    
+    # Add remaining content
+    if current_chunk:
+        chunks.append(current_chunk.rstrip())
+    
+    return tuple(chunks)
+
+
+def format_and_split(text: str, max_length: int = 1900) -> Tuple[str, Tuple[str, ...]]:
+    """Format text for Discord and split it into chunks in one call"""
+    formatted = format_for_discord(text)
+    return formatted, split_long_output(formatted, max_length)
@@ -5,6 +5,7 @@ Manages Claude Code process lifecycle, input/output handling, and monitoring.
 """
 
 import asyncio
+import logging
 import os
 import subprocess
 import signal
@@ -29,6 +30,9 @@ class ProcessController:
         self._output_thread: Optional[threading.Thread] = None
         self._error_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
+        # Set once the child has exited, so callers can check or wait on it
+        # instead of polling is_running()
+        self.exit_event = threading.Event()
         
     def start_process(self, session_id: str) -> bool:
         """Start Claude Code process"""
@@ -41,6 +45,7 @@ class ProcessController:
             logger.info(f"Working directory: {self.working_directory}")
             
             # Start Claude Code process
+            self.exit_event.clear()
             self.process = subprocess.Popen(
                 [self.command],
                 stdin=subprocess.PIPE,
@@ -88,16 +93,17 @@ class ProcessController:
         self._error_thread.start()
     
     def _monitor_stdout(self):
-        """Monitor stdout in a separate thread"""
-        if not self.process or not self.process.stdout:
+        """Monitor stdout in a separate thread and flag process exit"""
+        process = self.process
+        if not process or not process.stdout:
             return
             
         try:
-            while not self._stop_event.is_set() and self.process.poll() is None:
-                line = self.process.stdout.readline()
+            while not self._stop_event.is_set() and process.poll() is None:
+                line = process.stdout.readline()
                 if line:
                     line = line.rstrip('\n\r')
-                    logger.debug(f"Claude stdout: {line}")
+                    logger.debug("Claude stdout: %s", line)
                     if self.output_callback:
                         self.output_callback(line)
                 else:
@@ -105,6 +111,10 @@ class ProcessController:
                     self._stop_event.wait(0.1)
         except Exception as e:
             logger.error(f"Error monitoring stdout: {e}")
+        finally:
+            # A restart may already own the event for a newer process
+            if process.poll() is not None and self.process in (process, None):
+                self.exit_event.set()
     
     def _monitor_stderr(self):
         """Monitor stderr in a separate thread"""
@@ -116,7 +126,7 @@ class ProcessController:
                 line = self.process.stderr.readline()
                 if line:
                     line = line.rstrip('\n\r')
-                    logger.debug(f"Claude stderr: {line}")
+                    logger.debug("Claude stderr: %s", line)
                     if self.error_callback:
                         self.error_callback(line)
                 else:
@@ -136,7 +146,8 @@ class ProcessController:
             if not command.endswith('\n'):
                 command += '\n'
             
-            logger.debug(f"Sending input to Claude: {command.rstrip()}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sending input to Claude: %s", command.rstrip())
             self.process.stdin.write(command)
             self.process.stdin.flush()
             return True
@@ -194,6 +205,7 @@ class ProcessController:
             return False
         finally:
             self.process = None
+            self.exit_event.set()
             
             # Wait for monitoring threads to finish
             if self._output_thread and self._output_thread.is_alive():
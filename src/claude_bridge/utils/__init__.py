@@ -4,10 +4,24 @@ Utility modules for Claude Bridge
 Contains configuration management, logging setup, and helper functions.
 """
 
-from .config import Config
-from .logging_setup import setup_logging
-from .error_handler import ErrorHandler, ErrorInfo, ErrorSeverity, ErrorCategory
-from .performance_monitor import PerformanceMonitor, PerformanceMetrics, ResourceManager
+import importlib
+
+# Re-exports are resolved on first access (PEP 562); error_handler and
+# rate_limit import discord.py, which get_logger users should not pay for
+_LAZY_IMPORTS = {
+    "Config": ".config",
+    "setup_logging": ".logging_setup",
+    "ErrorHandler": ".error_handler",
+    "ErrorInfo": ".error_handler",
+    "ErrorSeverity": ".error_handler",
+    "ErrorCategory": ".error_handler",
+    "PerformanceMonitor": ".performance_monitor",
+    "PerformanceMetrics": ".performance_monitor",
+    "ResourceManager": ".performance_monitor",
+    "TokenBucket": ".rate_limit",
+    "DiscordRateLimiter": ".rate_limit",
+    "fold_for_screen": ".text",
+}
 
 __all__ = [
     "Config", 
@@ -18,5 +32,19 @@ __all__ = [
     "ErrorCategory",
     "PerformanceMonitor",
     "PerformanceMetrics",
-    "ResourceManager"
-]
\ No newline at end of file
+    "ResourceManager",
+    "TokenBucket",
+    "DiscordRateLimiter",
+    "fold_for_screen"
+]
+
+
+def __getattr__(name: str):
+    """Import re-exported components lazily"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
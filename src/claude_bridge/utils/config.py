@@ -8,10 +8,23 @@ import json
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def load_json(path: Path) -> Any:
+    """Parse a JSON file, using orjson when it is installed"""
+    raw = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 @dataclass
 class DiscordConfig:
@@ -36,6 +49,7 @@ class SessionConfig:
     max_output_length: int = 1900
     max_history_length: int = 100
     cleanup_interval: int = 300
+    warm_pool_size: int = 2
 
 
 @dataclass
@@ -65,8 +79,7 @@ class Config:
             load_dotenv(env_file)
         
         # Load base configuration from JSON
-        with open(config_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json(config_path)
         
         # Override with environment variables if present
         discord_token = os.getenv('DISCORD_BOT_TOKEN', data['discord']['token'])
@@ -96,7 +109,8 @@ class Config:
             timeout=int(os.getenv('SESSION_TIMEOUT', data['session']['timeout'])),
             max_output_length=int(os.getenv('SESSION_MAX_OUTPUT', data['session']['max_output_length'])),
             max_history_length=int(os.getenv('SESSION_MAX_HISTORY', data['session']['max_history_length'])),
-            cleanup_interval=int(os.getenv('SESSION_CLEANUP_INTERVAL', data['session']['cleanup_interval']))
+            cleanup_interval=int(os.getenv('SESSION_CLEANUP_INTERVAL', data['session']['cleanup_interval'])),
+            warm_pool_size=int(os.getenv('SESSION_WARM_POOL_SIZE', data['session'].get('warm_pool_size', 2)))
         )
         
         logging_config = LoggingConfig(
@@ -141,6 +155,9 @@ class Config:
         if self.session.max_output_length <= 0:
             errors.append("Session max output length must be positive")
         
+        if self.session.warm_pool_size < 0:
+            errors.append("Session warm pool size cannot be negative")
+        
         if errors:
             raise ValueError(f"Configuration validation failed: {'; '.join(errors)}")
         
@@ -0,0 +1,198 @@
+"""
+Rate limiting for Claude Bridge
+
+Token buckets that keep Discord sends within the global and per-channel
+rate limits instead of running into 429 responses.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+import discord
+
+from .logging_setup import get_logger
+
+logger = get_logger('rate_limit')
+
+# How often buckets of channels that went quiet are dropped, in seconds
+IDLE_SWEEP_INTERVAL = 60.0
+
+
+def _wake(waiter: asyncio.Future):
+    """Resolve a waiter unless it was already cancelled"""
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a fixed rate"""
+
+    # One bucket exists per channel the bot has written to
+    __slots__ = ('capacity', 'refill_rate', 'tokens', '_updated', '_blocked_until', '_lock')
+
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate  # Tokens per second
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        # Waiters are served in arrival order
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        """Add the tokens accrued since the last update"""
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+
+        # A block ends with the bucket reset, so at least one request may go
+        if self._blocked_until and now >= self._blocked_until:
+            self._blocked_until = 0.0
+            self.tokens = max(self.tokens, 1)
+
+    async def acquire(self):
+        """Take one token, waiting for the bucket to refill if needed"""
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                # Sleep exactly until the block ends or the next token is due
+                if now < self._blocked_until:
+                    delay = self._blocked_until - now
+                else:
+                    delay = (1 - self.tokens) / self.refill_rate
+                waiter = loop.create_future()
+                handle = loop.call_later(delay, _wake, waiter)
+                try:
+                    await waiter
+                finally:
+                    handle.cancel()
+
+    def is_idle(self) -> bool:
+        """Whether the bucket is full, unblocked and waited on by no one"""
+        self._refill(time.monotonic())
+        return (
+            self.tokens >= self.capacity and not self._blocked_until
+            and not self._lock.locked()
+        )
+
+    def block_for(self, seconds: float):
+        """Hand out no tokens for the given number of seconds"""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = 0
+        self._blocked_until = max(self._blocked_until, now + seconds)
+
+    def update(self, remaining: Optional[int], reset_after: Optional[float]):
+        """Adopt the bucket state reported by Discord"""
+        self._refill(time.monotonic())
+        if remaining is not None:
+            self.tokens = min(self.tokens, remaining)
+        if remaining == 0 and reset_after:
+            self.block_for(reset_after)
+
+
+class DiscordRateLimiter:
+    """Sends Discord messages through global and per-channel token buckets"""
+
+    def __init__(self, global_rate: float = 50.0, channel_limit: int = 5,
+                 channel_period: float = 5.0, max_retries: int = 3,
+                 webhook_limit: int = 30, webhook_period: float = 60.0):
+        self.max_retries = max_retries
+        self._channel_limit = channel_limit
+        self._channel_period = channel_period
+        self._webhook_limit = webhook_limit
+        self._webhook_period = webhook_period
+        self._global = TokenBucket(global_rate, global_rate)
+        # Buckets per channel or webhook ID; snowflakes never collide
+        self._channels: Dict[int, TokenBucket] = {}
+        # Sends to one target go out one at a time, in call order
+        self._send_locks: Dict[int, asyncio.Lock] = {}
+        # Sends started per target and not yet finished
+        self._in_flight: Dict[int, int] = {}
+        self._last_sweep = time.monotonic()
+
+    def _channel_bucket(self, channel_id: int, webhook: bool = False) -> TokenBucket:
+        """Get the bucket for a channel or webhook, creating it on first use"""
+        bucket = self._channels.get(channel_id)
+        if bucket is None:
+            limit, period = (
+                (self._webhook_limit, self._webhook_period) if webhook
+                else (self._channel_limit, self._channel_period)
+            )
+            bucket = self._channels[channel_id] = TokenBucket(limit, limit / period)
+        return bucket
+
+    def _sweep_idle(self):
+        """Drop the bucket and lock of every idle target with no sends pending"""
+        self._last_sweep = time.monotonic()
+        for key in [
+            key for key, bucket in self._channels.items()
+            if key not in self._in_flight and bucket.is_idle()
+        ]:
+            del self._channels[key]
+            self._send_locks.pop(key, None)
+
+    @staticmethod
+    def _rate_limit_headers(error: discord.HTTPException) -> tuple:
+        """Extract remaining requests and reset delay from an error response"""
+        headers = getattr(error.response, 'headers', None) or {}
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset_after = headers.get('X-RateLimit-Reset-After')
+        return (
+            int(remaining) if remaining is not None else None,
+            float(reset_after) if reset_after is not None else None
+        )
+
+    async def send(self, target: discord.abc.Messageable, *args, **kwargs) -> Any:
+        """Send through target once both buckets allow it
+
+        target may be a channel, a commands.Context or a webhook; a 429
+        response blocks the target's bucket for the reported delay and the
+        send is retried. Concurrent sends to the same target are delivered
+        in call order. Webhooks have their own buckets and are not counted
+        against the bot's global limit.
+        """
+        webhook = isinstance(target, discord.Webhook)
+        key = target.id if webhook else getattr(target, 'channel', target).id
+        bucket = self._channel_bucket(key, webhook)
+        lock = self._send_locks.get(key)
+        if lock is None:
+            lock = self._send_locks[key] = asyncio.Lock()
+
+        self._in_flight[key] = self._in_flight.get(key, 0) + 1
+        try:
+            return await self._send_locked(target, key, webhook, bucket, lock, *args, **kwargs)
+        finally:
+            remaining = self._in_flight.pop(key) - 1
+            if remaining:
+                self._in_flight[key] = remaining
+            if time.monotonic() - self._last_sweep >= IDLE_SWEEP_INTERVAL:
+                self._sweep_idle()
+
+    async def _send_locked(self, target: discord.abc.Messageable, key: int, webhook: bool,
+                           bucket: TokenBucket, lock: asyncio.Lock, *args, **kwargs) -> Any:
+        """Send in order under the target's lock, retrying after 429s"""
+        async with lock:
+            attempt = 0
+            while True:
+                if not webhook:
+                    await self._global.acquire()
+                await bucket.acquire()
+                try:
+                    return await target.send(*args, **kwargs)
+                except discord.HTTPException as e:
+                    remaining, reset_after = self._rate_limit_headers(e)
+                    bucket.update(remaining, reset_after)
+                    if e.status != 429 or attempt >= self.max_retries:
+                        raise
+
+                    attempt += 1
+                    retry_after = reset_after or getattr(e, 'retry_after', None) or self._channel_period
+                    bucket.block_for(retry_after)
+                    logger.warning(f"Rate limited on {key}, retrying in {retry_after:.2f}s")
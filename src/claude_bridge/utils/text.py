@@ -0,0 +1,123 @@
+"""
+Text helpers for Claude Bridge
+
+Prefilters that decide, before the regex engine runs, which of a set of
+patterns can match: keyword folding and an optional Hyperscan database.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+from .logging_setup import get_logger
+
+logger = get_logger('text')
+
+
+def fold_for_screen(text: str) -> str:
+    """Casefold text so keyword checks find everything re.IGNORECASE would
+
+    casefold turns 'İ' into 'i' plus a combining dot and leaves dotless 'ı'
+    alone, while re.IGNORECASE matches both as 'i'. Dropping the dot and
+    mapping 'ı' can only let more text through to the regexes.
+    """
+    folded = text.casefold()
+    if text.isascii():
+        return folded
+    return folded.replace('\u0307', '').replace('\u0131', 'i')
+
+
+# Characters re's \s matches and Hyperscan's does not
+_RE_ONLY_SPACE = re.compile('[\x1c-\x1f]')
+
+
+@dataclass(frozen=True, slots=True)
+class ScanDatabase:
+    """Hyperscan database over the patterns it supports"""
+    database: Any
+    pattern_count: int
+    # IDs of patterns Hyperscan rejected, such as \b in UCP mode; they are
+    # reported as candidates for every text and left to re
+    fallback_ids: Tuple[int, ...]
+    # IDs of Unicode case-insensitive patterns. Hyperscan folds case one code
+    # point at a time, while re also matches 'İ' and 'ı' to 'i', so these are
+    # candidates for every non-ASCII text
+    caseless_ids: Tuple[int, ...]
+
+
+def build_scan_database(patterns: Sequence[re.Pattern]) -> Optional[ScanDatabase]:
+    """Compile patterns into one Hyperscan database, or None without Hyperscan
+
+    Pattern IDs are indexes into patterns. Hyperscan has no capture groups,
+    so the database only tells which patterns occur; re still does the match.
+    """
+    if hyperscan is None:
+        return None
+
+    def flags(pattern: re.Pattern) -> int:
+        value = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_SINGLEMATCH
+        if not pattern.flags & re.ASCII:
+            value |= hyperscan.HS_FLAG_UCP
+        if pattern.flags & re.IGNORECASE:
+            value |= hyperscan.HS_FLAG_CASELESS
+        if pattern.flags & re.MULTILINE:
+            value |= hyperscan.HS_FLAG_MULTILINE
+        if pattern.flags & re.DOTALL:
+            value |= hyperscan.HS_FLAG_DOTALL
+        return value
+
+    # Each pattern is compiled alone first; one Hyperscan rejects is left to
+    # re instead of failing the whole database
+    supported, fallback_ids = [], []
+    for pattern_id, pattern in enumerate(patterns):
+        try:
+            hyperscan.Database().compile(
+                expressions=[pattern.pattern.encode('utf-8')], ids=[pattern_id],
+                elements=1, flags=[flags(pattern)]
+            )
+        except hyperscan.error as e:
+            logger.debug(f"Pattern {pattern.pattern!r} left to re: {e}")
+            fallback_ids.append(pattern_id)
+        else:
+            supported.append(pattern_id)
+
+    if not supported:
+        return None
+
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[patterns[i].pattern.encode('utf-8') for i in supported],
+            ids=supported,
+            elements=len(supported),
+            flags=[flags(patterns[i]) for i in supported]
+        )
+    except hyperscan.error as e:
+        logger.warning(f"Hyperscan unavailable, scanning with re: {e}")
+        return None
+    caseless_ids = tuple(
+        i for i in supported
+        if patterns[i].flags & re.IGNORECASE and not patterns[i].flags & re.ASCII
+    )
+    return ScanDatabase(database, len(patterns), tuple(fallback_ids), caseless_ids)
+
+
+def scan_pattern_ids(database: ScanDatabase, text: str) -> List[int]:
+    """IDs of the patterns that may match text, lowest first"""
+    if _RE_ONLY_SPACE.search(text):
+        return list(range(database.pattern_count))
+
+    matched = set(database.fallback_ids)
+    if not text.isascii():
+        matched.update(database.caseless_ids)
+
+    def on_match(pattern_id, start, end, flags, context):
+        matched.add(pattern_id)
+
+    database.database.scan(text.encode('utf-8', 'replace'), match_event_handler=on_match)
+    return sorted(matched)
@@ -10,7 +10,7 @@ from unittest.mock import Mock, AsyncMock, patch, MagicMock
 import discord
 from discord.ext import commands
 
-from src.claude_bridge.discord_bot.bot import ClaudeBridgeBot
+from src.claude_bridge.discord_bot.bot import ClaudeBridgeBot, OUTPUT_FLUSH_DELAY
 from src.claude_bridge.core.session_manager import SessionManager
 from src.claude_bridge.utils.config import Config, DiscordConfig, ClaudeCodeConfig, SessionConfig, LoggingConfig
 from src.claude_bridge.discord_bot.ui_components import UIConverter
@@ -241,6 +241,9 @@ class TestDiscordBotIntegration:
         with patch.object(session_manager, 'send_command', return_value=True) as mock_send:
             await mock_bot.on_message(mock_message)
             
+            # The command is forwarded from a background task
+            await asyncio.sleep(0)
+            
             # Verify command was sent to session
             mock_send.assert_called_with(session.id, "test command")
     
@@ -255,6 +258,9 @@ class TestDiscordBotIntegration:
         test_output = "Test output from Claude Code"
         await mock_bot._handle_session_output(session.id, test_output)
         
+        # Output is coalesced per channel before it is sent
+        await asyncio.sleep(OUTPUT_FLUSH_DELAY + 0.1)
+        
         # Verify output was sent to Discord
         mock_discord_context.channel.send.assert_called()
 
@@ -302,6 +308,8 @@ class TestUIComponentsIntegration:
             )
             
             if handled:
+                # The embed is sent by the display's flusher task
+                await asyncio.sleep(0.01)
                 # Verify progress embed was sent
                 assert mock_send.called
 
@@ -337,6 +345,17 @@ class TestErrorHandling:
         mock_discord_context.send.assert_called()
         call_args = mock_discord_context.send.call_args
         assert "Missing required argument" in call_args[0][0]
+    
+    @pytest.mark.asyncio
+    async def test_cooldown_error(self, mock_bot, mock_discord_context):
+        """Test cooldown error handling"""
+        cooldown = commands.Cooldown(1, 2.0)
+        error = commands.CommandOnCooldown(cooldown, 1.5, commands.BucketType.user)
+        await mock_bot.on_command_error(mock_discord_context, error)
+        
+        # Verify the retry delay is reported
+        call_args = mock_discord_context.send.call_args
+        assert "1.5s" in call_args[0][0]
 
 
 class TestEndToEndDiscordFlow:
@@ -336,7 +336,7 @@ class TestMockClaudeCode:
         
         # Verify command history
         assert len(session.command_history) == len(commands)
-        assert session.command_history == commands
+        assert list(session.command_history) == commands
         
         # Terminate session
         await session_manager.terminate_session(session.id)
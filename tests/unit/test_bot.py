@@ -0,0 +1,259 @@
+"""
+Unit tests for ClaudeBridgeBot
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import discord
+import pytest
+import pytest_asyncio
+from discord.ext import commands
+from discord.ext.commands.view import StringView
+import src.claude_bridge.discord_bot.bot as bot_module
+from src.claude_bridge.discord_bot.bot import ClaudeBridgeBot
+from src.claude_bridge.utils.config import Config, DiscordConfig, ClaudeCodeConfig, SessionConfig, LoggingConfig
+
+
+@pytest_asyncio.fixture
+async def bot():
+    """Bot with a mocked session manager whose sends are recorded"""
+    config = Config(
+        discord=DiscordConfig("test", 123, 456),
+        claude_code=ClaudeCodeConfig("cat", "/tmp", 30),
+        session=SessionConfig(300, 1900, 100, 60, 0),
+        logging=LoggingConfig()
+    )
+    bot = ClaudeBridgeBot(Mock(), config)
+    # Binds the bot to the test's loop, as login() would
+    await bot._async_setup_hook()
+    bot._send = AsyncMock()
+    yield bot
+    await bot.close()
+
+
+def make_context(bot, name, user_id=1, interaction=None):
+    """Command context for invoking a command by name"""
+    message = Mock()
+    message.author.id = user_id
+    message.channel.id = 789
+    message.created_at = discord.utils.utcnow()
+    message.edited_at = None
+    return commands.Context(
+        message=message, bot=bot, view=StringView(""), prefix="/",
+        command=bot.get_command(name), invoked_with=name, interaction=interaction
+    )
+
+
+def make_interaction():
+    """Mocked interaction that has not been responded to"""
+    interaction = Mock()
+    interaction.response.is_done.return_value = False
+    interaction.response.defer = AsyncMock()
+    return interaction
+
+
+class TestCommands:
+    """Test cases for command handling"""
+
+    @pytest.mark.asyncio
+    async def test_cooldown(self, bot):
+        """Test a second read command within the cooldown gets the retry message"""
+        await bot.invoke(make_context(bot, "status"))
+        await bot.invoke(make_context(bot, "status"))
+        await asyncio.sleep(0)
+
+        replies = [call.args[1] for call in bot._send.await_args_list]
+        assert replies[0] == "❌ You are not connected to any session"
+        assert replies[1].startswith("⏳ Slow down, try again in ")
+
+        await bot.invoke(make_context(bot, "status", user_id=2))
+        assert bot._send.await_args.args[1] == "❌ You are not connected to any session"
+
+    @pytest.mark.asyncio
+    async def test_slash_command_is_deferred(self, bot):
+        """Test slash commands are acknowledged by the before-invoke hook"""
+        interaction = make_interaction()
+
+        await bot._before_invoke(make_context(bot, "status", interaction=interaction))
+        interaction.response.defer.assert_awaited_once()
+
+        # An interaction that was already answered is left alone
+        interaction.response.is_done.return_value = True
+        await bot._before_invoke(make_context(bot, "status", interaction=interaction))
+        interaction.response.defer.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_slash_cooldown_is_deferred(self, bot):
+        """Test a slash command stopped by its cooldown is acknowledged before the reply"""
+        interaction = make_interaction()
+        interaction.response.defer.side_effect = lambda **kwargs: bot._send.assert_not_awaited()
+        cooldown = commands.Cooldown(1, 2.0)
+
+        await bot.on_command_error(
+            make_context(bot, "status", interaction=interaction),
+            commands.CommandOnCooldown(cooldown, 1.5, commands.BucketType.user)
+        )
+
+        interaction.response.defer.assert_awaited_once()
+        assert bot._send.await_args.args[1] == "⏳ Slow down, try again in 1.5s"
+
+    @pytest.mark.asyncio
+    async def test_prefix_command_is_not_deferred(self, bot):
+        """Test prefix commands reply without deferring"""
+        ctx = make_context(bot, "status")
+        ctx.defer = AsyncMock()
+
+        await bot.invoke(ctx)
+
+        ctx.defer.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_require_session_untracks_missing(self, bot):
+        """Test a session that no longer exists is reported and untracked"""
+        bot.session_manager.get_session.return_value = None
+        bot._track_user(1, "gone", 789)
+
+        assert await bot._require_session(make_context(bot, "status")) is None
+        assert bot._send.await_args.args[1] == "❌ Session `gone` not found"
+        assert 1 not in bot.user_sessions
+        assert "gone" not in bot._session_channels
+
+    @pytest.mark.asyncio
+    async def test_show_output_sends_chunks_in_order(self, bot, monkeypatch):
+        """Test every output chunk is sent, the first with the header"""
+        session = Mock()
+        session.get_recent_output.return_value = ["line"]
+        bot.session_manager.get_session.return_value = session
+        bot._track_user(1, "s1", 789)
+        monkeypatch.setattr(bot, "_format_output", AsyncMock(return_value=("", ["one", "two", "three"])))
+
+        await bot._show_output(make_context(bot, "output"))
+
+        replies = [call.args[1] for call in bot._send.await_args_list]
+        assert replies == [
+            "**Recent Output (last 1 lines):**\n```\none\n```",
+            "```\ntwo\n```",
+            "```\nthree\n```",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_list_sessions_embed_fields(self, bot):
+        """Test the session ID field is left out when no IDs are listed"""
+        stats = {'total_sessions': 2, 'active_sessions': 1, 'inactive_sessions': 1, 'session_ids': ["a", "b"]}
+        bot.session_manager.get_session_stats.return_value = stats
+
+        await bot._list_sessions(make_context(bot, "sessions"))
+        embed = bot._send.await_args.kwargs['embed']
+        assert [field.value for field in embed.fields] == ["2", "1", "1", "`a`, `b`"]
+
+        stats['session_ids'] = []
+        await bot._list_sessions(make_context(bot, "sessions"))
+        embed = bot._send.await_args.kwargs['embed']
+        assert [field.name for field in embed.fields] == ["Total Sessions", "Active Sessions", "Inactive Sessions"]
+
+    @pytest.mark.asyncio
+    async def test_send_goes_through_limiter(self, bot):
+        """Test replies are sent via the rate limiter"""
+        del bot._send
+        bot._limiter.send = AsyncMock(return_value="sent")
+        ctx = make_context(bot, "status")
+
+        assert await bot._send(ctx, "hi") == "sent"
+        bot._limiter.send.assert_awaited_once_with(ctx, "hi")
+
+
+class TestChannelOutput:
+    """Test cases for coalesced session output"""
+
+    @pytest.fixture
+    def channel(self, bot):
+        """Mocked channel whose flushed batches are recorded"""
+        bot._send_output = AsyncMock()
+        channel = Mock()
+        channel.id = 789
+        return channel
+
+    @pytest.mark.asyncio
+    async def test_coalesces_burst(self, bot, channel, monkeypatch):
+        """Test output queued within the delay is sent as one message"""
+        monkeypatch.setattr(bot_module, "OUTPUT_FLUSH_DELAY", 0.05)
+
+        for output in ("a", "b", "c"):
+            bot._queue_channel_output(channel, output)
+        await asyncio.sleep(0.1)
+
+        bot._send_output.assert_awaited_once_with(channel, "a\nb\nc")
+
+    @pytest.mark.asyncio
+    async def test_flushes_at_char_cap(self, bot, channel, monkeypatch):
+        """Test a batch reaching OUTPUT_FLUSH_CHARS is sent before the delay"""
+        monkeypatch.setattr(bot_module, "OUTPUT_FLUSH_DELAY", 60)
+
+        bot._queue_channel_output(channel, "x" * 1000)
+        bot._queue_channel_output(channel, "y" * 1000)
+        bot._queue_channel_output(channel, "z")
+        await asyncio.sleep(0.01)
+
+        bot._send_output.assert_awaited_once_with(channel, "x" * 1000 + "\n" + "y" * 1000)
+
+    @pytest.mark.asyncio
+    async def test_flushes_at_deadline(self, bot, channel, monkeypatch):
+        """Test output after the deadline starts a new batch"""
+        monkeypatch.setattr(bot_module, "OUTPUT_FLUSH_DELAY", 0.05)
+
+        bot._queue_channel_output(channel, "first")
+        await asyncio.sleep(0.1)
+        bot._queue_channel_output(channel, "second")
+        await asyncio.sleep(0.1)
+
+        assert [call.args[1] for call in bot._send_output.await_args_list] == ["first", "second"]
+
+    @pytest.mark.asyncio
+    async def test_last_session_releases_channel(self, bot, channel, monkeypatch):
+        """Test the channel's state is dropped once its last user untracks"""
+        monkeypatch.setattr(bot_module, "OUTPUT_FLUSH_DELAY", 60)
+        bot._track_user(1, "s1", channel.id)
+        bot._track_user(2, "s1", channel.id)
+        bot._queue_channel_output(channel, "pending")
+        task = bot._flush_states[channel.id].task
+
+        bot._untrack_user(1)
+        assert channel.id in bot._flush_states
+
+        bot._webhooks[channel.id] = Mock()
+        bot._untrack_user(2)
+        assert channel.id not in bot._flush_states
+        assert channel.id not in bot._webhooks
+        await asyncio.wait_for(task, 1)
+        bot._send_output.assert_awaited_once_with(channel, "pending")
+
+    @pytest.mark.asyncio
+    async def test_reconnect_elsewhere_releases_channel(self, bot, channel):
+        """Test a session moving to another channel releases the old one"""
+        bot._track_user(1, "s1", channel.id)
+        bot._queue_channel_output(channel, "pending")
+
+        bot._track_user(1, "s1", 999)
+
+        assert channel.id not in bot._flush_states
+        assert bot._session_channels == {"s1": 999}
+
+    @pytest.mark.asyncio
+    async def test_deleted_webhook_falls_back_to_channel(self, bot, channel):
+        """Test output is resent to the channel when its webhook is gone"""
+        del bot._send_output
+        webhook = Mock()
+        bot._webhooks[channel.id] = webhook
+        bot._send.side_effect = [discord.NotFound(Mock(status=404, reason="Not Found"), "gone"), None, None]
+
+        await bot._send_output(channel, "hello")
+        await bot._send_output(channel, "again")
+
+        targets = [call.args[0] for call in bot._send.await_args_list]
+        assert targets == [webhook, channel, channel]
+        assert channel.id not in bot._webhooks
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
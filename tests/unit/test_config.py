@@ -7,6 +7,7 @@ import json
 import tempfile
 import os
 from pathlib import Path
+from src.claude_bridge.utils import config as config_module
 from src.claude_bridge.utils.config import Config, DiscordConfig, ClaudeCodeConfig, SessionConfig, LoggingConfig
 
 
@@ -37,6 +38,7 @@ class TestConfig:
         assert session_config.max_output_length == 1900
         assert session_config.max_history_length == 100
         assert session_config.cleanup_interval == 300
+        assert session_config.warm_pool_size == 2
         
         # Test LoggingConfig with defaults
         logging_config = LoggingConfig()
@@ -283,6 +285,18 @@ class TestConfig:
         finally:
             os.unlink(temp_path)
 
+    def test_load_json_without_orjson(self, monkeypatch):
+        """Test the stdlib parser is used when orjson is not installed"""
+        monkeypatch.setattr(config_module, "orjson", None)
+        with tempfile.NamedTemporaryFile(mode='wb', suffix='.json', delete=False) as f:
+            f.write('{"name": "処理中"}'.encode('utf-8'))
+            temp_path = Path(f.name)
+
+        try:
+            assert config_module.load_json(temp_path) == {"name": "処理中"}
+        finally:
+            os.unlink(temp_path)
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
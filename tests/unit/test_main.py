@@ -0,0 +1,93 @@
+"""
+Unit tests for the entry point helpers
+"""
+
+import json
+import os
+import subprocess
+
+import pytest
+from src.claude_bridge import main
+
+
+@pytest.fixture
+def probe(tmp_path, monkeypatch):
+    """Fake Claude Code binary whose --version runs are counted"""
+    binary = tmp_path / "claude"
+    binary.write_text("")
+    calls = []
+    state = {'returncode': 0}
+
+    def run(args, **kwargs):
+        calls.append(args)
+        return subprocess.CompletedProcess(args, state['returncode'], stdout="1.2.3\n", stderr="")
+
+    monkeypatch.setattr(main.shutil, "which", lambda command: str(binary) if command == "claude" else None)
+    monkeypatch.setattr(main.subprocess, "run", run)
+    return binary, calls, state
+
+
+class TestProbeClaudeVersion:
+    """Test cases for the cached Claude Code version probe"""
+
+    def test_same_mtime_uses_cache(self, probe, tmp_path):
+        """Test a second probe of an unchanged binary skips the subprocess"""
+        binary, calls, _ = probe
+
+        assert main.probe_claude_version("claude", tmp_path) == "1.2.3"
+        assert main.probe_claude_version("claude", tmp_path) == "1.2.3"
+
+        assert len(calls) == 1
+        cached = json.loads((tmp_path / main.PROBE_CACHE_FILE).read_text(encoding='utf-8'))
+        assert cached == {'path': str(binary), 'mtime': os.stat(binary).st_mtime, 'version': "1.2.3"}
+
+    def test_changed_mtime_probes_again(self, probe, tmp_path):
+        """Test a replaced binary is probed again"""
+        binary, calls, _ = probe
+
+        main.probe_claude_version("claude", tmp_path)
+        os.utime(binary, (1000000000, 1000000000))
+        main.probe_claude_version("claude", tmp_path)
+
+        assert len(calls) == 2
+
+    def test_failed_probe_is_not_cached(self, probe, tmp_path):
+        """Test a non-zero exit returns None and is retried next time"""
+        _, calls, state = probe
+        state['returncode'] = 1
+
+        assert main.probe_claude_version("claude", tmp_path) is None
+        assert not (tmp_path / main.PROBE_CACHE_FILE).exists()
+
+        state['returncode'] = 0
+        assert main.probe_claude_version("claude", tmp_path) == "1.2.3"
+        assert len(calls) == 2
+
+    def test_corrupt_cache_probes_again(self, probe, tmp_path):
+        """Test an unreadable cache file is replaced by a fresh probe"""
+        _, calls, _ = probe
+        (tmp_path / main.PROBE_CACHE_FILE).write_text("{not json", encoding='utf-8')
+
+        assert main.probe_claude_version("claude", tmp_path) == "1.2.3"
+        assert main.probe_claude_version("claude", tmp_path) == "1.2.3"
+        assert len(calls) == 1
+
+    def test_cache_write_failure(self, probe, tmp_path):
+        """Test a cache file that cannot be written still returns the version"""
+        _, calls, _ = probe
+        missing_dir = tmp_path / "missing"
+
+        assert main.probe_claude_version("claude", missing_dir) == "1.2.3"
+        assert main.probe_claude_version("claude", missing_dir) == "1.2.3"
+        assert len(calls) == 2
+
+    def test_command_not_found(self, probe, tmp_path):
+        """Test a command missing from PATH is not probed"""
+        _, calls, _ = probe
+
+        assert main.probe_claude_version("nope", tmp_path) is None
+        assert calls == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
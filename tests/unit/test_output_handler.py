@@ -3,7 +3,10 @@ Unit tests for OutputHandler
 """
 
 import pytest
-from src.claude_bridge.output_handling.output_handler import OutputHandler
+from src.claude_bridge.output_handling import output_handler
+from src.claude_bridge.output_handling.output_handler import (
+    OutputHandler, format_and_split, format_for_discord, split_long_output
+)
 
 
 class TestOutputHandler:
@@ -128,6 +131,41 @@ class TestOutputHandler:
         # Most content should be preserved (some may be truncated)
         assert len(combined) >= len(multi_line_text) * 0.8
     
+    def test_formatting_is_cached(self):
+        """Test repeated payloads are formatted and split only once"""
+        text = "\x1b[32mcached *payload*\x1b[0m\n" * 200
+        hits = output_handler._format_for_discord_cached.cache_info().hits
+        
+        first = self.handler.format_for_discord(text)
+        assert self.handler.format_for_discord(text) == first
+        assert output_handler._format_for_discord_cached.cache_info().hits == hits + 1
+        
+        chunks = self.handler.split_long_output(first, 100)
+        assert self.handler.split_long_output(first, 100) == chunks
+        assert split_long_output(first, 100) is split_long_output(first, 100)
+    
+    def test_long_payloads_are_not_cached(self, monkeypatch):
+        """Test payloads over FORMAT_CACHE_MAX_CHARS bypass the caches"""
+        monkeypatch.setattr(output_handler, "FORMAT_CACHE_MAX_CHARS", 100)
+        text = "\x1b[32mlong *payload*\x1b[0m\n" * 20
+        output_handler._format_for_discord_cached.cache_clear()
+        output_handler._split_long_output_cached.cache_clear()
+        
+        formatted = format_for_discord(text)
+        assert format_for_discord(text) == formatted
+        assert split_long_output(formatted, 50) == split_long_output(formatted, 50)
+        assert output_handler._format_for_discord_cached.cache_info().currsize == 0
+        assert output_handler._split_long_output_cached.cache_info().currsize == 0
+    
+    def test_format_and_split(self):
+        """Test the combined call matches formatting then splitting"""
+        text = "\x1b[31m*line*\x1b[0m\n" * 100
+        
+        formatted, chunks = format_and_split(text, 100)
+        
+        assert formatted == self.handler.format_for_discord(text)
+        assert list(chunks) == self.handler.split_long_output(formatted, 100)
+    
     def test_escape_discord_markdown(self):
         """Test Discord markdown escaping"""
         markdown_text = "This is *bold* and _italic_ and `code` and ~strikethrough~"
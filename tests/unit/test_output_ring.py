@@ -0,0 +1,108 @@
+"""
+Unit tests for OutputRing
+"""
+
+import pytest
+from src.claude_bridge.core.output_ring import OutputRing, OUTPUT_RING_INITIAL_SIZE
+
+
+class TestOutputRing:
+    """Test cases for the session output ring buffer"""
+
+    def test_append_and_recent(self):
+        """Test entries come back in order"""
+        ring = OutputRing()
+        for line in ["first", "second", "third"]:
+            ring.append(line)
+
+        assert len(ring) == 3
+        assert ring.recent(2) == ["second", "third"]
+        assert ring.recent(10) == ["first", "second", "third"]
+        assert ring[-1] == "third"
+        assert "first" in ring
+
+    def test_empty(self):
+        """Test an empty ring"""
+        ring = OutputRing()
+
+        assert len(ring) == 0
+        assert ring.recent(5) == []
+        assert list(ring) == []
+
+    def test_maxlen_eviction(self):
+        """Test the oldest entries are dropped past maxlen"""
+        ring = OutputRing(maxlen=3)
+        for i in range(5):
+            ring.append(f"line {i}")
+
+        assert list(ring) == ["line 2", "line 3", "line 4"]
+
+    def test_capacity_eviction_and_wraparound(self):
+        """Test byte capacity eviction with frames wrapping the buffer end"""
+        ring = OutputRing(capacity=32, maxlen=100)
+        for i in range(20):
+            ring.append(f"entry {i:02d}")
+
+        # Each frame is 4 + 8 bytes, so only two fit in 32 bytes
+        assert list(ring) == ["entry 18", "entry 19"]
+
+    def test_oversized_entry_keeps_tail(self):
+        """Test an entry larger than the ring keeps its most recent bytes"""
+        ring = OutputRing(capacity=16)
+        ring.append("0123456789abcdefghij")
+
+        assert list(ring) == ["89abcdefghij"]
+
+    def test_unicode(self):
+        """Test multi-byte text survives the round trip"""
+        ring = OutputRing(capacity=64)
+        ring.append("処理中… ✅")
+        ring.append("done")
+
+        assert list(ring) == ["処理中… ✅", "done"]
+
+    def test_buffer_grows_to_capacity(self):
+        """Test the buffer is allocated on demand and never exceeds capacity"""
+        ring = OutputRing(capacity=4096, maxlen=1000)
+        assert len(ring._buffer) == 0
+
+        ring.append("x")
+        assert len(ring._buffer) == OUTPUT_RING_INITIAL_SIZE
+
+        for i in range(500):
+            ring.append(f"entry {i:03d}")
+            assert len(ring._buffer) <= 4096
+
+        assert len(ring._buffer) == 4096
+        # Each frame is 4 + 9 bytes, so 315 fit in 4096 bytes
+        assert ring.recent(2) == ["entry 498", "entry 499"]
+        assert len(ring) == 315
+
+    def test_grow_unwraps_frames(self):
+        """Test growing a wrapped buffer keeps entries in order"""
+        ring = OutputRing(capacity=1024, maxlen=10)
+        for i in range(30):
+            ring.append(f"line {i:02d}")
+        ring.append("y" * 300)
+
+        assert list(ring) == [f"line {i:02d}" for i in range(21, 30)] + ["y" * 300]
+
+    def test_recent_counts(self):
+        """Test recent handles counts beyond the stored entries"""
+        ring = OutputRing(maxlen=5)
+        for i in range(8):
+            ring.append(str(i))
+
+        assert ring.recent(0) == []
+        assert ring.recent(-1) == []
+        assert ring.recent(1) == ["7"]
+        assert ring.recent(100) == ["3", "4", "5", "6", "7"]
+
+    def test_capacity_too_small(self):
+        """Test a ring must fit at least one length prefix"""
+        with pytest.raises(ValueError, match="capacity too small"):
+            OutputRing(capacity=4)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
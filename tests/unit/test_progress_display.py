@@ -0,0 +1,300 @@
+"""
+Unit tests for progress detection and display
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from src.claude_bridge.discord_bot import progress_display
+from src.claude_bridge.discord_bot.progress_display import (
+    ProgressDetector, ProgressDisplay, ProgressManager, ProgressState, ProgressType
+)
+
+
+class TestProgressDetector:
+    """Test cases for ProgressDetector"""
+
+    def test_no_progress(self):
+        """Test plain text and blank text are not progress"""
+        assert ProgressDetector.detect_progress("just a normal line of output") is None
+        assert ProgressDetector.detect_progress("   ") is None
+        assert ProgressDetector.detect_progress("") is None
+
+    def test_type_priority(self):
+        """Test earlier progress types win over later ones in the same text"""
+        info = ProgressDetector.detect_progress("Processing files... ████████░░ 80%")
+
+        assert info['type'] == ProgressType.BAR
+        assert info['context_message'] == "Processing files..."
+
+    def test_percentage(self):
+        """Test percentage extraction"""
+        info = ProgressDetector.detect_progress("Upload progress: 85%")
+
+        assert info['type'] == ProgressType.PERCENTAGE
+        assert info['percentage'] == 85.0
+
+    def test_counter(self):
+        """Test counter extraction, including case-insensitive patterns"""
+        info = ProgressDetector.detect_progress("3 OF 10 files")
+
+        assert info['type'] == ProgressType.COUNTER
+        assert (info['current'], info['total']) == (3, 10)
+        assert info['percentage'] == 30.0
+
+    def test_status(self):
+        """Test status words are detected"""
+        info = ProgressDetector.detect_progress("Please wait")
+
+        assert info['type'] == ProgressType.STATUS
+
+    def test_context_line(self):
+        """Test the context message comes from the line holding the match"""
+        info = ProgressDetector.detect_progress("Starting build\nCompiling sources 40%\nwarning: unused")
+
+        assert info['context_message'] == "Compiling sources"
+
+    def test_pos(self):
+        """Test scanning starts at pos while word boundaries still see the text before it"""
+        assert ProgressDetector.detect_progress("Upload 85%\nplain line", 11) is None
+        assert ProgressDetector.detect_progress("Upload 85%\nplain line", 7)['percentage'] == 85.0
+        assert ProgressDetector.detect_progress("Upload 85%", 8) is None
+
+    def test_hyperscan_agrees_with_re(self, monkeypatch):
+        """Test the Hyperscan prefilter picks the same match as plain re"""
+        pytest.importorskip("hyperscan")
+        texts = [
+            "Processing files... ████████░░ 80%", "Upload progress: 85%", "3 OF 10 files",
+            "Step 2/5", "Please wait", "a - b", "処理中 50%", "plain text", "version 1.2",
+            "処理中50%", "é5% done", "İnstalling deps", "Buıldıng", "5\x1c%",
+        ]
+        assert progress_display._SCAN_DB is not None
+        assert progress_display._SCAN_DB.fallback_ids
+        scanned = [ProgressDetector.detect_progress(text) for text in texts]
+
+        monkeypatch.setattr(progress_display, "_SCAN_DB", None)
+        assert [ProgressDetector.detect_progress(text) for text in texts] == scanned
+
+    def test_screen_keeps_marker_free_matches(self):
+        """Test matches without marker characters get past the cheap screen"""
+        assert ProgressDetector.detect_progress("PLEASE WAIT")['type'] == ProgressType.STATUS
+        assert ProgressDetector.detect_progress("12 percent")['type'] == ProgressType.PERCENTAGE
+        assert ProgressDetector.detect_progress("line 4 of 9")['type'] == ProgressType.COUNTER
+        assert ProgressDetector.detect_progress("the rest of it") is None
+        assert ProgressDetector.detect_progress("İnstalling deps")['type'] == ProgressType.STATUS
+        assert ProgressDetector.detect_progress("Buıldıng")['type'] == ProgressType.STATUS
+
+
+class TestProgressState:
+    """Test cases for ProgressState"""
+
+    def test_slots_and_lazy_metadata(self):
+        """Test states carry no instance dict and create metadata on first write"""
+        state = ProgressState("TEST", ProgressType.PERCENTAGE)
+
+        assert not hasattr(state, '__dict__')
+        assert state.metadata is None
+        state.update_metadata({'last_matched': '85%'})
+        state.update_metadata({'detection_time': 1.0})
+        assert state.metadata == {'last_matched': '85%', 'detection_time': 1.0}
+
+
+class TestProgressDisplay:
+    """Test cases for ProgressDisplay"""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_embed_is_not_resent(self):
+        """Test an update that changes nothing visible skips the edit"""
+        channel = Mock()
+        message = Mock()
+        message.edit = AsyncMock()
+        channel.send = AsyncMock(return_value=message)
+        display = ProgressDisplay("TEST", channel, ProgressState("TEST", ProgressType.PERCENTAGE))
+
+        await display._update_discord_message()
+        await display._update_discord_message()
+        assert channel.send.await_count == 1
+        assert message.edit.await_count == 0
+
+        display.state.current_value = 50.0
+        await display._update_discord_message()
+        assert message.edit.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_updates_are_coalesced(self):
+        """Test a burst of updates becomes one deferred edit"""
+        channel = Mock()
+        message = Mock()
+        message.edit = AsyncMock()
+        channel.send = AsyncMock(return_value=message)
+        display = ProgressDisplay("TEST", channel, ProgressState("TEST", ProgressType.PERCENTAGE))
+        display.update_interval = 0.05
+
+        await display.update({'percentage': 10.0})
+        await asyncio.sleep(0.01)
+        for percentage in (11.0, 12.0, 13.0):
+            await display.update({'percentage': percentage})
+        assert channel.send.await_count == 1
+        assert message.edit.await_count == 0
+
+        await asyncio.sleep(0.1)
+        assert message.edit.await_count == 1
+        assert display.state.percentage == 13.0
+
+        await display.complete("done")
+        assert message.edit.await_count == 2
+        assert display._flusher_task is None
+
+    @pytest.mark.asyncio
+    async def test_updates_never_wait_on_discord(self):
+        """Test updates return while a send is in flight and nothing is sent twice"""
+        channel = Mock()
+        message = Mock()
+        message.edit = AsyncMock()
+        sent = asyncio.Event()
+
+        async def send(**kwargs):
+            await sent.wait()
+            return message
+
+        channel.send = AsyncMock(side_effect=send)
+        display = ProgressDisplay("TEST", channel, ProgressState("TEST", ProgressType.PERCENTAGE))
+        display.update_interval = 0.05
+
+        await asyncio.wait_for(display.update({'percentage': 10.0}), 1)
+        await asyncio.sleep(0.01)
+        await asyncio.wait_for(display.update({'percentage': 20.0}), 1)
+        assert channel.send.await_count == 1
+
+        sent.set()
+        await asyncio.sleep(0.1)
+        assert channel.send.await_count == 1
+        assert message.edit.await_count == 1
+        await display.cancel()
+
+    @pytest.mark.asyncio
+    async def test_final_update_waits_for_send_in_flight(self):
+        """Test stopping the flusher mid-send neither drops nor duplicates the message"""
+        channel = Mock()
+        message = Mock()
+        message.edit = AsyncMock()
+        sent = asyncio.Event()
+
+        async def send(**kwargs):
+            await sent.wait()
+            return message
+
+        channel.send = AsyncMock(side_effect=send)
+        display = ProgressDisplay("TEST", channel, ProgressState("TEST", ProgressType.PERCENTAGE))
+
+        await display.update({'percentage': 10.0})
+        await asyncio.sleep(0.01)
+        complete = asyncio.create_task(display.complete("done"))
+        await asyncio.sleep(0.01)
+        assert not complete.done()
+
+        sent.set()
+        await asyncio.wait_for(complete, 1)
+        assert channel.send.await_count == 1
+        assert message.edit.await_count == 1
+
+    def test_progress_bar(self):
+        """Test bars come from the table with partial blocks and clamping"""
+        display = ProgressDisplay("TEST", Mock(), ProgressState("TEST", ProgressType.PERCENTAGE))
+
+        display.state.current_value = 52.5
+        assert display._create_progress_bar() == "```\n" + "█" * 10 + "▌" + "░" * 9 + " 52.5%\n```"
+
+        display.state.current_value = 150.0
+        assert display._create_progress_bar() == "```\n" + "█" * 20 + " 100.0%\n```"
+
+    def test_format_duration(self):
+        """Test durations switch to minutes from one minute up"""
+        assert progress_display._format_duration(0) == "0s"
+        assert progress_display._format_duration(59) == "59s"
+        assert progress_display._format_duration(60) == "1m 0s"
+        assert progress_display._format_duration(185) == "3m 5s"
+
+    def test_embed_timestamp(self):
+        """Test embed timestamps are whole seconds in UTC"""
+        display = ProgressDisplay("TEST", Mock(), ProgressState("TEST", ProgressType.PERCENTAGE))
+        display.state.last_update = 1700000000.75
+
+        timestamp = display._create_progress_embed().timestamp
+        assert timestamp == datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)
+
+
+class TestProgressManager:
+    """Test cases for ProgressManager"""
+
+    @pytest.mark.asyncio
+    async def test_complete_does_not_hold_lock(self, monkeypatch):
+        """Test completion returns at once and removal happens later"""
+        monkeypatch.setattr(progress_display, "PROGRESS_LINGER", 0.05)
+        channel = Mock()
+        channel.send = AsyncMock(return_value=Mock(edit=AsyncMock()))
+        manager = ProgressManager()
+
+        assert await manager.handle_output("TEST", "Upload progress: 85%", channel)
+        await asyncio.wait_for(manager.complete_progress("TEST", "done"), 1)
+
+        assert not manager._lock.locked()
+        assert manager.has_active_progress("TEST")
+        await asyncio.sleep(0.1)
+        assert not manager.has_active_progress("TEST")
+
+    @pytest.mark.asyncio
+    async def test_accumulated_output_scans_new_text(self):
+        """Test an accumulated buffer is only scanned past the last call"""
+        channel = Mock()
+        channel.send = AsyncMock(return_value=Mock(edit=AsyncMock()))
+        manager = ProgressManager()
+        buffer = "Upload 85%\n"
+
+        assert await manager.handle_output("TEST", buffer, channel, accumulated=True)
+        buffer += "plain line"
+        assert not await manager.handle_output("TEST", buffer, channel, accumulated=True)
+        buffer += " 90%"
+        assert await manager.handle_output("TEST", buffer, channel, accumulated=True)
+        assert manager._scanned_offset["TEST"] == len(buffer)
+        await manager.cancel_progress("TEST")
+
+    @pytest.mark.asyncio
+    async def test_forget_session(self):
+        """Test a forgotten session leaves no offset or display behind"""
+        channel = Mock()
+        channel.send = AsyncMock(return_value=Mock(edit=AsyncMock()))
+        manager = ProgressManager()
+
+        assert await manager.handle_output("TEST", "Upload 85%\n", channel, accumulated=True)
+        await manager.forget_session("TEST")
+
+        assert "TEST" not in manager._scanned_offset
+        assert not manager.has_active_progress("TEST")
+        await manager.forget_session("TEST")
+
+    @pytest.mark.asyncio
+    async def test_cleanup_inactive(self):
+        """Test only displays idle past max_age are cancelled"""
+        channel = Mock()
+        channel.send = AsyncMock(return_value=Mock(edit=AsyncMock()))
+        manager = ProgressManager()
+
+        await manager.handle_output("OLD", "Upload progress: 10%", channel)
+        await manager.handle_output("NEW", "Upload progress: 10%", channel)
+        old = manager.active_progress["OLD"]
+        old.state.last_update -= 100
+        manager._track_update("OLD", old)
+
+        await manager.cleanup_inactive(max_age=50)
+
+        assert manager.get_all_active() == ["NEW"]
+        assert old.state.status == "cancelled"
+        assert len(manager._expiry_heap) == 2
+        await manager.cancel_progress("NEW")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
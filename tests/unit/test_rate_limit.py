@@ -0,0 +1,193 @@
+"""
+Unit tests for rate limiting
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock
+
+import discord
+import pytest
+from src.claude_bridge.utils import rate_limit
+from src.claude_bridge.utils.rate_limit import TokenBucket, DiscordRateLimiter
+
+
+def make_http_error(status, headers=None):
+    """Create a discord.HTTPException for a response with the given status"""
+    response = Mock()
+    response.status = status
+    response.reason = "Too Many Requests" if status == 429 else "Error"
+    response.headers = headers or {}
+    return discord.HTTPException(response, "error")
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket"""
+
+    @pytest.mark.asyncio
+    async def test_burst_up_to_capacity(self):
+        """Test a full bucket serves its capacity without waiting"""
+        bucket = TokenBucket(capacity=3, refill_rate=1)
+
+        start = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+
+        assert time.monotonic() - start < 0.05
+
+    @pytest.mark.asyncio
+    async def test_waits_for_refill(self):
+        """Test an empty bucket waits for the next token"""
+        bucket = TokenBucket(capacity=1, refill_rate=20)
+        await bucket.acquire()
+
+        start = time.monotonic()
+        await bucket.acquire()
+
+        assert time.monotonic() - start >= 0.04
+
+    @pytest.mark.asyncio
+    async def test_block_for(self):
+        """Test blocking delays the next token even when refilled"""
+        bucket = TokenBucket(capacity=5, refill_rate=100)
+        bucket.block_for(0.1)
+
+        start = time.monotonic()
+        await bucket.acquire()
+
+        assert time.monotonic() - start >= 0.09
+
+    def test_slots(self):
+        """Test buckets are slotted"""
+        bucket = TokenBucket(capacity=1, refill_rate=1)
+
+        assert not hasattr(bucket, "__dict__")
+
+
+class TestDiscordRateLimiter:
+    """Test cases for DiscordRateLimiter"""
+
+    @pytest.mark.asyncio
+    async def test_send_passes_through(self):
+        """Test sends reach the target with their arguments"""
+        limiter = DiscordRateLimiter()
+        channel = Mock(spec=discord.TextChannel)
+        channel.id = 1
+        channel.send = AsyncMock(return_value="message")
+
+        assert await limiter.send(channel, "hello", embed=None) == "message"
+        channel.send.assert_awaited_once_with("hello", embed=None)
+
+    @pytest.mark.asyncio
+    async def test_retries_after_429(self):
+        """Test a 429 blocks the channel for the reported delay and retries"""
+        limiter = DiscordRateLimiter()
+        channel = Mock(spec=discord.TextChannel)
+        channel.id = 1
+        error = make_http_error(429, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "0.05"})
+        channel.send = AsyncMock(side_effect=[error, "message"])
+
+        start = time.monotonic()
+        assert await limiter.send(channel, "hello") == "message"
+
+        assert channel.send.await_count == 2
+        assert time.monotonic() - start >= 0.04
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_raised(self):
+        """Test non rate limit errors are not retried"""
+        limiter = DiscordRateLimiter()
+        channel = Mock(spec=discord.TextChannel)
+        channel.id = 1
+        channel.send = AsyncMock(side_effect=make_http_error(500))
+
+        with pytest.raises(discord.HTTPException):
+            await limiter.send(channel, "hello")
+        assert channel.send.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sends_keep_order(self):
+        """Test concurrent sends to one channel are delivered in call order"""
+        limiter = DiscordRateLimiter(channel_limit=10)
+        channel = Mock(spec=discord.TextChannel)
+        channel.id = 1
+        sent = []
+
+        async def send(content):
+            # Earlier messages take longer, so only the lock keeps them ordered
+            await asyncio.sleep(0.01 * (5 - int(content)))
+            sent.append(content)
+
+        channel.send = send
+        await asyncio.gather(*(limiter.send(channel, str(i)) for i in range(5)))
+
+        assert sent == ["0", "1", "2", "3", "4"]
+
+    @pytest.mark.asyncio
+    async def test_webhook_bypasses_global_bucket(self):
+        """Test webhook sends use their own bucket and skip the global one"""
+        limiter = DiscordRateLimiter(global_rate=1)
+        webhook = Mock(spec=discord.Webhook)
+        webhook.id = 2
+        webhook.send = AsyncMock()
+
+        await limiter.send(webhook, "a")
+        await limiter.send(webhook, "b")
+
+        assert webhook.send.await_count == 2
+        assert limiter._global.tokens == 1
+        assert limiter._channels[2].capacity == 30
+
+    @pytest.mark.asyncio
+    async def test_idle_targets_are_evicted(self, monkeypatch):
+        """Test buckets and locks of quiet targets are dropped by the sweep"""
+        monkeypatch.setattr(rate_limit, "IDLE_SWEEP_INTERVAL", 0.05)
+        limiter = DiscordRateLimiter(channel_limit=5, channel_period=0.05)
+        channels = []
+        for channel_id in (1, 2, 3):
+            channel = Mock(spec=discord.TextChannel)
+            channel.id = channel_id
+            channel.send = AsyncMock()
+            channels.append(channel)
+
+        await limiter.send(channels[0], "a")
+        await limiter.send(channels[1], "b")
+        assert set(limiter._channels) == set(limiter._send_locks) == {1, 2}
+
+        # Both buckets refill within 10ms; the next send after the interval sweeps
+        await asyncio.sleep(0.06)
+        await limiter.send(channels[2], "c")
+
+        assert set(limiter._channels) == set(limiter._send_locks) == {3}
+        assert limiter._in_flight == {}
+
+    @pytest.mark.asyncio
+    async def test_pending_sends_are_not_evicted(self, monkeypatch):
+        """Test a target with a send in progress keeps its bucket and lock"""
+        monkeypatch.setattr(rate_limit, "IDLE_SWEEP_INTERVAL", 0)
+        limiter = DiscordRateLimiter(channel_limit=5, channel_period=0.001)
+        release = asyncio.Event()
+
+        async def wait_for_release(content):
+            await release.wait()
+
+        slow = Mock(spec=discord.TextChannel)
+        slow.id = 1
+        slow.send = AsyncMock(side_effect=wait_for_release)
+        fast = Mock(spec=discord.TextChannel)
+        fast.id = 2
+        fast.send = AsyncMock()
+
+        pending = asyncio.create_task(limiter.send(slow, "a"))
+        # Let the slow channel's bucket refill while its send is still pending
+        await asyncio.sleep(0.01)
+        assert limiter._channels[1].is_idle()
+        await limiter.send(fast, "b")
+
+        assert 1 in limiter._channels and 1 in limiter._send_locks
+        release.set()
+        await pending
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
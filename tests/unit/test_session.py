@@ -2,6 +2,10 @@
 Unit tests for Session
 """
 
+import subprocess
+import time
+from unittest.mock import Mock
+
 import pytest
 from datetime import datetime, timedelta
 from src.claude_bridge.core.session import Session
@@ -16,10 +20,11 @@ class TestSession:
         
         assert session.id == "TEST123"
         assert session.status == "inactive"
-        assert session.command_history == []
-        assert session.output_buffer == []
+        assert list(session.command_history) == []
+        assert list(session.output_buffer) == []
         assert isinstance(session.created_at, datetime)
-        assert isinstance(session.last_activity, datetime)
+        assert isinstance(session.last_activity, float)
+        assert isinstance(session.last_activity_at, datetime)
     
     def test_session_creation_empty_id(self):
         """Test that empty session ID raises ValueError"""
@@ -48,12 +53,12 @@ class TestSession:
         assert not session.is_expired(3600)  # 1 hour timeout
         
         # Set old last_activity
-        session.last_activity = datetime.now() - timedelta(hours=2)
+        session.last_activity = time.monotonic() - timedelta(hours=2).total_seconds()
         assert session.is_expired(3600)  # Should be expired
         
         # Terminated session should always be expired
         session.status = "terminated"
-        session.last_activity = datetime.now()  # Even if recent
+        session.last_activity = time.monotonic()  # Even if recent
         assert session.is_expired(3600)
     
     def test_update_activity(self):
@@ -62,7 +67,6 @@ class TestSession:
         original_time = session.last_activity
         
         # Wait a bit to ensure time difference
-        import time
         time.sleep(0.01)
         
         session.update_activity()
@@ -166,6 +170,41 @@ class TestSession:
         
         # Process termination would be tested with mock process
     
+    @pytest.mark.asyncio
+    async def test_terminate_process_async(self):
+        """Test process termination runs off the event loop"""
+        session = Session(id="TEST123")
+        session.claude_process = subprocess.Popen(["cat"], stdin=subprocess.PIPE)
+        
+        session.terminate_mark()
+        assert session.status == "terminated"
+        assert session.claude_process.poll() is None
+        
+        await session.terminate_process_async()
+        assert session.claude_process.poll() is not None
+    
+    def test_slots(self):
+        """Test sessions are slotted and reject unknown attributes"""
+        session = Session(id="TEST123")
+        
+        assert not hasattr(session, "__dict__")
+        assert "_process_controller" in Session.__slots__
+        with pytest.raises(AttributeError):
+            session.undeclared = True
+    
+    def test_display_timestamps(self):
+        """Test display strings are rendered once per activity"""
+        created = datetime(2024, 1, 2, 3, 4, 5)
+        session = Session(id="TEST123", created_at=created)
+        
+        assert session.created_at_display == "2024-01-02 03:04:05"
+        
+        first = session.last_activity_display
+        assert session.last_activity_display is first
+        
+        session.last_activity -= 3600
+        assert session.last_activity_display != first
+    
     def test_to_dict(self):
         """Test dictionary conversion"""
         session = Session(id="TEST123", working_directory="/workspace")
@@ -186,6 +225,28 @@ class TestSession:
         # Check datetime serialization
         assert isinstance(result["created_at"], str)
         assert isinstance(result["last_activity"], str)
+    
+    def test_to_dict_is_active_follows_status(self):
+        """Test the cached is_active reflects status changes and new processes"""
+        session = Session(id="TEST123")
+        process = Mock()
+        process.poll.return_value = None
+        session.claude_process = process
+        assert session.to_dict()["is_active"] == False
+        
+        session.status = "active"
+        assert session.to_dict()["is_active"] == True
+        assert session.to_dict()["is_active"] == True
+        assert process.poll.call_count == 1
+        
+        session.terminate_mark()
+        assert session.to_dict()["is_active"] == False
+        
+        # A restarted session's new process is polled straight away
+        session.status = "active"
+        session.claude_process = Mock()
+        session.claude_process.poll.return_value = 1
+        assert session.to_dict()["is_active"] == False
 
 
 if __name__ == "__main__":
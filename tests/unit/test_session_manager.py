@@ -0,0 +1,142 @@
+"""
+Unit tests for SessionManager
+"""
+
+import asyncio
+import re
+import time
+
+import pytest
+from src.claude_bridge.core import session_manager
+from src.claude_bridge.core.session_manager import SessionManager
+from src.claude_bridge.utils.config import Config, DiscordConfig, ClaudeCodeConfig, SessionConfig, LoggingConfig
+
+
+@pytest.fixture
+def manager():
+    """SessionManager that is never started"""
+    config = Config(
+        discord=DiscordConfig("test", 123, 456),
+        claude_code=ClaudeCodeConfig("cat", "/tmp", 30),
+        session=SessionConfig(300, 1900, 100, 60, 0),
+        logging=LoggingConfig()
+    )
+    return SessionManager(config)
+
+
+class TestSessionIds:
+    """Test cases for session ID generation"""
+
+    def test_id_format(self, manager):
+        """Test IDs are six uppercase hex characters"""
+        session_id = manager.generate_session_id()
+
+        assert re.fullmatch(r"[0-9A-F]{6}", session_id)
+
+    def test_ids_are_reserved(self, manager):
+        """Test a generated ID is reserved until released"""
+        ids = {manager.generate_session_id() for _ in range(200)}
+
+        assert len(ids) == 200
+        assert ids == manager._reserved_ids
+
+    def test_uses_secrets(self, manager, monkeypatch):
+        """Test IDs come from the secrets module, not the random module"""
+        monkeypatch.setattr("secrets.token_hex", lambda nbytes: "abcdef")
+
+        assert manager.generate_session_id() == "ABCDEF"
+
+
+class TestSessionStats:
+    """Test cases for session statistics"""
+
+    def test_id_limit(self, manager):
+        """Test the ID list is capped while counts cover every session"""
+        for i in range(15):
+            manager.sessions[f"S{i:02d}"] = None
+
+        stats = manager.get_session_stats(id_limit=10)
+
+        assert stats['total_sessions'] == 15
+        assert stats['session_ids'] == [f"S{i:02d}" for i in range(10)]
+        assert len(manager.get_session_stats()['session_ids']) == 15
+
+
+class TestPeriodicCleanup:
+    """Test cases for the expiry and active-set sweep"""
+
+    @pytest.mark.asyncio
+    async def test_active_set_refreshed_on_interval_only(self, manager, monkeypatch):
+        """Test deadline wakeups expire sessions without polling every process"""
+        refreshes = []
+        monkeypatch.setattr(manager, "_refresh_active_ids", lambda: refreshes.append(time.monotonic()))
+        manager.config.session.cleanup_interval = 0.2
+        manager._expiry_heap = [(time.monotonic() + 0.01, "GONE01"), (time.monotonic() + 0.02, "GONE02")]
+        manager._running = True
+
+        task = asyncio.create_task(manager._periodic_cleanup())
+        await asyncio.sleep(0.1)
+        assert manager._expiry_heap == []
+        assert refreshes == []
+
+        await asyncio.sleep(0.2)
+        manager._running = False
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert len(refreshes) == 1
+
+
+class FakeController:
+    """ProcessController stand-in that records how it was used"""
+
+    def __init__(self, command="cat", working_directory="/tmp", running=True):
+        self.running = running
+        self.started = False
+        self.terminated = False
+        self.process = None
+
+    def is_running(self):
+        return self.running
+
+    def start_process(self, session_id):
+        self.started = self.running = True
+        return True
+
+    def terminate_process(self):
+        self.terminated = True
+        self.running = False
+
+    def set_output_callback(self, callback):
+        pass
+
+    def set_error_callback(self, callback):
+        pass
+
+
+class TestWarmPool:
+    """Test cases for the pre-started process pool"""
+
+    @pytest.mark.asyncio
+    async def test_exited_process_falls_through_to_cold_spawn(self, manager, monkeypatch):
+        """Test a pooled process that exited is dropped and a new one is spawned"""
+        spawned = []
+
+        def spawn(**kwargs):
+            spawned.append(FakeController(**kwargs, running=False))
+            return spawned[-1]
+
+        monkeypatch.setattr(session_manager, "ProcessController", spawn)
+        dead = FakeController(running=False)
+        manager._warm_pool.put_nowait(dead)
+
+        session = await manager.create_session()
+
+        assert dead.terminated
+        assert manager._warm_pool.empty()
+        assert len(spawned) == 1 and spawned[0].started
+        assert session._process_controller is spawned[0]
+        await manager._stop_output_pump(session.id)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
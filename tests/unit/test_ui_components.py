@@ -0,0 +1,203 @@
+"""
+Unit tests for prompt detection
+"""
+
+import asyncio
+import gc
+import re
+from unittest.mock import AsyncMock, Mock
+
+import discord
+import pytest
+from src.claude_bridge.discord_bot import ui_components
+from src.claude_bridge.discord_bot.ui_components import (
+    ChoiceView, InteractionType, PromptDetector, TextInputView, UIConverter
+)
+
+
+class TestPromptDetector:
+    """Test cases for PromptDetector"""
+
+    def test_no_prompt(self):
+        """Test plain text and blank text are not prompts"""
+        assert PromptDetector.detect_prompt("npm WARN deprecated package@1.0.0") is None
+        assert PromptDetector.detect_prompt("   ") is None
+        assert PromptDetector.detect_prompt("") is None
+
+    def test_screen_keeps_prompts(self):
+        """Test prompts in any case, or with tabs for spaces, get past the trigger screen"""
+        assert PromptDetector.detect_prompt("ENTER\tNAME:")[0] == InteractionType.TEXT_INPUT
+        assert PromptDetector.detect_prompt("Which file:")[0] == InteractionType.FILE_SELECTION
+        assert PromptDetector.detect_prompt("a long line of build output with no question") is None
+
+    def test_case_insensitive_patterns_are_ascii(self):
+        """Test case-insensitive patterns fold ASCII case only"""
+        for patterns in PromptDetector.PATTERNS.values():
+            for pattern in patterns:
+                if pattern.flags & re.IGNORECASE:
+                    assert pattern.flags & re.ASCII
+
+        assert PromptDetector.detect_prompt("İnput value:") is None
+
+    def test_yes_no(self):
+        """Test yes/no prompts keep the question as the prompt"""
+        interaction_type, info = PromptDetector.detect_prompt("Overwrite file (yes/no)")
+
+        assert interaction_type == InteractionType.YES_NO
+        assert info['prompt'] == "Overwrite file"
+
+    def test_pattern_order_beats_position(self):
+        """Test an earlier type wins even when a later type matches further left"""
+        interaction_type, info = PromptDetector.detect_prompt("Are you sure? Continue now?")
+
+        assert interaction_type == InteractionType.YES_NO
+        assert info['matched_text'] == "Continue now?"
+
+    def test_choice_options(self):
+        """Test choice prompts list their options"""
+        interaction_type, info = PromptDetector.detect_prompt("Select an option:\n1. First\n2. Second\n")
+
+        assert interaction_type == InteractionType.CHOICE
+        assert info['options'] == ["First", "Second"]
+
+    def test_option_formats(self):
+        """Test each option list format, and the first present format winning"""
+        assert PromptDetector._extract_options("a) Apple\nb) Banana") == ["Apple", "Banana"]
+        assert PromptDetector._extract_options("* red\n- blue") == ["red"]
+        assert PromptDetector._extract_options("  - one\n  - two") == ["one", "two"]
+        assert PromptDetector._extract_options("no list here") == []
+
+    def test_results_are_cached_but_not_shared(self):
+        """Test repeated texts hit the cache while callers get separate dicts"""
+        ui_components._detect_prompt_cached.cache_clear()
+        text = "Choose from:\na) Apple\nb) Banana"
+
+        first = PromptDetector.detect_prompt(text)
+        first[1]['options'].append("Cherry")
+        second = PromptDetector.detect_prompt(text)
+
+        assert second[1]['options'] == ["Apple", "Banana"]
+        assert ui_components._detect_prompt_cached.cache_info().hits == 1
+
+    def test_hyperscan_agrees_with_re(self, monkeypatch):
+        """Test the Hyperscan prefilter picks the same prompt as plain re"""
+        pytest.importorskip("hyperscan")
+        texts = [
+            "Do you want to continue? (y/n)", "Are you sure? Continue now?", "Enter your name:",
+            "Pick one:\n* red\n* blue", "Which file:", "This will delete all. continue?",
+            "İnput value:", "plain output line",
+        ]
+        assert ui_components._SCAN_DB is not None
+        scanned = [PromptDetector.detect_prompt(text) for text in texts]
+
+        monkeypatch.setattr(ui_components, "_SCAN_DB", None)
+        ui_components._detect_prompt_cached.cache_clear()
+        assert [PromptDetector.detect_prompt(text) for text in texts] == scanned
+
+
+class TestUIConverter:
+    """Test cases for UIConverter"""
+
+    @pytest.mark.asyncio
+    async def test_choice_returns_selected_position(self):
+        """Test the chosen position is returned, even among duplicate options"""
+        converter = UIConverter()
+        channel = Mock()
+        channel.send = AsyncMock(return_value=Mock())
+        prompt_info = {'prompt': "Pick one", 'options': ["same", "same", "other"]}
+
+        task = asyncio.create_task(converter._handle_choice(prompt_info, channel, "TEST"))
+        await asyncio.sleep(0)
+        await converter.pending_interactions["TEST"].on_select("same", 1)
+
+        assert await asyncio.wait_for(task, 1) == "2"
+        assert "TEST" not in converter.pending_interactions
+
+    @pytest.mark.asyncio
+    async def test_prompt_embed_from_template(self, monkeypatch):
+        """Test prompt embeds take their title and colour from the template"""
+        monkeypatch.setattr(ui_components, "PROMPT_RESPONSE_TIMEOUT", 0.01)
+        converter = UIConverter()
+        channel = Mock()
+        channel.send = AsyncMock(return_value=Mock())
+
+        await converter._handle_choice({'prompt': "Pick one", 'options': ["a", "b"]}, channel, "TEST")
+
+        embed = channel.send.await_args.kwargs['embed']
+        assert embed.title == "📝 Please Select"
+        assert embed.colour == discord.Color.blue()
+        assert embed.description == "Pick one"
+        assert [field.value for field in embed.fields] == ["1. a\n2. b"]
+
+    @pytest.mark.asyncio
+    async def test_unanswered_prompt_times_out(self, monkeypatch):
+        """Test a prompt nobody answers returns None and is no longer pending"""
+        monkeypatch.setattr(ui_components, "PROMPT_RESPONSE_TIMEOUT", 0.01)
+        converter = UIConverter()
+        channel = Mock()
+        channel.send = AsyncMock(return_value=Mock())
+
+        result = await asyncio.wait_for(converter._handle_yes_no({'prompt': "Continue?"}, channel, "TEST"), 1)
+
+        assert result is None
+        assert "TEST" not in converter.pending_interactions
+
+    @pytest.mark.asyncio
+    async def test_text_prompt_times_out(self, monkeypatch):
+        """Test a chat prompt waits PROMPT_RESPONSE_TIMEOUT and then gives up"""
+        monkeypatch.setattr(ui_components, "PROMPT_RESPONSE_TIMEOUT", 0.01)
+        converter = UIConverter()
+        channel = Mock()
+        channel.send = AsyncMock(return_value=Mock())
+        bot = channel.guild.get_member_named.return_value
+        bot.wait_for = AsyncMock(side_effect=TimeoutError)
+
+        assert await converter._handle_text_prompt({'prompt': "Say something"}, channel, "TEST") is None
+        assert bot.wait_for.await_args.kwargs['timeout'] == 0.01
+        assert channel.send.await_args.kwargs['embed'].title == "⏱️ Timed Out"
+
+    @pytest.mark.asyncio
+    async def test_text_input_returns_modal_result(self):
+        """Test the text entered in the modal is returned"""
+        converter = UIConverter()
+        channel = Mock()
+        channel.send = AsyncMock(return_value=Mock())
+        interaction = Mock()
+        interaction.response.send_modal = AsyncMock()
+        prompt_info = {'prompt': "Enter a name", 'field_name': "name"}
+
+        task = asyncio.create_task(converter._handle_text_input(prompt_info, channel, "TEST"))
+        await asyncio.sleep(0)
+        view = converter.pending_interactions["TEST"]
+        assert isinstance(view, TextInputView)
+        opened = asyncio.create_task(view.open_modal.callback(interaction))
+        await asyncio.sleep(0)
+
+        modal = interaction.response.send_modal.await_args.args[0]
+        modal.result = "Ada"
+        modal.responded.set()
+        await asyncio.wait_for(opened, 1)
+        assert await asyncio.wait_for(task, 1) == "Ada"
+
+    @pytest.mark.asyncio
+    async def test_pending_interactions_are_swept(self, monkeypatch):
+        """Test answered and unreferenced views leave the pending interactions"""
+        monkeypatch.setattr(ui_components, "PENDING_SWEEP_INTERVAL", 0.01)
+        converter = UIConverter()
+        answered = ChoiceView("Pick one", ["a"])
+        waiting = ChoiceView("Pick one", ["b"])
+        converter._add_pending("ANSWERED", answered)
+        converter._add_pending("WAITING", waiting)
+        converter._add_pending("DROPPED", ChoiceView("Pick one", ["c"]))
+        gc.collect()
+
+        await answered.on_select("a", 0)
+        await asyncio.sleep(0.05)
+        assert converter.get_pending_interactions() == ["WAITING"]
+
+        converter.cancel_pending_interaction("WAITING")
+        await asyncio.wait_for(converter._sweeper_task, 1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])